@@ -4,11 +4,322 @@ Data Profiler - Main Streamlit Application
 
 import streamlit as st
 import pandas as pd
+import numpy as np
+import copy
+import hashlib
+import io
 import json
-from io_utils import load_file
-from profiling import profile_dataframe, _add_examples_to_flags
-from quality import generate_quality_flags, generate_dataset_quality_flags
-from export_utils import profile_to_summary_df, dataset_summary_to_dict
+import threading
+import uuid
+from io_utils import load_file, load_preview, load_sample
+from profiling import (
+    iter_profile_dataframe, compute_deferred_sections, apply_quality_flags,
+    add_stage_timing, stage_clock, stage_timing, DEFERRABLE_SECTIONS, PROFILER_VERSION,
+)
+from cache_utils import ProfileCache, profile_cache_key
+from jobs import Job, JobManager
+from quality import generate_dataset_quality_flags
+from export_utils import (
+    profile_to_summary_df, dataset_summary_to_dict, stage_timings_to_df, column_timings_to_df,
+    format_candidate_keys, format_ci,
+)
+
+
+# Largest value of the "Top N values" slider; profiles keep this many so the slider never reprofiles
+MAX_TOP_N_VALUES = 10
+
+# Column detail views rendered per page
+DETAIL_PAGE_SIZE = 20
+
+# Profiling jobs run at once across all sessions, and how often a waiting session polls its job
+PROFILE_JOB_WORKERS = 2
+JOB_POLL_SECONDS = 0.5
+
+
+@st.cache_resource
+def get_profile_cache() -> ProfileCache:
+    """Process-wide handle on the on-disk profile cache."""
+    return ProfileCache()
+
+
+@st.cache_resource
+def get_job_manager() -> JobManager:
+    """Process-wide background executor for profiling jobs, shared by all sessions."""
+    return JobManager(max_workers=PROFILE_JOB_WORKERS, use_processes=False)
+
+
+@st.cache_resource
+def get_job_state() -> dict:
+    """Partial profiles of running jobs and the sessions waiting on each job, shared by all sessions."""
+    return {"lock": threading.Lock(), "partials": {}, "waiters": {}}
+
+
+class ProfileNotReady(Exception):
+    """Raised by load_profile while a profile is still being computed."""
+
+
+def _profile_settings(max_key_width: int) -> dict:
+    # Expensive column sections are deferred until load_column_sections is asked for them
+    return {"max_key_width": max_key_width, "top_n": MAX_TOP_N_VALUES,
+            "deferred_sections": list(DEFERRABLE_SECTIONS)}
+
+
+def _profile_cache_key(file_hash: str, max_key_width: int, sample_size: int) -> str:
+    settings = dict(_profile_settings(max_key_width), sample_size=sample_size)
+    return profile_cache_key(file_hash, PROFILER_VERSION, settings)
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def load_profile(cache_key: str) -> dict:
+    """
+    A finished profile from the on-disk cache.
+
+    Cached in memory by its cache key (file content hash plus profiling
+    settings), so reruns triggered by display settings reuse the profile.
+    Raises ProfileNotReady (not cached) until a profiling job has stored it.
+    """
+    profile = get_profile_cache().get(cache_key)
+    if profile is None:
+        raise ProfileNotReady(cache_key)
+    return profile
+
+
+def _profile_job(cache_key: str, file_name: str, max_key_width: int, sample_size: int, file_bytes: bytes,
+                 cache: ProfileCache, partials: dict, progress_callback=None, cancel_event=None) -> dict:
+    """
+    Background job: profile an uploaded file into the on-disk cache.
+
+    A `sample_size` profiles a streamed random sample of that many rows instead
+    of the whole file. The partial profile is published in `partials` under the
+    cache key after every column and stage, so waiting sessions can show it.
+    """
+    def _profile():
+        load_start = stage_clock()
+        df, total_rows = _load_frame(file_name, sample_size, file_bytes)
+        load_timing = stage_timing(load_start, len(df))
+        if sample_size is not None:
+            options = {"population_rows": total_rows}
+        else:
+            # Unchanged columns of a new file version reuse their cached column profiles
+            options = {"column_cache": cache}
+
+        profile = None
+        for _, profile in iter_profile_dataframe(df, **options, **_profile_settings(max_key_width),
+                                                 progress_callback=progress_callback, cancel_event=cancel_event):
+            partials[cache_key] = profile
+        add_stage_timing(profile, "load", load_timing)
+        return profile
+
+    try:
+        return cache.get_or_compute(cache_key, _profile)
+    finally:
+        partials.pop(cache_key, None)
+
+
+def _load_frame(file_name: str, sample_size: int, file_bytes: bytes) -> tuple:
+    """Load the rows that get profiled (all of them, or the sample) and the file's row count."""
+    buffer = io.BytesIO(file_bytes)
+    buffer.name = file_name
+    if sample_size is not None:
+        return load_sample(buffer, sample_size)
+
+    df = load_file(buffer)
+    return df, len(df)
+
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def load_dataframe(file_hash: str, file_name: str, sample_size: int, _file_bytes: bytes) -> pd.DataFrame:
+    """Profiled rows of an uploaded file, kept for on-demand column sections (read-only)."""
+    return _load_frame(file_name, sample_size, _file_bytes)[0]
+
+
+@st.cache_data(show_spinner=False, max_entries=4096)
+def load_column_sections(file_hash: str, file_name: str, sample_size: int, col_name: str,
+                         sections: tuple, _file_bytes: bytes) -> dict:
+    """
+    Compute a column's deferred sections the first time the UI or an export needs them.
+
+    Returns:
+        dict with the computed "sections" and the "evidence" they recorded
+    """
+    df = load_dataframe(file_hash, file_name, sample_size, _file_bytes)
+    # Column names come back from the disk cache as strings
+    series = df[{str(c): c for c in df.columns}[str(col_name)]]
+
+    # A sampled profile's sections get the confidence intervals the rest of it has
+    col_profile = compute_deferred_sections({"evidence": {}}, series, sections=list(sections),
+                                            confidence_intervals=sample_size is not None)
+    return {
+        "sections": {section: col_profile[section] for section in sections},
+        "evidence": col_profile["evidence"],
+    }
+
+
+def complete_columns(profile: dict, file_hash: str, file_name: str, sample_size: int, file_bytes: bytes,
+                     columns: list = None) -> dict:
+    """Fill in the deferred sections of the given columns (default: all) of a cached profile."""
+    for col_name in profile["columns"] if columns is None else columns:
+        col_profile = profile["columns"][col_name]
+        deferred = col_profile.pop("deferred_sections", None)
+        if deferred:
+            computed = load_column_sections(file_hash, file_name, sample_size, col_name, tuple(deferred), file_bytes)
+            col_profile.update(computed["sections"])
+            col_profile["evidence"].update(computed["evidence"])
+    return profile
+
+
+def _has_deferred_sections(profile: dict) -> bool:
+    return any(col_profile.get("deferred_sections") for col_profile in profile["columns"].values())
+
+
+def _request_complete_profile(file_hash: str) -> None:
+    st.session_state["complete_profile_hash"] = file_hash
+
+
+def _reset_detail_page() -> None:
+    st.session_state["detail_page"] = 1
+
+
+def _detail_page_columns(column_names: list, query: str, page: int) -> tuple:
+    """
+    Columns shown on one page of the detail views, filtered by a case-insensitive name search.
+
+    Returns:
+        tuple of (column names on the page, number of pages, number of matching columns)
+    """
+    query = (query or "").strip().lower()
+    matches = [name for name in column_names if query in str(name).lower()] if query else list(column_names)
+    n_pages = max(1, -(-len(matches) // DETAIL_PAGE_SIZE))
+    page = min(max(int(page or 1), 1), n_pages)
+    start = (page - 1) * DETAIL_PAGE_SIZE
+    return matches[start:start + DETAIL_PAGE_SIZE], n_pages, len(matches)
+
+
+def _null_highlight_styles(summary_df: pd.DataFrame, null_threshold: float) -> pd.DataFrame:
+    """CSS for the whole summary table at once: rows at or above the null threshold are highlighted."""
+    high_nulls = (summary_df["Missing %"] >= null_threshold).to_numpy()
+    styles = np.where(high_nulls, "background-color: yellow", "")
+    return pd.DataFrame(np.repeat(styles[:, None], summary_df.shape[1], axis=1),
+                        index=summary_df.index, columns=summary_df.columns)
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def load_data_preview(file_hash: str, file_name: str, _file_bytes: bytes) -> pd.DataFrame:
+    """First rows of an uploaded file, read without loading the whole file."""
+    buffer = io.BytesIO(_file_bytes)
+    buffer.name = file_name
+    return load_preview(buffer, n_rows=20)
+
+
+def _memory_usage_label(dataset: dict) -> str:
+    """Dataset memory in MB, marked as approximate when sampled."""
+    memory_mb = dataset['memory_usage_bytes'] / (1024 * 1024)
+    prefix = "" if dataset.get('memory_usage_exact', True) else "~"
+    return f"{prefix}{memory_mb:.2f} MB"
+
+
+def _progress_label(event: dict) -> str:
+    if event["stage"] == "column":
+        return f"Profiling column {event['column']} ({event['completed']:,}/{event['total']:,} steps)"
+    return f"Running {event['stage'].replace('_', ' ')}..."
+
+
+def _render_partial(profile: dict, null_threshold: float, top_n: int) -> None:
+    """Show the dataset summary and the summary rows of the columns profiled so far."""
+    # Flags are applied to copies; the profile is still being built by the job thread
+    partial = {
+        "dataset": dict(profile["dataset"]),
+        "columns": {col_name: dict(col_profile) for col_name, col_profile in list(profile["columns"].items())},
+    }
+    apply_quality_flags(partial, null_threshold, top_n)
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Rows", f"{partial['dataset']['n_rows']:,}")
+    with col2:
+        st.metric("Columns", partial['dataset']['n_columns'])
+    with col3:
+        st.metric("Memory Usage", _memory_usage_label(partial['dataset']))
+
+    st.caption(f"{len(partial['columns']):,} of {partial['dataset']['n_columns']:,} columns profiled")
+    if partial["columns"]:
+        st.dataframe(profile_to_summary_df(partial), use_container_width=True, hide_index=True)
+
+
+@st.fragment(run_every=JOB_POLL_SECONDS)
+def _job_poller(job_id: str, cache_key: str, null_threshold: float, top_n: int) -> None:
+    """Poll a background profiling job, showing its progress and partial profile; rerun the app once it finishes."""
+    job = get_job_manager().get(job_id)
+    if job is None or job.finished:
+        st.rerun()
+
+    if job.progress is not None:
+        st.progress(job.progress["fraction"], text=_progress_label(job.progress))
+    elif job.status == "queued":
+        st.progress(0.0, text="Waiting for a free profiling worker...")
+    else:
+        st.progress(0.0, text="Loading file...")
+
+    partial = get_job_state()["partials"].get(cache_key)
+    if partial is not None:
+        _render_partial(partial, null_threshold, top_n)
+
+
+def _session_token() -> str:
+    return st.session_state.setdefault("session_token", uuid.uuid4().hex)
+
+
+def _attach_profile_job(cache_key: str, file_name: str, max_key_width: int, sample_size: int,
+                        file_bytes: bytes) -> Job:
+    """
+    This session's profiling job for `cache_key`.
+
+    Sessions asking for the same file and settings while a job is queued or
+    running share that job. A finished job stays attached, so a failure is
+    reported rather than retried on every rerun.
+    """
+    jobs = st.session_state.setdefault("profile_jobs", {})
+    manager = get_job_manager()
+    job = manager.get(jobs[cache_key]) if cache_key in jobs else None
+    if job is None:
+        state = get_job_state()
+        job = manager.submit(_profile_job, cache_key, file_name, max_key_width, sample_size, file_bytes,
+                             get_profile_cache(), state["partials"], key=cache_key)
+        jobs[cache_key] = job.id
+        with state["lock"]:
+            state["waiters"].setdefault(job.id, set()).add(_session_token())
+    return job
+
+
+def _cancel_profiling(file_hash: str, job_id: str) -> None:
+    """
+    Button callback: stop waiting for this file until the user asks again.
+
+    The shared job itself is cancelled only when no other session is waiting for it.
+    """
+    st.session_state["cancelled_file_hash"] = file_hash
+    state = get_job_state()
+    with state["lock"]:
+        waiters = state["waiters"].get(job_id, set())
+        waiters.discard(_session_token())
+        if not waiters:
+            state["waiters"].pop(job_id, None)
+            get_job_manager().cancel(job_id)
+
+
+def _resume_profiling() -> None:
+    st.session_state.pop("cancelled_file_hash", None)
+    st.session_state.pop("profile_jobs", None)
+
+
+def _file_content_hash(uploaded_file) -> str:
+    """Content hash of an uploaded file, computed once per upload."""
+    file_id = getattr(uploaded_file, "file_id", None) or uploaded_file.name
+    cached = st.session_state.get("_file_content_hash")
+    if cached is None or cached[0] != file_id:
+        cached = (file_id, hashlib.sha256(uploaded_file.getvalue()).hexdigest())
+        st.session_state["_file_content_hash"] = cached
+    return cached[1]
 
 
 # Page configuration
@@ -51,41 +362,106 @@ with st.sidebar:
     top_n_values = st.slider(
         "Top N values to display",
         min_value=3,
-        max_value=10,
+        max_value=MAX_TOP_N_VALUES,
         value=5,
         help="Number of most frequent values to show per column"
     )
 
+    max_key_width = st.slider(
+        "Max candidate key width",
+        min_value=1,
+        max_value=4,
+        value=2,
+        help="Largest number of columns to combine when searching for unique column combinations"
+    )
+
+    sampled_mode = st.checkbox(
+        "Sampled mode (faster, approximate)",
+        value=False,
+        help="Profile a random sample of rows; percentages are shown with 95% confidence intervals"
+    )
+    sample_size = None
+    if sampled_mode:
+        sample_size = st.number_input(
+            "Sample size (rows)",
+            min_value=1_000,
+            max_value=1_000_000,
+            value=100_000,
+            step=10_000,
+            help="Number of rows drawn uniformly at random (reproducible)"
+        )
+
     show_column_details = st.checkbox(
         "Show detailed column stats",
         value=False,
         help="Display expandable sections with full statistics for each column"
     )
 
+    show_performance = st.checkbox(
+        "Show performance panel",
+        value=False,
+        help="Display wall and CPU time per profiling stage and per column"
+    )
+
 # Main content area
 if uploaded_file is None:
     st.info("👈 Upload a file using the sidebar to get started")
 else:
     try:
-        # Load the file
-        with st.spinner("Loading file..."):
-            df = load_file(uploaded_file)
-
-        # Profile the dataframe
-        with st.spinner("Profiling dataset..."):
-            profile = profile_dataframe(df)
-
-            # Add quality flags to each column
-            for col_name, col_profile in profile["columns"].items():
-                # Generate base flags (without examples)
-                flags = generate_quality_flags(col_name, col_profile, profile["dataset"]["n_rows"], null_threshold)
-
-                # Add examples to flags
-                flags_with_examples = _add_examples_to_flags(flags, df[col_name], col_profile)
-
-                col_profile["quality_flags"] = flags_with_examples
-
-        st.success(f"Successfully profiled {len(df):,} rows and {len(df.columns)} columns")
+        # Load and profile the file (cached by content hash)
+        file_hash = _file_content_hash(uploaded_file)
+        if st.session_state.get("cancelled_file_hash") == file_hash:
+            st.warning("Profiling was cancelled.")
+            st.button("Profile again", on_click=_resume_profiling)
+            st.stop()
+
+        # Profiling runs in a shared background job; this session polls it until the profile is stored
+        cache_key = _profile_cache_key(file_hash, max_key_width, int(sample_size) if sample_size else None)
+        try:
+            profile = load_profile(cache_key)
+        except ProfileNotReady:
+            job = _attach_profile_job(cache_key, uploaded_file.name, max_key_width,
+                                      int(sample_size) if sample_size else None, uploaded_file.getvalue())
+            if not job.finished:
+                st.button("Cancel profiling", on_click=_cancel_profiling, args=(file_hash, job.id))
+                _job_poller(job.id, cache_key, null_threshold, top_n_values)
+                st.stop()
+            if job.status == "failed":
+                raise ValueError(job.error)
+            if job.status == "cancelled":
+                st.warning("Profiling was cancelled.")
+                st.button("Profile again", on_click=_resume_profiling)
+                st.stop()
+            # Finished but not in the disk cache (e.g. the entry was evicted or could not be written)
+            profile = copy.deepcopy(job.result)
+
+        # Only the visible page of column details is rendered; its widgets are drawn further down
+        detail_columns, detail_pages, detail_matches = _detail_page_columns(
+            list(profile["columns"]), st.session_state.get("detail_search"), st.session_state.get("detail_page"))
+
+        # Expensive sections are computed for the visible detail page, or for every column on export request
+        if st.session_state.get("complete_profile_hash") == file_hash:
+            with st.spinner("Computing column details..."):
+                profile = complete_columns(profile, file_hash, uploaded_file.name,
+                                           int(sample_size) if sample_size else None, uploaded_file.getvalue())
+        elif show_column_details:
+            with st.spinner("Computing column details..."):
+                profile = complete_columns(profile, file_hash, uploaded_file.name,
+                                           int(sample_size) if sample_size else None, uploaded_file.getvalue(),
+                                           columns=detail_columns)
+
+        # Quality flags depend only on settings, so they are rebuilt on every rerun
+        profile = apply_quality_flags(profile, null_threshold, top_n_values)
+
+        st.success(f"Successfully profiled {profile['dataset']['n_rows']:,} rows and {profile['dataset']['n_columns']} columns")
+
+        sampling = profile['dataset'].get('sampling')
+        if sampling:
+            st.info(
+                f"🎲 Sampled mode: {sampling['sample_rows']:,} of {sampling['population_rows']:,} rows "
+                f"({sampling['method']} sample). Counts describe the sample; percentages show "
+                f"{sampling['confidence_level']:.0%} confidence intervals."
+            )
 
         # Dataset Summary Section
         st.header("📋 Dataset Summary")
@@ -96,8 +472,24 @@ else:
         with col2:
             st.metric("Columns", profile['dataset']['n_columns'])
         with col3:
-            memory_mb = profile['dataset']['memory_usage_bytes'] / (1024 * 1024)
-            st.metric("Memory Usage", f"{memory_mb:.2f} MB")
+            st.metric("Memory Usage", _memory_usage_label(profile['dataset']),
+                      help="Object and string columns are estimated from a sample of rows; "
+                           "see Memory (KB) in the column summary for each column's share")
+
+        # Candidate keys (minimal unique column combinations)
+        candidate_keys = profile['dataset'].get('candidate_keys', {})
+        if candidate_keys.get('keys'):
+            st.caption(f"🔑 Candidate keys: {format_candidate_keys(candidate_keys['keys'])}")
+        elif candidate_keys.get('error'):
+            st.caption(f"🔑 Candidate keys: {candidate_keys['error']}")
+        else:
+            st.caption(f"🔑 No unique column combination of up to {candidate_keys.get('max_width', 0)} columns found")
+        if candidate_keys.get('truncated'):
+            st.caption(f"Key search stopped after {candidate_keys['candidates_checked']:,} candidates")
+        if candidate_keys.get('partial'):
+            st.caption("Keys were found on the first rows; wider keys around the ones later rows broke were not searched")
+        if candidate_keys.get('keys') and candidate_keys.get('scope') == "sample":
+            st.caption("Unique within the sample only; values may repeat in the full file")
 
         # Duplicate Analysis Section
         dup_analysis = profile['dataset'].get('duplicate_analysis')
@@ -111,6 +503,8 @@ else:
                 st.metric("Duplicate Rows", f"{dup_analysis['duplicate_rows']:,}")
             with dup_col3:
                 st.metric("Duplicate %", f"{dup_analysis['duplicate_pct']:.1f}%")
+                if dup_analysis.get('scope') == "sample":
+                    st.caption("Within the sample only; the full file likely has more")
 
             # Dataset-level quality flags
             dataset_flags = generate_dataset_quality_flags(profile['dataset'])
@@ -132,34 +526,70 @@ else:
                         # Display row data as JSON
                         st.json(dup_set['row_data'])
                         st.divider()
+
+            # Show near-duplicate clusters
+            near_dups = dup_analysis.get('near_duplicates') or {}
+            if near_dups.get('clusters'):
+                with st.expander(f"View Near-Duplicate Clusters ({len(near_dups['clusters'])} shown)"):
+                    st.caption(
+                        f"Rows compared on normalised values (trimmed, lowercased) with "
+                        f"similarity ≥ {near_dups['similarity_threshold']:.0%}"
+                        + (f"; ignoring {', '.join(near_dups['excluded_columns'])}" if near_dups['excluded_columns'] else "")
+                    )
+                    if near_dups.get('scope') == "sample":
+                        st.caption(f"Found within {near_dups['sampled_rows']:,} sampled rows; the full file likely has more")
+                    for i, cluster in enumerate(near_dups['clusters'], 1):
+                        st.markdown(f"**Cluster {i}: {cluster['count']} rows, similarity {cluster['similarity']:.0%}**")
+                        st.caption(f"Example rows: {', '.join(map(str, cluster['example_indices']))}")
+                        if cluster['differing_columns']:
+                            st.caption(f"Differs in: {', '.join(cluster['differing_columns'])}")
+
+                        st.json(cluster['row_data'])
+                        st.divider()
         elif dup_analysis and dup_analysis.get('error'):
             st.warning(f"⚠️ Duplicate detection: {dup_analysis['error']}")
 
         # Column Summary Table
         st.header("📊 Column Profile Summary")
+        if _has_deferred_sections(profile):
+            st.warning("Incomplete flags: whitespace, placeholder, casing, special character, mixed type and "
+                       "future date checks have not run for every column yet. They run for the columns shown in "
+                       "detailed column stats, or for all columns when exports are prepared.")
+            st.button("Run all checks", on_click=_request_complete_profile, args=(file_hash,))
 
         summary_df = profile_to_summary_df(profile)
 
-        # Apply conditional highlighting for high null percentages
-        def highlight_high_nulls(row):
-            if row['Missing %'] >= null_threshold:
-                return ['background-color: yellow'] * len(row)
-            return [''] * len(row)
-
-        styled_df = summary_df.style.apply(highlight_high_nulls, axis=1)
+        # Apply conditional highlighting for high null percentages (styled in one pass, only when needed)
+        styled_df = summary_df
+        if (summary_df["Missing %"] >= null_threshold).any():
+            styled_df = summary_df.style.apply(_null_highlight_styles, axis=None, null_threshold=null_threshold)
         st.dataframe(styled_df, use_container_width=True, hide_index=True)
 
-        # Detailed column views (if enabled)
+        # Detailed column views (if enabled), one page at a time
         if show_column_details:
             st.header("📑 Detailed Column Statistics")
 
-            for col_name, col_profile in profile["columns"].items():
+            search_col, page_col = st.columns([3, 1])
+            with search_col:
+                st.text_input("Search columns", key="detail_search", on_change=_reset_detail_page,
+                              placeholder="Filter by column name")
+            with page_col:
+                if st.session_state.get("detail_page", 1) > detail_pages:
+                    st.session_state["detail_page"] = detail_pages
+                st.number_input("Page", min_value=1, max_value=detail_pages, step=1, key="detail_page")
+            st.caption(f"Showing {len(detail_columns)} of {detail_matches:,} matching columns "
+                       f"({DETAIL_PAGE_SIZE} per page)")
+
+            for col_name in detail_columns:
+                col_profile = profile["columns"][col_name]
                 with st.expander(f"📌 {col_name}"):
                     col1, col2, col3 = st.columns(3)
 
                     with col1:
                         st.metric("Type", col_profile["inferred_type"])
                         st.metric("Missing %", f"{col_profile['missing_pct']:.1f}%")
+                        if col_profile.get('missing_pct_ci'):
+                            st.caption(format_ci(col_profile['missing_pct_ci']))
 
                     with col2:
                         st.metric("Unique Count", f"{col_profile['unique_count']:,}")
@@ -200,6 +630,12 @@ else:
                     if col_profile["numeric_stats"]:
                         st.subheader("📈 Numeric Statistics")
                         stats = col_profile["numeric_stats"]
+                        if col_profile.get("numeric_coercion"):
+                            coercion = col_profile["numeric_coercion"]
+                            st.caption(
+                                f"Parsed from text: {coercion['parsed_count']:,} values, "
+                                f"{coercion['unparsed_count']:,} did not parse"
+                            )
                         stats_col1, stats_col2, stats_col3, stats_col4 = st.columns(4)
 
                         with stats_col1:
@@ -247,8 +683,12 @@ else:
                         with sq_col1:
                             st.metric("Whitespace Issues",
                                      f"{sq['whitespace_count']:,} ({sq['whitespace_pct']:.1f}%)")
+                            if sq.get('whitespace_pct_ci'):
+                                st.caption(format_ci(sq['whitespace_pct_ci']))
                             st.metric("Placeholder Values",
                                      f"{sq['placeholder_count']:,} ({sq['placeholder_pct']:.1f}%)")
+                            if sq.get('placeholder_pct_ci'):
+                                st.caption(format_ci(sq['placeholder_pct_ci']))
                             if sq['placeholder_values']:
                                 st.caption(f"Found: {', '.join(sq['placeholder_values'][:3])}")
 
@@ -258,51 +698,83 @@ else:
                                 st.caption(f"{sq['casing_groups']} groups with variants")
                             st.metric("Special Characters",
                                      f"{sq['special_char_count']:,} ({sq['special_char_pct']:.1f}%)")
+                            if sq.get('special_char_pct_ci'):
+                                st.caption(format_ci(sq['special_char_pct_ci']))
+
+        # Performance panel (if enabled)
+        if show_performance and profile.get("timings"):
+            st.header("⏱️ Performance")
+            timings = profile["timings"]
+            load_timing = timings["stages"].get("load")
+
+            perf_col1, perf_col2, perf_col3, perf_col4 = st.columns(4)
+            with perf_col1:
+                st.metric("Profiling Time", f"{timings['wall_seconds']:.2f} s")
+            with perf_col2:
+                st.metric("CPU Time", f"{timings['cpu_seconds']:.2f} s")
+            with perf_col3:
+                rows_per_second = timings.get("rows_per_second")
+                st.metric("Rows/s", f"{rows_per_second:,.0f}" if rows_per_second else "N/A")
+            with perf_col4:
+                st.metric("Load Time", f"{load_timing['wall_seconds']:.2f} s" if load_timing else "N/A")
+
+            st.caption("Recorded when the profile was computed; a cached profile shows its original run. "
+                       "Kernel times can overlap within a step.")
+            st.subheader("Stages")
+            st.dataframe(stage_timings_to_df(timings), use_container_width=True, hide_index=True)
+            st.subheader("Columns (slowest first)")
+            st.dataframe(column_timings_to_df(timings), use_container_width=True, hide_index=True)
 
         # Export functionality
         st.header("💾 Export Profile")
-
-        col1, col2, col3 = st.columns(3)
-
-        with col1:
-            csv_data = summary_df.to_csv(index=False).encode('utf-8')
-            st.download_button(
-                label="📄 Download Column Summary (CSV)",
-                data=csv_data,
-                file_name=f"{uploaded_file.name}_column_profile.csv",
-                mime="text/csv",
-                help="Download the column profile summary as a CSV file",
-                use_container_width=True
-            )
-
-        with col2:
-            # Export dataset summary
-            dataset_summary = dataset_summary_to_dict(profile)
-            dataset_df = pd.DataFrame([dataset_summary])
-            dataset_csv = dataset_df.to_csv(index=False).encode('utf-8')
-            st.download_button(
-                label="📊 Download Dataset Summary (CSV)",
-                data=dataset_csv,
-                file_name=f"{uploaded_file.name}_dataset_summary.csv",
-                mime="text/csv",
-                help="Download dataset summary including duplicate analysis",
-                use_container_width=True
-            )
-
-        with col3:
-            json_data = json.dumps(profile, indent=2).encode('utf-8')
-            st.download_button(
-                label="📋 Download Full Profile (JSON)",
-                data=json_data,
-                file_name=f"{uploaded_file.name}_full_profile.json",
-                mime="application/json",
-                help="Download the complete profile structure as JSON",
-                use_container_width=True
-            )
+        if _has_deferred_sections(profile):
+            # Downloads need their data up front, so an export never ships without the deferred checks
+            st.info("Exports include every check. Preparing them runs the string quality, datetime and mixed type "
+                    "checks for all columns first.")
+            st.button("Prepare exports", on_click=_request_complete_profile, args=(file_hash,), type="primary")
+        else:
+            col1, col2, col3 = st.columns(3)
+
+            with col1:
+                csv_data = summary_df.to_csv(index=False).encode('utf-8')
+                st.download_button(
+                    label="📄 Download Column Summary (CSV)",
+                    data=csv_data,
+                    file_name=f"{uploaded_file.name}_column_profile.csv",
+                    mime="text/csv",
+                    help="Download the column profile summary as a CSV file",
+                    use_container_width=True
+                )
+
+            with col2:
+                # Export dataset summary
+                dataset_summary = dataset_summary_to_dict(profile)
+                dataset_df = pd.DataFrame([dataset_summary])
+                dataset_csv = dataset_df.to_csv(index=False).encode('utf-8')
+                st.download_button(
+                    label="📊 Download Dataset Summary (CSV)",
+                    data=dataset_csv,
+                    file_name=f"{uploaded_file.name}_dataset_summary.csv",
+                    mime="text/csv",
+                    help="Download dataset summary including duplicate analysis",
+                    use_container_width=True
+                )
+
+            with col3:
+                json_data = json.dumps(profile, indent=2).encode('utf-8')
+                st.download_button(
+                    label="📋 Download Full Profile (JSON)",
+                    data=json_data,
+                    file_name=f"{uploaded_file.name}_full_profile.json",
+                    mime="application/json",
+                    help="Download the complete profile structure as JSON",
+                    use_container_width=True
+                )
 
         # Data preview (collapsed by default)
         with st.expander("🔍 View Raw Data Preview"):
-            st.dataframe(df.head(20), use_container_width=True)
+            preview_df = load_data_preview(file_hash, uploaded_file.name, uploaded_file.getvalue())
+            st.dataframe(preview_df, use_container_width=True)
 
     except ValueError as e:
         st.error(f"Error: {str(e)}")
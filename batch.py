@@ -0,0 +1,230 @@
+"""
+Batch profiling of many files with a pool of worker processes.
+
+Each worker imports pandas and the profiling modules once and then profiles
+files until the batch is done, so interpreter and import startup is paid per
+worker rather than per file. Files are scheduled largest first so the longest
+jobs do not start last, and each worker can be given an address-space cap so
+one oversized file fails on its own instead of taking the machine down.
+"""
+
+import csv
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+try:
+    import resource
+except ImportError:  # Windows: workers run without a memory cap
+    resource = None
+
+
+SUPPORTED_EXTENSIONS = (".csv", ".xlsx", ".xls")
+INDEX_JSON = "index.json"
+INDEX_CSV = "index.csv"
+# Smallest per-worker address-space cap: below this a worker cannot even import pandas and the profiler
+MIN_WORKER_MEMORY_BYTES = 512 * 1024 * 1024
+
+
+def discover_files(target: str) -> list:
+    """
+    Files to profile for a directory (its direct children) or a glob pattern (`**` recurses),
+    largest first.
+    """
+    if os.path.isdir(target):
+        paths = [os.path.join(target, name) for name in os.listdir(target)]
+    else:
+        paths = glob.glob(target, recursive=True)
+
+    files = [path for path in paths if os.path.isfile(path) and path.lower().endswith(SUPPORTED_EXTENSIONS)]
+    return sorted(files, key=lambda path: (-os.path.getsize(path), path))
+
+
+def _output_names(paths: list) -> dict:
+    """
+    Export file stem for each input: its path relative to the inputs' common directory,
+    with separators replaced, so files with the same name in different directories do not collide.
+    """
+    if not paths:
+        return {}
+    base = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in paths])
+    return {path: os.path.relpath(os.path.abspath(path), base).replace(os.sep, "__") for path in paths}
+
+
+def _limit_worker_memory(max_bytes: int) -> None:
+    """Pool initializer: cap the worker's address space so oversized files raise MemoryError."""
+    if max_bytes is None or resource is None:
+        return
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        max_bytes = min(max_bytes, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (max_bytes, hard))
+
+
+def _profile_one(path: str, output_name: str, output_dir: str, options: dict) -> dict:
+    """Profile one file in a worker and write its exports; failures are returned, not raised."""
+    result = {"path": path, "bytes": os.path.getsize(path), "status": "ok", "error": None}
+    start = time.perf_counter()
+    try:
+        # Imported here so a worker too constrained to import them fails per file
+        from cli import profile_file, write_exports, megabytes_to_bytes
+        from cache_utils import ProfileCache
+        from profiling import apply_quality_flags
+
+        cache = None if options["no_cache"] else ProfileCache(options["cache_dir"])
+        profile = profile_file(path, max_key_width=options["max_key_width"], sample_size=options["sample_size"],
+                               time_budget=options["time_budget"], cache=cache,
+                               track_memory=options.get("track_memory", False),
+                               memory_budget=megabytes_to_bytes(options.get("memory_budget_mb")),
+                               exact_memory=options.get("exact_memory", False))
+        profile = apply_quality_flags(profile, options["null_threshold"], options["top_n"])
+        result["outputs"] = write_exports(profile, output_name, output_dir, options["formats"])
+        result.update(_index_entry(profile))
+    except MemoryError:
+        result.update(status="error", error="memory limit exceeded")
+    except Exception as e:
+        result.update(status="error", error=str(e) or type(e).__name__)
+    result["seconds"] = round(time.perf_counter() - start, 3)
+    return result
+
+
+def _failed_result(path: str, error: str) -> dict:
+    return {"path": path, "bytes": os.path.getsize(path), "status": "error", "error": error, "seconds": None}
+
+
+def _index_entry(profile: dict) -> dict:
+    """Per-file summary kept in the aggregate index."""
+    dataset = profile["dataset"]
+    sampling = dataset.get("sampling")
+    severities = {"error": 0, "warning": 0, "info": 0}
+    for col_profile in profile["columns"].values():
+        for flag in col_profile["quality_flags"]:
+            severities[flag["severity"]] = severities.get(flag["severity"], 0) + 1
+
+    return {
+        "rows": sampling["population_rows"] if sampling else dataset["n_rows"],
+        "profiled_rows": dataset["n_rows"],
+        "columns": dataset["n_columns"],
+        "duplicate_pct": (dataset.get("duplicate_analysis") or {}).get("duplicate_pct"),
+        "candidate_keys": (dataset.get("candidate_keys") or {}).get("keys", []),
+        "error_flags": severities["error"],
+        "warning_flags": severities["warning"],
+        "info_flags": severities["info"],
+        "degraded": len(dataset.get("degraded", [])),
+        "peak_memory_bytes": (profile.get("memory") or {}).get("rss_peak_bytes"),
+        "execution": (dataset.get("execution") or {}).get("mode", "in_memory"),
+    }
+
+
+def run_batch(paths: list, output_dir: str, options: dict, workers: int = None, memory_limit_bytes: int = None,
+              progress_callback=None) -> dict:
+    """
+    Profile `paths` across a process pool and write one set of exports per file plus an aggregate index.
+
+    Args:
+        paths: Files to profile, in scheduling order (see discover_files)
+        output_dir: Directory for per-file exports and index.json / index.csv
+        options: Profiling and export settings (max_key_width, sample_size, time_budget,
+            track_memory, memory_budget_mb, exact_memory, null_threshold, top_n, formats, cache_dir, no_cache)
+        workers: Worker processes (default: CPU count, at most one per file)
+        memory_limit_bytes: Address-space cap per worker (POSIX only), at least MIN_WORKER_MEMORY_BYTES
+        progress_callback: Called with each file's result as it finishes
+
+    Returns:
+        Index dict with "summary" (throughput) and "files" (per-file results in scheduling order)
+
+    Raises:
+        ValueError: If memory_limit_bytes is below MIN_WORKER_MEMORY_BYTES
+    """
+    if memory_limit_bytes is not None and memory_limit_bytes < MIN_WORKER_MEMORY_BYTES:
+        raise ValueError(f"Worker memory limit must be at least {MIN_WORKER_MEMORY_BYTES // 1024 ** 2} MB "
+                         f"to import pandas and the profiler")
+
+    os.makedirs(output_dir, exist_ok=True)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(paths) or 1))
+    names = _output_names(paths)
+    results = {}
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_limit_worker_memory,
+                             initargs=(memory_limit_bytes,)) as pool:
+        futures = {pool.submit(_profile_one, path, names[path], output_dir, options): path for path in paths}
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                result = future.result()
+            except BrokenProcessPool:
+                # A worker was killed (e.g. by the OOM killer); its files cannot be attributed individually
+                result = _failed_result(path, "worker process died")
+            except MemoryError:
+                result = _failed_result(path, "memory limit exceeded")
+            except Exception as e:
+                # e.g. a result that could not be sent back from the worker
+                result = _failed_result(path, str(e) or type(e).__name__)
+            results[path] = result
+            if progress_callback is not None:
+                progress_callback(result)
+    elapsed = time.perf_counter() - start
+
+    files = [results[path] for path in paths]
+    succeeded = [result for result in files if result["status"] == "ok"]
+    total_rows = sum(result["rows"] for result in succeeded)
+    summary = {
+        "files": len(files),
+        "succeeded": len(succeeded),
+        "failed": len(files) - len(succeeded),
+        "rows": total_rows,
+        "bytes": sum(result["bytes"] for result in succeeded),
+        "workers": workers,
+        "elapsed_seconds": round(elapsed, 3),
+        "files_per_second": round(len(files) / elapsed, 3) if elapsed > 0 else None,
+        "rows_per_second": round(total_rows / elapsed, 1) if elapsed > 0 else None,
+    }
+    index = {"summary": summary, "files": files}
+    _write_index(index, output_dir)
+    return index
+
+
+def _write_index(index: dict, output_dir: str) -> None:
+    from export_utils import format_candidate_keys
+
+    with open(os.path.join(output_dir, INDEX_JSON), "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2)
+
+    fields = ["path", "status", "error", "rows", "profiled_rows", "columns", "duplicate_pct", "candidate_keys",
+              "error_flags", "warning_flags", "info_flags", "degraded", "execution", "peak_memory_bytes", "bytes",
+              "seconds"]
+    with open(os.path.join(output_dir, INDEX_CSV), "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fields, extrasaction="ignore")
+        writer.writeheader()
+        for result in index["files"]:
+            row = dict(result)
+            row["candidate_keys"] = format_candidate_keys(result.get("candidate_keys"))
+            writer.writerow(row)
+
+
+def format_throughput(summary: dict) -> str:
+    """One-line throughput report for a finished batch."""
+    line = (f"Profiled {summary['succeeded']}/{summary['files']} files ({summary['rows']:,} rows) "
+            f"in {summary['elapsed_seconds']:.1f}s with {summary['workers']} workers")
+    if summary["files_per_second"] is not None:
+        line += f": {summary['files_per_second']:.2f} files/s, {summary['rows_per_second']:,.0f} rows/s"
+    return line
+
+
+def _stderr_file_progress(total: int):
+    done = [0]
+
+    def _report(result):
+        done[0] += 1
+        if result["status"] == "ok":
+            detail = f"{result['rows']:,} rows in {result['seconds']:.1f}s"
+        else:
+            detail = f"failed: {result['error']}"
+        print(f"[{done[0]}/{total}] {result['path']}: {detail}", file=sys.stderr)
+
+    return _report
@@ -0,0 +1,355 @@
+"""
+Accuracy-versus-speed benchmark for the profiler's approximate modes.
+
+Each generated dataset is profiled exactly (profile_dataframe with default
+options) and by every faster mode:
+
+- "sampled": profile_dataframe(sample_size=...); counts describe the sample,
+  so top-value counts and memory are scaled to the population before comparing
+- "chunked": a profile state built and updated chunk by chunk (profile_state.py)
+- "time_budget": profile_dataframe(time_budget=...) at a fraction of the exact time
+
+For every mode the worst error per metric across columns is reported next to
+the speedup, and the quality flags (generate_quality_flags and
+generate_dataset_quality_flags) are compared with those of the exact profile:
+
+    python -m benchmarks.accuracy
+    python -m benchmarks.accuracy --update-baseline
+
+Errors of the deterministic modes (sampled, chunked) are compared with a
+committed baseline; the exit code is 1 when a metric is worse than the
+baseline by more than its slack, or a flag disagrees that did not before.
+The time-budgeted mode depends on the machine's speed and is reported only.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.run_benchmarks import _case, case_id, environment  # noqa: E402
+
+
+MODES = ("sampled", "chunked", "time_budget")
+CHECKED_MODES = ("sampled", "chunked")
+DEFAULT_SAMPLE_SIZE = 10_000
+CHUNKS = 4
+TIME_BUDGET_SHARE = 0.25  # time budget as a fraction of the exact profile's time
+TOP_VALUE_MIN_PCT = 1.0  # exact top values rarer than this are not compared
+DEFAULT_OUTPUT = os.path.join(REPO_ROOT, "benchmarks", "accuracy_results.json")
+DEFAULT_BASELINE = os.path.join(REPO_ROOT, "benchmarks", "accuracy_baseline.json")
+
+# How much worse than the baseline a metric may get before it counts as a
+# regression, in the metric's own unit (see column_errors and dataset_errors)
+METRIC_SLACK = {
+    "unique_count": 0.02,
+    "missing_pct": 0.1,
+    "inferred_type": 0.0,
+    "percentiles": 0.01,
+    "top_value_counts": 0.05,
+    "top_values_missing": 0.0,
+    "string_quality.whitespace_pct": 0.25,
+    "string_quality.placeholder_pct": 0.25,
+    "string_quality.special_char_pct": 0.25,
+    "duplicate_pct": 0.25,
+    "memory_usage_bytes": 0.05,
+}
+
+ACCURACY_CASES = [
+    dict(_case(100_000, 12, cardinality=0.1, null_rate=0.05, duplicate_rate=0.02), dirty_rate=0.05),
+    dict(_case(100_000, 12, cardinality=0.0002, null_rate=0.1, duplicate_rate=0.05), dirty_rate=0.05),
+    dict(_case(50_000, 8, dtype_mix="text", cardinality=0.01, null_rate=0.02, duplicate_rate=0.0), dirty_rate=0.2),
+    _case(100_000, 10, dtype_mix="numeric", cardinality=0.5, null_rate=0.01, duplicate_rate=0.01),
+]
+
+
+def relative_error(exact, approx) -> float:
+    """|approx - exact| / |exact|; 0 when both are 0 and 1 when only exact is."""
+    if exact == 0:
+        return 0.0 if approx == 0 else 1.0
+    return abs(approx - exact) / abs(exact)
+
+
+def column_errors(exact: dict, approx: dict, scale: float = 1.0) -> dict:
+    """
+    Errors of one approximate column profile against the exact one.
+
+    Args:
+        exact: Exact column profile
+        approx: Approximate column profile
+        scale: Rows of the exact profile per row of the approximate one, to
+            bring a sample's counts to the population
+
+    Returns:
+        Dict of metric -> error, None where a metric does not apply:
+        unique_count, top_value_counts and memory relative; missing_pct and
+        string-quality percentages in percentage points; percentiles (p25, p50,
+        p75) as a fraction of the exact range; inferred_type 1 on a mismatch;
+        top_values_missing the fraction of exact top values (at least
+        TOP_VALUE_MIN_PCT of rows) absent from the approximate list
+    """
+    errors = {
+        "unique_count": relative_error(exact["unique_count"], approx["unique_count"]),
+        "missing_pct": abs(approx["missing_pct"] - exact["missing_pct"]),
+        "inferred_type": float(approx["inferred_type"] != exact["inferred_type"]),
+        "percentiles": None,
+        "top_value_counts": None,
+        "top_values_missing": None,
+    }
+
+    exact_stats, approx_stats = exact.get("numeric_stats"), approx.get("numeric_stats")
+    if exact_stats and approx_stats:
+        spread = exact_stats["max"] - exact_stats["min"]
+        deltas = [abs(approx_stats[p] - exact_stats[p]) for p in ("p25", "p50", "p75")]
+        errors["percentiles"] = max(deltas) / spread if spread else float(max(deltas) > 0)
+
+    compared = [top for top in exact.get("top_values") or [] if top["pct"] >= TOP_VALUE_MIN_PCT]
+    if compared:
+        approx_counts = {top["value"]: top["count"] * scale for top in approx.get("top_values") or []}
+        found = [relative_error(top["count"], approx_counts[top["value"]])
+                 for top in compared if top["value"] in approx_counts]
+        errors["top_value_counts"] = max(found) if found else None
+        errors["top_values_missing"] = 1 - len(found) / len(compared)
+
+    exact_quality, approx_quality = exact.get("string_quality"), approx.get("string_quality")
+    if exact_quality and approx_quality:
+        for field in ("whitespace_pct", "placeholder_pct", "special_char_pct"):
+            errors[f"string_quality.{field}"] = abs(approx_quality[field] - exact_quality[field])
+    return errors
+
+
+def dataset_errors(exact: dict, approx: dict, scale: float = 1.0) -> dict:
+    """Errors of the dataset section: duplicate_pct (percentage points; None if skipped) and memory (relative)."""
+    skipped = any(entry["metric"] == "duplicate_analysis" for entry in approx.get("degraded", []))
+    duplicate_pct = approx.get("duplicate_analysis", {}).get("duplicate_pct")
+    return {
+        "duplicate_pct": None if skipped or duplicate_pct is None
+        else abs(duplicate_pct - exact["duplicate_analysis"]["duplicate_pct"]),
+        "memory_usage_bytes": relative_error(exact["memory_usage_bytes"], approx["memory_usage_bytes"] * scale),
+    }
+
+
+def quality_flag_keys(profile: dict) -> set:
+    """The "column:CODE" quality flags a profile raises, dataset flags under "dataset"."""
+    from quality import generate_quality_flags, generate_dataset_quality_flags
+
+    n_rows = profile["dataset"]["n_rows"]
+    keys = {f"{name}:{flag['code']}" for name, col_profile in profile["columns"].items()
+            for flag in generate_quality_flags(name, col_profile, n_rows)}
+    keys.update(f"dataset:{flag['code']}" for flag in generate_dataset_quality_flags(profile["dataset"]))
+    return keys
+
+
+def compare_profiles(exact: dict, approx: dict) -> dict:
+    """
+    Worst error per metric across columns, and flag agreement, of `approx` against `exact`.
+
+    Returns:
+        Dict with "errors" (metric -> {"max", "column"}; max is None when the
+        metric applied to no column or was skipped) and "flags" (missing:
+        raised only by the exact profile, extra: only by the approximate one,
+        agreement: shared / all raised)
+    """
+    scale = exact["dataset"]["n_rows"] / approx["dataset"]["n_rows"]
+    worst = {}
+    for name, exact_col in exact["columns"].items():
+        for metric, error in column_errors(exact_col, approx["columns"][name], scale).items():
+            entry = worst.setdefault(metric, {"max": None, "column": None})
+            if error is not None and (entry["max"] is None or error > entry["max"]):
+                worst[metric] = {"max": round(error, 4), "column": name}
+    for metric, error in dataset_errors(exact["dataset"], approx["dataset"], scale).items():
+        worst[metric] = {"max": None if error is None else round(error, 4), "column": None}
+
+    exact_flags, approx_flags = quality_flag_keys(exact), quality_flag_keys(approx)
+    raised = exact_flags | approx_flags
+    return {
+        "errors": worst,
+        "flags": {
+            "missing": sorted(exact_flags - approx_flags),
+            "extra": sorted(approx_flags - exact_flags),
+            "agreement": round(len(exact_flags & approx_flags) / len(raised), 4) if raised else 1.0,
+        },
+    }
+
+
+def _timed(function, repeat: int):
+    """Fastest of `repeat` calls, and the last result."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return result, best
+
+
+def _profile_chunked(df, chunks: int = CHUNKS) -> dict:
+    from profile_state import build_profile_state, update_profile_state, profile_from_state
+
+    chunk_rows = -(-len(df) // chunks)
+    state = build_profile_state(df.iloc[:chunk_rows])
+    for start in range(chunk_rows, len(df), chunk_rows):
+        update_profile_state(state, df.iloc[start:start + chunk_rows])
+    return profile_from_state(state)
+
+
+def run_case(case: dict, modes=MODES, sample_size: int = DEFAULT_SAMPLE_SIZE, repeat: int = 1) -> dict:
+    """
+    Profile one generated dataset exactly and in each mode.
+
+    Returns:
+        Dict with spec, exact_seconds and per mode: seconds, speedup, and the
+        compare_profiles errors and flags
+    """
+    import warnings
+
+    from benchmarks.generate import generate_dataset
+    from profiling import profile_dataframe
+
+    df = generate_dataset(**case)
+    runners = {
+        "sampled": lambda: profile_dataframe(df, sample_size=sample_size),
+        "chunked": lambda: _profile_chunked(df),
+        "time_budget": lambda: profile_dataframe(df, time_budget=exact_seconds * TIME_BUDGET_SHARE),
+    }
+
+    with warnings.catch_warnings():
+        # Date parsing fallbacks warn once per column and run
+        warnings.simplefilter("ignore", UserWarning)
+        exact, exact_seconds = _timed(lambda: profile_dataframe(df), repeat)
+        entry = {"spec": case, "exact_seconds": round(exact_seconds, 4), "modes": {}}
+        for mode in modes:
+            approx, seconds = _timed(runners[mode], repeat)
+            entry["modes"][mode] = {
+                "seconds": round(seconds, 4),
+                "speedup": round(exact_seconds / seconds, 2) if seconds > 0 else None,
+                **compare_profiles(exact, approx),
+            }
+    return entry
+
+
+def compare_to_baseline(results: dict, baseline: dict, slack: dict = METRIC_SLACK) -> list:
+    """
+    Accuracy regressions of `results` against `baseline` in the CHECKED_MODES:
+    metrics worse than the baseline by more than their slack, and flags
+    missing or extra that were not in the baseline. Cases and modes missing
+    from the baseline are not compared.
+
+    Returns:
+        List of dicts with case, mode, metric, baseline and current
+    """
+    regressions = []
+    for name, current in results["cases"].items():
+        previous = baseline.get("cases", {}).get(name)
+        if previous is None:
+            continue
+        for mode in CHECKED_MODES:
+            if mode not in current["modes"] or mode not in previous["modes"]:
+                continue
+            now, before = current["modes"][mode], previous["modes"][mode]
+
+            for metric, error in now["errors"].items():
+                reference = before["errors"].get(metric, {}).get("max")
+                if error["max"] is None or reference is None:
+                    continue
+                if error["max"] > reference + slack.get(metric, 0.0):
+                    regressions.append({"case": name, "mode": mode, "metric": metric,
+                                        "baseline": reference, "current": error["max"], "column": error["column"]})
+
+            for kind in ("missing", "extra"):
+                new = sorted(set(now["flags"][kind]) - set(before["flags"][kind]))
+                if new:
+                    regressions.append({"case": name, "mode": mode, "metric": f"flags_{kind}",
+                                        "baseline": before["flags"][kind], "current": new, "column": None})
+    return regressions
+
+
+def format_case(name: str, entry: dict) -> str:
+    lines = [f"{name}: exact {entry['exact_seconds']:.2f}s"]
+    for mode, result in entry["modes"].items():
+        errors = ", ".join(f"{metric} {error['max']:g}" for metric, error in result["errors"].items()
+                           if error["max"] is not None)
+        flags = result["flags"]
+        mismatches = [f"-{key}" for key in flags["missing"]] + [f"+{key}" for key in flags["extra"]]
+        lines.append(f"  {mode}: {result['seconds']:.2f}s ({result['speedup']}x); {errors}")
+        lines.append(f"    flags agree {flags['agreement']:.0%}" + (f" ({', '.join(mismatches)})" if mismatches else ""))
+    return "\n".join(lines)
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.accuracy",
+                                     description="Compare approximate profiling modes with the exact profile.")
+    parser.add_argument("--case", action="append", default=None, metavar="ID",
+                        help="Only run the case with this id (repeatable)")
+    parser.add_argument("--mode", action="append", choices=MODES, default=None,
+                        help="Only run this mode (repeatable; default: all)")
+    parser.add_argument("--sample-size", type=int, default=DEFAULT_SAMPLE_SIZE,
+                        help=f"Rows profiled by the sampled mode (default: {DEFAULT_SAMPLE_SIZE})")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per mode; the fastest is kept (default: 1)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT,
+                        help="Results file (default: benchmarks/accuracy_results.json)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE,
+                        help="Baseline to compare against (default: benchmarks/accuracy_baseline.json)")
+    parser.add_argument("--update-baseline", action="store_true", help="Write these results as the new baseline")
+    args = parser.parse_args(argv)
+
+    cases = ACCURACY_CASES
+    if args.case:
+        unknown = set(args.case) - {case_id(case) for case in cases}
+        if unknown:
+            print(f"Error: unknown case(s): {', '.join(sorted(unknown))}", file=sys.stderr)
+            return 1
+        cases = [case for case in cases if case_id(case) in args.case]
+
+    results = {"environment": environment(), "sample_size": args.sample_size, "cases": {}}
+    for case in cases:
+        entry = run_case(case, modes=args.mode or MODES, sample_size=args.sample_size, repeat=args.repeat)
+        results["cases"][case_id(case)] = entry
+        print(format_case(case_id(case), entry), file=sys.stderr)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}", file=sys.stderr)
+
+    if args.update_baseline:
+        baseline = {"environment": results["environment"], "sample_size": args.sample_size, "cases": {}}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+        baseline["environment"] = results["environment"]
+        for name, entry in results["cases"].items():
+            # Modes outside this run keep their previous baseline
+            previous = baseline["cases"].get(name, {"modes": {}})
+            baseline["cases"][name] = {**entry, "modes": {**previous["modes"], **entry["modes"]}}
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2)
+        print(f"Baseline updated: {args.baseline}", file=sys.stderr)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one", file=sys.stderr)
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("sample_size") != args.sample_size:
+        print(f"Baseline was measured with --sample-size {baseline.get('sample_size')}; not comparing",
+              file=sys.stderr)
+        return 0
+
+    regressions = compare_to_baseline(results, baseline)
+    for regression in regressions:
+        column = f" ({regression['column']})" if regression["column"] else ""
+        print(f"REGRESSION {regression['case']} {regression['mode']} {regression['metric']}{column}: "
+              f"{regression['baseline']} -> {regression['current']}", file=sys.stderr)
+    if regressions:
+        return 1
+    print(f"No accuracy regressions against {args.baseline}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
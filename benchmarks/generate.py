@@ -0,0 +1,111 @@
+"""
+Synthetic datasets for the benchmark suite.
+
+generate_dataset builds a DataFrame from a handful of knobs (rows, columns,
+dtype mix, cardinality, null rate, duplicate rate, dirty-string rate) so
+profiling cost and accuracy can be measured along each axis separately.
+Values are vectorised draws from a seeded generator, so the same spec always
+produces the same file.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+# Column kinds cycled through for each dtype mix
+DTYPE_MIXES = {
+    "numeric": ("int", "float"),
+    "text": ("category", "text"),
+    "mixed": ("int", "float", "category", "text", "datetime", "bool"),
+}
+
+WORDS = np.array(["alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel",
+                  "india", "juliet", "kilo", "lima", "mike", "november", "oscar", "papa"], dtype=object)
+PLACEHOLDERS = np.array(["N/A", "unknown", "TBD", "null"], dtype=object)
+
+
+def generate_dataset(rows: int, columns: int, dtype_mix: str = "mixed", cardinality: float = 0.1,
+                     null_rate: float = 0.0, duplicate_rate: float = 0.0, dirty_rate: float = 0.0,
+                     seed: int = 42) -> pd.DataFrame:
+    """
+    Generate a synthetic table.
+
+    Args:
+        rows: Number of rows
+        columns: Number of columns, cycling through the kinds in DTYPE_MIXES[dtype_mix]
+        dtype_mix: "numeric", "text" or "mixed"
+        cardinality: Distinct values per column as a fraction of rows (at least 2;
+            boolean columns always have 2)
+        null_rate: Fraction of each column's values set to null
+        duplicate_rate: Fraction of rows that are exact copies of an earlier row
+        dirty_rate: Fraction of each string column's values given a quality issue:
+            surrounding whitespace, upper-casing or a placeholder such as "N/A"
+        seed: Random seed
+
+    Returns:
+        pd.DataFrame with columns named "<kind>_<position>"
+    """
+    if dtype_mix not in DTYPE_MIXES:
+        raise ValueError(f"Unknown dtype mix: {dtype_mix} (expected one of {', '.join(DTYPE_MIXES)})")
+
+    rng = np.random.default_rng(seed)
+    kinds = DTYPE_MIXES[dtype_mix]
+    n_distinct = max(2, int(rows * cardinality))
+
+    data = {}
+    for position in range(columns):
+        kind = kinds[position % len(kinds)]
+        values = _column_values(kind, rng.integers(0, n_distinct, rows), n_distinct, rng)
+        if dirty_rate > 0 and kind in ("category", "text"):
+            values = _dirty_strings(values, dirty_rate, rng)
+        if null_rate > 0:
+            values = pd.Series(values).mask(rng.random(rows) < null_rate)
+        data[f"{kind}_{position}"] = values
+    df = pd.DataFrame(data)
+
+    n_duplicates = int(rows * duplicate_rate)
+    if n_duplicates > 0:
+        # Overwrite random rows with copies of rows outside that set
+        take = np.arange(rows)
+        targets = rng.choice(rows, n_duplicates, replace=False)
+        sources = np.setdiff1d(take, targets)
+        take[targets] = rng.choice(sources, n_duplicates)
+        df = df.iloc[take].reset_index(drop=True)
+
+    return df
+
+
+def _dirty_strings(values: np.ndarray, dirty_rate: float, rng: np.random.Generator) -> np.ndarray:
+    """Give a fraction of string values a whitespace, casing or placeholder issue."""
+    values = values.copy()
+    positions = np.flatnonzero(rng.random(len(values)) < dirty_rate)
+    issues = rng.integers(0, 3, len(positions))
+
+    padded = positions[issues == 0]
+    values[padded] = [f" {value} " for value in values[padded]]
+    upper = positions[issues == 1]
+    values[upper] = [value.upper() for value in values[upper]]
+    placeholders = positions[issues == 2]
+    values[placeholders] = PLACEHOLDERS[rng.integers(0, len(PLACEHOLDERS), len(placeholders))]
+    return values
+
+
+def _column_values(kind: str, codes: np.ndarray, n_distinct: int, rng: np.random.Generator):
+    """Map integer codes to values of one column kind."""
+    if kind == "int":
+        return codes
+    if kind == "float":
+        return rng.normal(100, 25, n_distinct).round(3)[codes]
+    if kind == "category":
+        return np.array([f"cat_{i}" for i in range(n_distinct)], dtype=object)[codes]
+    if kind == "text":
+        # Two to six words per value, so string lengths vary like free text
+        lengths = rng.integers(2, 7, n_distinct)
+        pool = [" ".join(WORDS[rng.integers(0, len(WORDS), length)]) + f" {i}" for i, length in enumerate(lengths)]
+        return np.array(pool, dtype=object)[codes]
+    if kind == "datetime":
+        days = pd.Timestamp("2015-01-01") + pd.to_timedelta(np.arange(n_distinct) % 3650, unit="D")
+        return np.asarray(days.strftime("%Y-%m-%d"), dtype=object)[codes]
+    if kind == "bool":
+        return codes % 2 == 0
+    raise ValueError(f"Unknown column kind: {kind}")
@@ -0,0 +1,328 @@
+"""
+Profiler benchmark suite.
+
+Generates synthetic CSVs (see generate.py) and times each stage of the
+pipeline separately: load_file, profile_dataframe, quality flags and
+exports. Every case runs in a fresh worker process, so its peak memory is
+its own. Results go to a JSON file and are compared against a stored baseline:
+
+    python -m benchmarks.run_benchmarks --suite quick
+    python -m benchmarks.run_benchmarks --suite scaling --update-baseline
+
+The exit code is 1 when a stage is slower, or peak memory larger, than the
+baseline by more than --threshold (and by more than the noise floor). Without
+a baseline nothing is compared; use --check where that must fail, e.g. in CI:
+
+    python -m benchmarks.run_benchmarks --suite quick --check
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+try:
+    import resource
+except ImportError:  # Windows: peak memory is not recorded
+    resource = None
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+
+STAGES = ("load", "profile", "flags", "export")
+DEFAULT_OUTPUT = os.path.join(REPO_ROOT, "benchmarks", "results.json")
+DEFAULT_BASELINE = os.path.join(REPO_ROOT, "benchmarks", "baseline.json")
+DEFAULT_THRESHOLD = 0.25
+# Differences below these are noise, whatever the ratio
+MIN_SECONDS_DELTA = 0.05
+MIN_MEMORY_DELTA = 16 * 1024 * 1024
+
+
+def _case(rows, columns, dtype_mix="mixed", cardinality=0.1, null_rate=0.05, duplicate_rate=0.01) -> dict:
+    return {"rows": rows, "columns": columns, "dtype_mix": dtype_mix, "cardinality": cardinality,
+            "null_rate": null_rate, "duplicate_rate": duplicate_rate}
+
+
+SUITES = {
+    # A minute or so; for checking a change before pushing it
+    "quick": [
+        _case(20_000, 10),
+        _case(20_000, 10, dtype_mix="numeric"),
+        _case(20_000, 10, dtype_mix="text"),
+        _case(2_000, 100),
+    ],
+    # How cost grows along each axis
+    "scaling": (
+        [_case(rows, columns, dtype_mix=mix) for rows in (10_000, 100_000, 1_000_000) for columns in (10, 50)
+         for mix in ("numeric", "mixed")]
+        + [_case(100_000, 10, cardinality=cardinality) for cardinality in (0.001, 1.0)]
+        + [_case(100_000, 10, null_rate=null_rate) for null_rate in (0.0, 0.5)]
+        + [_case(100_000, 10, duplicate_rate=duplicate_rate) for duplicate_rate in (0.0, 0.3)]
+    ),
+}
+
+
+def case_id(case: dict) -> str:
+    """Stable name for a case, e.g. "mixed-100000x10-card0.1-null0.05-dup0.01"."""
+    name = (f"{case['dtype_mix']}-{case['rows']}x{case['columns']}-card{case['cardinality']}"
+            f"-null{case['null_rate']}-dup{case['duplicate_rate']}")
+    if case.get("dirty_rate"):
+        name += f"-dirty{case['dirty_rate']}"
+    return name
+
+
+def _suite_cases(suite: str) -> list:
+    """Cases of a suite, without the repeats that overlapping sweeps produce."""
+    cases = {}
+    for case in SUITES[suite]:
+        cases.setdefault(case_id(case), case)
+    return list(cases.values())
+
+
+def _dataset_path(case: dict, data_dir: str) -> str:
+    """Generate the case's CSV once and reuse it across runs."""
+    from benchmarks.generate import generate_dataset
+
+    path = os.path.join(data_dir, case_id(case) + ".csv")
+    if not os.path.exists(path):
+        os.makedirs(data_dir, exist_ok=True)
+        df = generate_dataset(**case)
+        temp_path = path + ".tmp"
+        df.to_csv(temp_path, index=False)
+        os.replace(temp_path, path)
+    return path
+
+
+def _peak_rss_bytes():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _run_case(path: str, repeat: int) -> dict:
+    """
+    Worker: time each stage `repeat` times and keep the fastest run of each.
+
+    Peak memory is taken after the first run, before memory the allocator
+    kept from it can skew later runs.
+    """
+    from cli import write_exports
+    from io_utils import load_file
+    from profiling import profile_dataframe, apply_quality_flags
+
+    baseline_rss = _peak_rss_bytes()
+    peak_rss = None
+    best = {stage: None for stage in STAGES}
+    with tempfile.TemporaryDirectory() as export_dir:
+        for _ in range(repeat):
+            seconds = {}
+
+            start = time.perf_counter()
+            with open(path, "rb") as f:
+                df = load_file(f)
+            seconds["load"] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            profile = profile_dataframe(df, top_n=10)
+            seconds["profile"] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            profile = apply_quality_flags(profile, 10.0, 5)
+            seconds["flags"] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            write_exports(profile, "benchmark", export_dir, {"csv", "json"})
+            seconds["export"] = time.perf_counter() - start
+
+            for stage in STAGES:
+                if best[stage] is None or seconds[stage] < best[stage]:
+                    best[stage] = seconds[stage]
+            del df, profile
+            if peak_rss is None:
+                peak_rss = _peak_rss_bytes()
+
+    return {
+        "seconds": best,
+        "peak_rss_bytes": peak_rss,
+        "peak_rss_delta_bytes": peak_rss - baseline_rss if peak_rss is not None else None,
+    }
+
+
+def environment() -> dict:
+    """Versions and machine the results were measured with."""
+    from profiling import PROFILER_VERSION
+    import numpy as np
+    import pandas as pd
+
+    return {
+        "profiler_version": PROFILER_VERSION,
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run_suite(cases: list, data_dir: str, repeat: int = 3, progress=None) -> dict:
+    """
+    Run cases, each in a fresh worker process.
+
+    Returns:
+        Results dict with "environment" and "cases" (per case id: spec, file size,
+        fastest seconds and rows/s per stage, and peak RSS)
+    """
+    results = {
+        "environment": environment(),
+        "repeat": repeat,
+        "cases": {},
+    }
+
+    context = get_context("spawn")
+    for case in cases:
+        path = _dataset_path(case, data_dir)
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            measured = pool.submit(_run_case, path, repeat).result()
+
+        rows = case["rows"]
+        stages = {
+            stage: {"seconds": round(seconds, 4), "rows_per_second": round(rows / seconds, 1) if seconds > 0 else None}
+            for stage, seconds in measured["seconds"].items()
+        }
+        entry = {
+            "spec": case,
+            "file_bytes": os.path.getsize(path),
+            "stages": stages,
+            "total_seconds": round(sum(measured["seconds"].values()), 4),
+            "peak_rss_bytes": measured["peak_rss_bytes"],
+            "peak_rss_delta_bytes": measured["peak_rss_delta_bytes"],
+        }
+        results["cases"][case_id(case)] = entry
+        if progress is not None:
+            progress(case_id(case), entry)
+    return results
+
+
+def compare_to_baseline(results: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> list:
+    """
+    Regressions of `results` against `baseline`: stages slower, or peak memory
+    above, the baseline by more than `threshold` (a fraction) and by more than
+    the noise floor. Cases missing from the baseline are not compared.
+
+    Returns:
+        List of dicts with case, metric, baseline, current and ratio
+    """
+    regressions = []
+    for name, current in results["cases"].items():
+        previous = baseline.get("cases", {}).get(name)
+        if previous is None:
+            continue
+
+        metrics = [(f"{stage}_seconds", current["stages"][stage]["seconds"],
+                    previous["stages"].get(stage, {}).get("seconds"), MIN_SECONDS_DELTA) for stage in STAGES]
+        metrics.append(("peak_rss_delta_bytes", current.get("peak_rss_delta_bytes"),
+                        previous.get("peak_rss_delta_bytes"), MIN_MEMORY_DELTA))
+
+        for metric, value, reference, noise_floor in metrics:
+            if value is None or not reference:
+                continue
+            if value > reference * (1 + threshold) and value - reference > noise_floor:
+                regressions.append({"case": name, "metric": metric, "baseline": reference, "current": value,
+                                    "ratio": round(value / reference, 2)})
+    return regressions
+
+
+def missing_from_baseline(results: dict, baseline: dict) -> list:
+    """Ids of the cases in `results` that `baseline` has no entry for, so compare_to_baseline skips."""
+    return [name for name in results["cases"] if name not in baseline.get("cases", {})]
+
+
+def format_case(name: str, entry: dict) -> str:
+    stages = ", ".join(f"{stage} {timing['seconds']:.3f}s" for stage, timing in entry["stages"].items())
+    line = f"{name}: {stages}; profile {entry['stages']['profile']['rows_per_second']:,.0f} rows/s"
+    if entry["peak_rss_delta_bytes"] is not None:
+        line += f", peak +{entry['peak_rss_delta_bytes'] / 1024 ** 2:,.0f} MB"
+    return line
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run_benchmarks",
+                                     description="Time load, profiling, flagging and export on synthetic data.")
+    parser.add_argument("--suite", choices=sorted(SUITES), default="quick", help="Cases to run (default: quick)")
+    parser.add_argument("--case", action="append", default=None, metavar="ID",
+                        help="Only run the suite case with this id (repeatable)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case; the fastest is kept (default: 3)")
+    parser.add_argument("--data-dir", default=os.path.join(tempfile.gettempdir(), "data_profiler_benchmarks"),
+                        help="Where generated CSVs are cached between runs")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Results file (default: benchmarks/results.json)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE,
+                        help="Baseline results to compare against (default: benchmarks/baseline.json)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Allowed slowdown or memory growth as a fraction (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--update-baseline", action="store_true", help="Write these results as the new baseline")
+    parser.add_argument("--check", action="store_true",
+                        help="Fail when the baseline, or a case in it, is missing instead of not comparing")
+    args = parser.parse_args(argv)
+
+    cases = _suite_cases(args.suite)
+    if args.case:
+        unknown = set(args.case) - {case_id(case) for case in cases}
+        if unknown:
+            print(f"Error: unknown case(s) in suite {args.suite}: {', '.join(sorted(unknown))}", file=sys.stderr)
+            return 1
+        cases = [case for case in cases if case_id(case) in args.case]
+
+    if args.check and not args.update_baseline and not os.path.exists(args.baseline):
+        print(f"Error: no baseline at {args.baseline}; create one with --update-baseline on this machine",
+              file=sys.stderr)
+        return 1
+
+    results = run_suite(cases, args.data_dir, repeat=args.repeat,
+                        progress=lambda name, entry: print(format_case(name, entry), file=sys.stderr))
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}", file=sys.stderr)
+
+    if args.update_baseline:
+        baseline = {"environment": results["environment"], "cases": {}}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+        # Cases outside this run keep their previous baseline
+        baseline["environment"] = results["environment"]
+        baseline["cases"].update(results["cases"])
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2)
+        print(f"Baseline updated: {args.baseline}", file=sys.stderr)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one", file=sys.stderr)
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    regressions = compare_to_baseline(results, baseline, args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression['case']} {regression['metric']}: {regression['baseline']} -> "
+              f"{regression['current']} ({regression['ratio']}x)", file=sys.stderr)
+    missing = missing_from_baseline(results, baseline)
+    for name in missing:
+        print(f"{'MISSING' if args.check else 'Not compared'} {name}: no baseline entry", file=sys.stderr)
+    if regressions or (args.check and missing):
+        return 1
+    print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
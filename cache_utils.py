@@ -0,0 +1,194 @@
+"""
+Persistent on-disk cache for finished profiles.
+
+Entries are stored as zlib-compressed JSON, one file per key, and evicted
+least-recently-used first once the cache exceeds its size cap. Writes go to a
+temporary file that is atomically renamed into place, so several app workers
+or batch processes can share one cache directory.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+import zlib
+
+try:
+    import fcntl
+except ImportError:  # Windows: eviction runs without a cross-process lock
+    fcntl = None
+
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "data_profiler")
+DEFAULT_CACHE_MAX_BYTES = 512 * 1024 * 1024  # 512 MB
+
+ENTRY_MAGIC = b"DPC1"
+ENTRY_SUFFIX = ".bin"
+STALE_TEMP_SECONDS = 3600  # leftover temp files from crashed writers
+
+
+def _json_default(value):
+    """
+    Serialise the non-JSON values profiles may hold: NumPy scalars and arrays.
+
+    NumPy is recognised by module name so the CLI can import this module
+    without loading it. Anything else raises TypeError rather than being
+    stored as a string that would not round-trip.
+    """
+    if type(value).__module__ == "numpy" and hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"Cannot serialise {type(value).__name__} for the profile cache")
+
+
+def file_content_hash(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """
+    SHA-256 hex digest of a file's content, read in chunks.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def profile_cache_key(content_hash: str, profiler_version: str, settings: dict) -> str:
+    """
+    Build a cache key from the file content hash, profiler version and profiling settings.
+
+    Args:
+        content_hash: Hash of the raw file content
+        profiler_version: Version of the profiling code that produced the entry
+        settings: Profiling settings that change the output (must be JSON-serialisable)
+
+    Returns:
+        Hex digest identifying the cache entry
+
+    Raises:
+        TypeError: If a setting cannot be serialised
+    """
+    payload = json.dumps([content_hash, profiler_version, settings], sort_keys=True, default=_json_default)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ProfileCache:
+    """
+    Size-capped LRU cache of profile dicts on disk.
+
+    Args:
+        cache_dir: Directory holding cache entries (defaults to $DATA_PROFILER_CACHE_DIR
+            or ~/.cache/data_profiler)
+        max_bytes: Total size above which least-recently-used entries are evicted
+    """
+
+    def __init__(self, cache_dir: str = None, max_bytes: int = DEFAULT_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir or os.environ.get("DATA_PROFILER_CACHE_DIR", DEFAULT_CACHE_DIR)
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + ENTRY_SUFFIX)
+
+    def get(self, key: str):
+        """
+        Return the cached value for `key`, or None on a miss.
+
+        Unreadable or corrupt entries are removed and treated as misses.
+        """
+        path = self._entry_path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            # Touch the entry so eviction sees it as recently used
+            os.utime(path, None)
+        except FileNotFoundError:
+            return None
+        except OSError:
+            return None
+
+        try:
+            if not data.startswith(ENTRY_MAGIC):
+                raise ValueError("Unknown cache entry format")
+            return json.loads(zlib.decompress(data[len(ENTRY_MAGIC):]).decode("utf-8"))
+        except (ValueError, zlib.error):
+            self._remove(path)
+            return None
+
+    def put(self, key: str, value) -> None:
+        """
+        Store a JSON-serialisable value under `key`, then evict down to the size cap.
+
+        NumPy scalars and arrays are stored as the equivalent Python numbers and lists.
+
+        Raises:
+            TypeError: If the value holds anything else that JSON cannot represent
+        """
+        payload = json.dumps(value, separators=(",", ":"), default=_json_default).encode("utf-8")
+        data = ENTRY_MAGIC + zlib.compress(payload, 6)
+
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            # Atomic on POSIX and Windows: readers see the old entry or the new one
+            os.replace(temp_path, self._entry_path(key))
+        except OSError:
+            self._remove(temp_path)
+            return
+
+        self._evict()
+
+    def get_or_compute(self, key: str, compute):
+        """
+        Return the cached value for `key`, computing and storing it with `compute()` on a miss.
+        """
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        """Remove every cache entry."""
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(ENTRY_SUFFIX) or entry.name.endswith(".tmp"):
+                self._remove(entry.path)
+
+    def _evict(self) -> None:
+        """Delete least-recently-used entries until the cache fits in max_bytes."""
+        lock_path = os.path.join(self.cache_dir, ".evict.lock")
+        with open(lock_path, "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+            entries = []
+            total_bytes = 0
+            now = time.time()
+            for entry in os.scandir(self.cache_dir):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+
+                if entry.name.endswith(".tmp"):
+                    if now - stat.st_mtime > STALE_TEMP_SECONDS:
+                        self._remove(entry.path)
+                    continue
+
+                if entry.name.endswith(ENTRY_SUFFIX):
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total_bytes += stat.st_size
+
+            # Oldest access first
+            for _, size, path in sorted(entries):
+                if total_bytes <= self.max_bytes:
+                    break
+                self._remove(path)
+                total_bytes -= size
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass  # Already removed by another worker
@@ -0,0 +1,282 @@
+"""
+Headless command-line profiler.
+
+Profiles a CSV or Excel file without the web UI and writes the same exports as
+the app's download buttons:
+
+    python -m cli data.csv --output-dir profiles/
+
+A directory or glob pattern profiles every matching file with a worker pool
+(see batch.py) and also writes an aggregate index:
+
+    python -m cli "landing/**/*.csv" --output-dir profiles/ --workers 8
+
+Only the standard library is imported at module level; pandas and the
+profiling modules are imported once a file is actually profiled, so `--help`
+and argument errors return immediately.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from cache_utils import ProfileCache, file_content_hash, profile_cache_key
+
+
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_INTERRUPTED = 130
+
+# Profiles keep this many top values, matching the app, so cached entries are interchangeable
+MAX_TOP_N_VALUES = 10
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m cli",
+        description="Profile a CSV or Excel file and write column summary, dataset summary and full profile exports.",
+    )
+    parser.add_argument("path", help="CSV, XLSX or XLS file to profile, or a directory or glob pattern for batch mode")
+    parser.add_argument("-o", "--output-dir", default=".",
+                        help="Directory for the exported files (default: current directory)")
+    parser.add_argument("--formats", default="csv,json",
+                        help="Comma-separated exports to write: csv (column and dataset summaries), json (full profile)")
+    parser.add_argument("--null-threshold", type=float, default=10.0,
+                        help="Missing %% at or above which a column is flagged (default: 10)")
+    parser.add_argument("--top-n", type=int, default=5, choices=range(1, MAX_TOP_N_VALUES + 1), metavar="N",
+                        help=f"Top values kept per column (1-{MAX_TOP_N_VALUES}, default: 5)")
+    parser.add_argument("--max-key-width", type=int, default=2,
+                        help="Largest column combination tested for candidate keys (default: 2)")
+    parser.add_argument("--sample-size", type=int, default=None,
+                        help="Profile a random sample of this many rows instead of the whole file")
+    parser.add_argument("--time-budget", type=float, default=None,
+                        help="Soft limit in seconds; expensive metrics are sampled or skipped to meet it")
+    parser.add_argument("--memory-budget-mb", type=int, default=None,
+                        help="RAM budget in MB; files estimated to exceed it are streamed in chunks or sampled")
+    parser.add_argument("--exact-memory", action="store_true",
+                        help="Measure memory usage with a deep scan instead of a sampled estimate")
+    parser.add_argument("--track-memory", action="store_true",
+                        help="Record peak and net memory per stage and column in the profile (slower)")
+    parser.add_argument("--cache-dir", default=None,
+                        help="Profile cache directory (default: $DATA_PROFILER_CACHE_DIR or ~/.cache/data_profiler)")
+    parser.add_argument("--no-cache", action="store_true", help="Neither read nor write the profile cache")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Batch mode: worker processes (default: CPU count)")
+    parser.add_argument("--memory-limit-mb", type=int, default=None,
+                        help="Batch mode: address-space cap per worker in MB (at least 512); "
+                             "larger files fail individually")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Do not report progress on stderr")
+    return parser
+
+
+def profile_file(path: str, max_key_width: int = 2, sample_size: int = None, time_budget: float = None,
+                 cache: ProfileCache = None, progress_callback=None, cancel_event=None,
+                 track_memory: bool = False, memory_budget: int = None, exact_memory: bool = False) -> dict:
+    """
+    Profile a file on disk, reusing the profile cache shared with the app.
+
+    With a `memory_budget` (bytes) and no `sample_size`, the file's memory
+    needs are estimated first and it is profiled in memory, in chunks or
+    sampled to fit (see memory_budget.plan_execution). The chosen plan is
+    recorded as the dataset's "execution" entry. A chunked profile cannot apply
+    `time_budget`, `track_memory` or `exact_memory`; those requested are
+    listed under the entry's "options_not_applied".
+
+    Time-budgeted profiles depend on machine load, so they are neither read
+    from nor written to the cache; nor are memory-tracked ones, since a cached
+    profile would not be measured.
+
+    Returns:
+        Profile dict with all top values kept (quality flags are not attached)
+    """
+    from io_utils import load_file, load_sample
+    from profiling import profile_dataframe, add_stage_timing, stage_clock, stage_timing, PROFILER_VERSION
+
+    plan = None
+    if memory_budget is not None and sample_size is None:
+        from memory_budget import plan_execution
+        plan = plan_execution(path, memory_budget)
+        if plan["mode"] == "sampled":
+            sample_size = plan["sample_size"]
+        elif plan["mode"] == "chunked":
+            # Chunks are profiled through a profile state, which has no time budget or memory tracking
+            requested = {"time_budget": time_budget is not None, "track_memory": track_memory,
+                         "exact_memory": exact_memory}
+            not_applied = [name for name, value in requested.items() if value]
+            if not_applied:
+                plan["options_not_applied"] = not_applied
+            time_budget, track_memory, exact_memory = None, False, False
+
+    def _profile():
+        if plan is not None and plan["mode"] == "chunked":
+            from memory_budget import profile_csv_in_chunks
+            return profile_csv_in_chunks(path, plan["chunk_rows"], max_key_width=max_key_width,
+                                         top_n=MAX_TOP_N_VALUES, progress_callback=progress_callback,
+                                         cancel_event=cancel_event)
+
+        load_start = stage_clock()
+        with open(path, "rb") as f:
+            if sample_size is not None:
+                df, total_rows = load_sample(f, sample_size)
+                options = {"population_rows": total_rows}
+            else:
+                df = load_file(f)
+                options = {"column_cache": cache} if cache is not None else {}
+        load_timing = stage_timing(load_start, len(df))
+
+        profile = profile_dataframe(df, max_key_width=max_key_width, top_n=MAX_TOP_N_VALUES,
+                                    time_budget=time_budget, progress_callback=progress_callback,
+                                    cancel_event=cancel_event, track_memory=track_memory,
+                                    exact_memory=exact_memory, **options)
+        add_stage_timing(profile, "load", load_timing)
+        return profile
+
+    if cache is None or time_budget is not None or track_memory:
+        profile = _profile()
+    else:
+        settings = {"max_key_width": max_key_width, "top_n": MAX_TOP_N_VALUES, "deferred_sections": [],
+                    "sample_size": sample_size}
+        if plan is not None and plan["mode"] == "chunked":
+            # Chunk boundaries decide which rows candidate keys are discovered on
+            settings["execution"] = "chunked"
+            settings["chunk_rows"] = plan["chunk_rows"]
+        if exact_memory:
+            settings["exact_memory"] = True
+        cache_key = profile_cache_key(file_content_hash(path), PROFILER_VERSION, settings)
+        profile = cache.get_or_compute(cache_key, _profile)
+
+    if plan is not None:
+        profile["dataset"]["execution"] = plan
+    return profile
+
+
+def write_exports(profile: dict, file_name: str, output_dir: str, formats: set) -> list:
+    """
+    Write the app's download files for a flagged profile.
+
+    Returns:
+        List of paths written
+    """
+    from export_utils import profile_to_summary_df, dataset_summary_to_dict
+    import pandas as pd
+
+    os.makedirs(output_dir, exist_ok=True)
+    written = []
+
+    if "csv" in formats:
+        column_path = os.path.join(output_dir, f"{file_name}_column_profile.csv")
+        profile_to_summary_df(profile).to_csv(column_path, index=False)
+        dataset_path = os.path.join(output_dir, f"{file_name}_dataset_summary.csv")
+        pd.DataFrame([dataset_summary_to_dict(profile)]).to_csv(dataset_path, index=False)
+        written += [column_path, dataset_path]
+
+    if "json" in formats:
+        json_path = os.path.join(output_dir, f"{file_name}_full_profile.json")
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(profile, f, indent=2)
+        written.append(json_path)
+
+    return written
+
+
+def megabytes_to_bytes(value: int) -> int:
+    """Convert a size option in MB to bytes; None (or 0) means no limit and stays None."""
+    return value * 1024 * 1024 if value else None
+
+
+def _stderr_progress(event: dict) -> None:
+    if event["status"] != "finished":
+        return
+    label = event["column"] if event["stage"] == "column" else event["stage"].replace("_", " ")
+    print(f"[{event['completed']}/{event['total']}] {label} ({event['elapsed_seconds']:.1f}s)", file=sys.stderr)
+
+
+def main(argv: list = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    formats = {fmt.strip().lower() for fmt in args.formats.split(",") if fmt.strip()}
+    unknown = formats - {"csv", "json"}
+    if unknown or not formats:
+        print(f"Error: unknown export format(s): {', '.join(sorted(unknown)) or args.formats!r}", file=sys.stderr)
+        return EXIT_ERROR
+    if os.path.isdir(args.path) or any(char in args.path for char in "*?["):
+        return _main_batch(args, formats)
+    if not os.path.isfile(args.path):
+        print(f"Error: no such file: {args.path}", file=sys.stderr)
+        return EXIT_ERROR
+
+    cache = None if args.no_cache else ProfileCache(args.cache_dir)
+
+    start = time.perf_counter()
+    try:
+        profile = profile_file(args.path, max_key_width=args.max_key_width, sample_size=args.sample_size,
+                               time_budget=args.time_budget, cache=cache, track_memory=args.track_memory,
+                               memory_budget=megabytes_to_bytes(args.memory_budget_mb), exact_memory=args.exact_memory,
+                               progress_callback=None if args.quiet else _stderr_progress)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return EXIT_ERROR
+    except KeyboardInterrupt:
+        print("Profiling interrupted", file=sys.stderr)
+        return EXIT_INTERRUPTED
+
+    from profiling import apply_quality_flags
+    profile = apply_quality_flags(profile, args.null_threshold, args.top_n)
+    written = write_exports(profile, os.path.basename(args.path), args.output_dir, formats)
+
+    if not args.quiet:
+        dataset = profile["dataset"]
+        print(f"Profiled {dataset['n_rows']:,} rows and {dataset['n_columns']} columns "
+              f"in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+        if "memory" in profile:
+            memory = profile["memory"]
+            line = f"Peak traced memory {memory['peak_bytes'] / 1024 ** 2:,.1f} MB"
+            if "rss_peak_bytes" in memory:
+                line += f", peak RSS {memory['rss_peak_bytes'] / 1024 ** 2:,.1f} MB"
+            print(line, file=sys.stderr)
+    not_applied = profile["dataset"].get("execution", {}).get("options_not_applied")
+    if not_applied:
+        options = ", ".join("--" + name.replace("_", "-") for name in not_applied)
+        print(f"Warning: {options} not applied; the file was profiled in chunks to fit the memory budget",
+              file=sys.stderr)
+    for path in written:
+        print(path)
+    return EXIT_OK
+
+
+def _main_batch(args, formats: set) -> int:
+    from batch import discover_files, run_batch, format_throughput, _stderr_file_progress
+
+    paths = discover_files(args.path)
+    if not paths:
+        print(f"Error: no CSV or Excel files match {args.path}", file=sys.stderr)
+        return EXIT_ERROR
+
+    options = {
+        "max_key_width": args.max_key_width, "sample_size": args.sample_size, "time_budget": args.time_budget,
+        "track_memory": args.track_memory, "memory_budget_mb": args.memory_budget_mb,
+        "exact_memory": args.exact_memory,
+        "null_threshold": args.null_threshold, "top_n": args.top_n,
+        "formats": formats,
+        "cache_dir": args.cache_dir, "no_cache": args.no_cache,
+    }
+    try:
+        index = run_batch(paths, args.output_dir, options, workers=args.workers,
+                          memory_limit_bytes=megabytes_to_bytes(args.memory_limit_mb),
+                          progress_callback=None if args.quiet else _stderr_file_progress(len(paths)))
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return EXIT_ERROR
+    except KeyboardInterrupt:
+        print("Batch interrupted", file=sys.stderr)
+        return EXIT_INTERRUPTED
+
+    print(format_throughput(index["summary"]), file=sys.stderr)
+    print(os.path.join(args.output_dir, "index.json"))
+    return EXIT_OK if index["summary"]["failed"] == 0 else EXIT_ERROR
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -31,9 +31,11 @@ def profile_to_summary_df(profile: dict) -> pd.DataFrame:
             "Type": col_profile["inferred_type"],
             "Pandas Dtype": col_profile["pandas_dtype"],
             "Missing %": col_profile["missing_pct"],
+            "Missing % CI": format_ci(col_profile.get("missing_pct_ci")),
             "Null Count": col_profile["null_count"],
             "Non-Null Count": col_profile["non_null_count"],
             "Unique Count": col_profile["unique_count"],
+            "Memory (KB)": _format_kilobytes(col_profile.get("memory_bytes")),
             "Top Values": top_values_str,
             "Numeric Stats": numeric_stats_str,
             "Datetime Range": datetime_stats_str,
@@ -43,7 +45,18 @@ def profile_to_summary_df(profile: dict) -> pd.DataFrame:
 
         rows.append(row)
 
-    return pd.DataFrame(rows)
+    summary_df = pd.DataFrame(rows)
+
+    # Confidence intervals only exist for sampled profiles
+    if "sampling" not in profile.get("dataset", {}):
+        summary_df = summary_df.drop(columns=["Missing % CI"])
+
+    return summary_df
+
+
+def _format_kilobytes(n_bytes) -> float:
+    """Bytes as KB rounded to one decimal, or None for profiles without per-column memory."""
+    return round(n_bytes / 1024, 1) if n_bytes is not None else None
 
 
 def _format_top_values(top_values: list, max_display: int = 3) -> str:
@@ -166,6 +179,28 @@ def _format_string_quality(sq: dict) -> str:
     return "; ".join(parts) if parts else ""
 
 
+def format_ci(interval: list) -> str:
+    """
+    Format a confidence interval of percentages as a readable string.
+    Example: "95% CI 1.2–3.4%"
+    """
+    if not interval:
+        return ""
+
+    return f"95% CI {interval[0]:.1f}–{interval[1]:.1f}%"
+
+
+def format_candidate_keys(keys: list) -> str:
+    """
+    Format candidate keys as a readable string.
+    Example: "order_id; customer_id + order_date"
+    """
+    if not keys:
+        return ""
+
+    return "; ".join(" + ".join(key) for key in keys)
+
+
 def dataset_summary_to_dict(profile: dict) -> dict:
     """
     Extract dataset-level summary for export.
@@ -175,6 +210,7 @@ def dataset_summary_to_dict(profile: dict) -> dict:
     """
     dataset = profile.get("dataset", {})
     dup_analysis = dataset.get("duplicate_analysis", {})
+    candidate_keys = dataset.get("candidate_keys", {})
 
     summary = {
         "Total Rows": dataset.get("n_rows", 0),
@@ -183,6 +219,71 @@ def dataset_summary_to_dict(profile: dict) -> dict:
         "Unique Rows": dup_analysis.get("unique_rows", 0),
         "Duplicate Rows": dup_analysis.get("duplicate_rows", 0),
         "Duplicate %": dup_analysis.get("duplicate_pct", 0),
+        "Near-Duplicate Rows": (dup_analysis.get("near_duplicates") or {}).get("near_duplicate_rows", 0),
+        "Candidate Keys": format_candidate_keys(candidate_keys.get("keys", [])),
     }
+    if candidate_keys.get("partial"):
+        summary["Candidate Keys Scope"] = "partial"
+    elif candidate_keys.get("scope") == "sample":
+        summary["Candidate Keys Scope"] = "sample"
+
+    sampling = dataset.get("sampling")
+    if sampling:
+        summary["Sample Rows"] = sampling["sample_rows"]
+        summary["Population Rows"] = sampling["population_rows"]
+        # Duplicates are counted among sampled rows only and understate the population's
+        summary["Duplicate % Scope"] = dup_analysis.get("scope", "sample")
 
     return summary
+
+
+def _format_kernels(kernels: dict, max_display: int = 3) -> str:
+    """
+    Format kernel timings, slowest first.
+    Example: "_analyze_string_quality 0.142s, _infer_type 0.003s"
+    """
+    if not kernels:
+        return ""
+
+    slowest = sorted(kernels.items(), key=lambda item: item[1], reverse=True)
+    result = ", ".join(f"{kernel} {seconds:.3f}s" for kernel, seconds in slowest[:max_display])
+    if len(slowest) > max_display:
+        result += "..."
+    return result
+
+
+def stage_timings_to_df(timings: dict) -> pd.DataFrame:
+    """
+    One row per profiling stage from a profile's "timings" section.
+    """
+    rows = []
+    for stage, timing in timings.get("stages", {}).items():
+        if timing is None:
+            continue
+        rows.append({
+            "Stage": stage.replace("_", " ").title(),
+            "Wall (s)": timing["wall_seconds"],
+            "CPU (s)": timing["cpu_seconds"],
+            "Kernels": _format_kernels(timing.get("kernels")),
+        })
+
+    return pd.DataFrame(rows, columns=["Stage", "Wall (s)", "CPU (s)", "Kernels"])
+
+
+def column_timings_to_df(timings: dict) -> pd.DataFrame:
+    """
+    One row per column from a profile's "timings" section, slowest first.
+    """
+    rows = []
+    for col_name, timing in timings.get("columns", {}).items():
+        rows.append({
+            "Column": col_name,
+            "Path": timing.get("path", ""),
+            "Wall (s)": timing["wall_seconds"],
+            "CPU (s)": timing["cpu_seconds"],
+            "Rows/s": timing.get("rows_per_second"),
+            "Kernels": _format_kernels(timing.get("kernels")),
+        })
+
+    columns_df = pd.DataFrame(rows, columns=["Column", "Path", "Wall (s)", "CPU (s)", "Rows/s", "Kernels"])
+    return columns_df.sort_values("Wall (s)", ascending=False, kind="stable").reset_index(drop=True)
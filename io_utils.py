@@ -2,7 +2,10 @@
 File loading utilities for CSV and Excel files.
 """
 
+import io
+
 import pandas as pd
+import numpy as np
 from typing import Optional
 
 
@@ -55,3 +58,128 @@ def load_file(uploaded_file) -> pd.DataFrame:
     except Exception as e:
         # Catch any other errors (corrupt files, parsing errors, etc.)
         raise ValueError(f"Error reading file: {str(e)}")
+
+
+def load_preview(uploaded_file, n_rows: int = 20) -> pd.DataFrame:
+    """
+    Load only the first rows of a CSV or Excel file for display.
+
+    Args:
+        uploaded_file: Streamlit UploadedFile object (or any named binary file object)
+        n_rows: Number of data rows to read
+
+    Returns:
+        pd.DataFrame: The first `n_rows` rows
+
+    Raises:
+        ValueError: If file format is unsupported or file cannot be read
+    """
+    if uploaded_file is None:
+        raise ValueError("No file provided")
+
+    file_extension = uploaded_file.name.lower().split('.')[-1]
+
+    try:
+        if file_extension == 'csv':
+            try:
+                return pd.read_csv(uploaded_file, encoding='utf-8', nrows=n_rows)
+            except UnicodeDecodeError:
+                uploaded_file.seek(0)
+                return pd.read_csv(uploaded_file, encoding='latin1', nrows=n_rows)
+
+        elif file_extension in ['xlsx', 'xls']:
+            return pd.read_excel(uploaded_file, sheet_name=0, nrows=n_rows)
+
+        else:
+            raise ValueError(f"Unsupported file format: .{file_extension}. Please upload a CSV or Excel file.")
+
+    except ValueError:
+        raise
+    except Exception as e:
+        raise ValueError(f"Error reading file: {str(e)}")
+
+
+def load_sample(uploaded_file, sample_size: int, random_state: int = 42,
+                chunk_size: int = 100_000) -> tuple:
+    """
+    Load a reproducible uniform random sample of rows without holding the whole file.
+
+    CSV files are streamed in chunks through a reservoir: every row gets a random
+    key and the `sample_size` rows with the smallest keys are kept, which is a
+    uniform sample whatever the chunking. Excel files are read whole and sampled.
+
+    Args:
+        uploaded_file: Streamlit UploadedFile object (or any named binary file object)
+        sample_size: Number of rows to keep
+        random_state: Seed for reproducible sampling
+        chunk_size: Rows read per CSV chunk
+
+    Returns:
+        tuple: (sampled DataFrame in file order, with original row numbers as index;
+            total number of rows in the file)
+
+    Raises:
+        ValueError: If file format is unsupported or file cannot be read
+    """
+    if uploaded_file is None:
+        raise ValueError("No file provided")
+
+    file_extension = uploaded_file.name.lower().split('.')[-1]
+
+    try:
+        if file_extension == 'csv':
+            try:
+                sample, total_rows = _reservoir_sample_csv(uploaded_file, 'utf-8', sample_size,
+                                                           random_state, chunk_size)
+            except UnicodeDecodeError:
+                uploaded_file.seek(0)
+                sample, total_rows = _reservoir_sample_csv(uploaded_file, 'latin1', sample_size,
+                                                           random_state, chunk_size)
+
+        elif file_extension in ['xlsx', 'xls']:
+            df = pd.read_excel(uploaded_file, sheet_name=0)
+            total_rows = len(df)
+            sample = df if total_rows <= sample_size else df.sample(n=sample_size, random_state=random_state)
+
+        else:
+            raise ValueError(f"Unsupported file format: .{file_extension}. Please upload a CSV or Excel file.")
+
+        if total_rows == 0:
+            raise ValueError("The uploaded file is empty")
+
+        return sample.sort_index(), total_rows
+
+    except ValueError:
+        raise
+    except Exception as e:
+        raise ValueError(f"Error reading file: {str(e)}")
+
+
+def _reservoir_sample_csv(file, encoding: str, sample_size: int, random_state: int,
+                          chunk_size: int) -> tuple:
+    """Stream a CSV and keep the rows with the `sample_size` smallest random keys."""
+    rng = np.random.default_rng(random_state)
+    reservoir = None
+    reservoir_keys = np.empty(0)
+    total_rows = 0
+
+    # Raw text per chunk, so chunks cannot disagree on dtypes
+    for chunk in pd.read_csv(file, encoding=encoding, chunksize=chunk_size, dtype=str):
+        total_rows += len(chunk)
+        keys = np.concatenate([reservoir_keys, rng.random(len(chunk))])
+        candidates = chunk if reservoir is None else pd.concat([reservoir, chunk])
+
+        if len(candidates) > sample_size:
+            keep = np.argpartition(keys, sample_size - 1)[:sample_size]
+            candidates = candidates.iloc[keep]
+            keys = keys[keep]
+
+        reservoir, reservoir_keys = candidates, keys
+
+    if reservoir is None:
+        return pd.DataFrame(), 0
+
+    # Parse the sampled text the way a full read would
+    parsed = pd.read_csv(io.StringIO(reservoir.to_csv(index=False)), low_memory=False)
+    parsed.index = reservoir.index
+    return parsed, total_rows
@@ -0,0 +1,333 @@
+"""
+Background profiling jobs on a pool of warm workers.
+
+`JobManager` runs profiling functions in worker processes (or threads) that
+import pandas and the profiling modules once at startup, keeps a bounded
+number of jobs queued, forwards progress events from the workers and lets
+callers cancel, poll or wait for a job. Jobs submitted with the same key while
+one is still queued or running share that job instead of profiling twice.
+"""
+
+import importlib
+import itertools
+import multiprocessing
+import queue
+import sys
+import threading
+import time
+import types
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from concurrent.futures.process import BrokenProcessPool
+
+
+JOB_STATES = ("queued", "running", "done", "failed", "cancelled")
+FINISHED_STATES = ("done", "failed", "cancelled")
+
+WARM_MODULES = ("pandas", "numpy", "profiling", "io_utils", "export_utils")
+DEFAULT_MAX_QUEUED = 32
+DEFAULT_MAX_FINISHED = 256
+
+_STARTED = "started"
+
+
+class JobQueueFull(Exception):
+    """Raised by JobManager.submit when the queue already holds max_queued waiting jobs."""
+
+
+class Job:
+    """
+    State of one submitted job.
+
+    Updated by the manager's threads; callers read `status`, `progress` (the
+    latest progress event), `events`, `result` and `error`, or block on `wait()`.
+    """
+
+    def __init__(self, job_id: str, key, cancel_event):
+        self.id = job_id
+        self.key = key
+        self.status = "queued"
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.progress = None
+        self.events = []
+        self.result = None
+        self.error = None
+        self.cancel_event = cancel_event
+        self.future = None
+        self._done = threading.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    def wait(self, timeout: float = None) -> bool:
+        """Block until the job finishes; returns False on timeout."""
+        return self._done.wait(timeout)
+
+    def to_dict(self) -> dict:
+        """JSON-serialisable status (without the result)."""
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "progress": self.progress,
+            "error": self.error,
+        }
+
+
+class _ProgressForwarder:
+    """Picklable progress callback that sends a worker's events back to the manager."""
+
+    def __init__(self, job_id: str, events):
+        self.job_id = job_id
+        self.events = events
+
+    def __call__(self, event: dict) -> None:
+        self.events.put((self.job_id, event))
+
+
+def _warm_worker(modules: tuple) -> None:
+    """Pool initializer: import heavy modules once so jobs start without import cost."""
+    for name in modules:
+        importlib.import_module(name)
+
+
+def _noop() -> None:
+    pass
+
+
+@contextmanager
+def _without_main_script():
+    """
+    Start spawned processes without re-running the caller's __main__ script.
+
+    Spawn re-imports the parent's __main__ in every new process, and a script
+    that cannot run twice (a Streamlit or AppTest script, a notebook) kills
+    the process before it serves a job. Job functions live in importable
+    modules, so processes started inside this block see a blank __main__.
+    """
+    main = sys.modules.get("__main__")
+    sys.modules["__main__"] = types.ModuleType("__main__")
+    try:
+        yield
+    finally:
+        if main is None:
+            del sys.modules["__main__"]
+        else:
+            sys.modules["__main__"] = main
+
+
+def _run_job(job_id: str, events, fn, args: tuple, kwargs: dict):
+    events.put((job_id, _STARTED))
+    return fn(*args, **kwargs)
+
+
+def profile_path_job(path: str, options: dict, progress_callback=None, cancel_event=None) -> dict:
+    """
+    Job function: profile a file on disk and attach quality flags.
+
+    `options` holds max_key_width, sample_size, time_budget, track_memory,
+    memory_budget_mb, exact_memory, null_threshold, top_n, cache_dir and
+    no_cache (missing keys use the CLI defaults).
+    """
+    from cli import profile_file, megabytes_to_bytes
+    from cache_utils import ProfileCache
+    from profiling import apply_quality_flags
+
+    cache = None if options.get("no_cache") else ProfileCache(options.get("cache_dir"))
+    profile = profile_file(path, max_key_width=options.get("max_key_width", 2),
+                           sample_size=options.get("sample_size"), time_budget=options.get("time_budget"),
+                           cache=cache, progress_callback=progress_callback, cancel_event=cancel_event,
+                           track_memory=options.get("track_memory", False),
+                           memory_budget=megabytes_to_bytes(options.get("memory_budget_mb")),
+                           exact_memory=options.get("exact_memory", False))
+    return apply_quality_flags(profile, options.get("null_threshold", 10.0), options.get("top_n", 5))
+
+
+class JobManager:
+    """
+    Bounded job queue in front of a pool of warm workers.
+
+    Args:
+        max_workers: Worker processes or threads (default: CPU count)
+        max_queued: Jobs allowed to wait for a free worker; submit raises JobQueueFull beyond that
+        use_processes: Run jobs in worker processes (isolated, parallel); threads otherwise
+        warm_modules: Modules each worker process imports at startup
+        max_finished: Finished jobs kept for polling before the oldest are forgotten
+    """
+
+    def __init__(self, max_workers: int = None, max_queued: int = DEFAULT_MAX_QUEUED, use_processes: bool = True,
+                 warm_modules: tuple = WARM_MODULES, max_finished: int = DEFAULT_MAX_FINISHED):
+        self.max_workers = max_workers or multiprocessing.cpu_count()
+        self.max_queued = max_queued
+        self.max_finished = max_finished
+        self.use_processes = use_processes
+        self._warm_modules = warm_modules
+        self._lock = threading.Lock()
+        self._jobs = OrderedDict()
+        self._inflight = {}
+
+        if use_processes:
+            # spawn: forking a process that already runs threads is unsafe
+            self._context = multiprocessing.get_context("spawn")
+            with _without_main_script():
+                self._sync = self._context.Manager()
+            self._events = self._sync.Queue()
+        else:
+            self._context = None
+            self._sync = None
+            self._events = queue.SimpleQueue()
+
+        self._executor = self._new_executor()
+        self._closed = False
+        self._drain_thread = threading.Thread(target=self._drain_events, name="job-events", daemon=True)
+        self._drain_thread.start()
+
+    def _new_executor(self):
+        if self.use_processes:
+            executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=self._context,
+                                           initializer=_warm_worker, initargs=(self._warm_modules,))
+            # The pool starts a process for each submission no idle worker can take, so one
+            # no-op per worker starts (and warms) them all now rather than with the first jobs
+            with _without_main_script():
+                for _ in range(self.max_workers):
+                    executor.submit(_noop)
+            return executor
+        return ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="profile-job")
+
+    def _new_cancel_event(self):
+        return self._sync.Event() if self.use_processes else threading.Event()
+
+    def submit(self, fn, *args, key=None, **kwargs) -> Job:
+        """
+        Queue `fn(*args, progress_callback=..., cancel_event=..., **kwargs)`.
+
+        With processes, `fn` and its arguments must be picklable: a module-level function of an
+        importable module, not of the __main__ script.
+        If a job with the same `key` is still queued or running, that job is returned instead.
+
+        Raises:
+            JobQueueFull: If max_queued jobs are already waiting for a worker
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("JobManager is shut down")
+            if key is not None and key in self._inflight:
+                return self._inflight[key]
+            if sum(job.status == "queued" for job in self._jobs.values()) >= self.max_queued:
+                raise JobQueueFull(f"{self.max_queued} jobs are already waiting")
+
+            job = Job(uuid.uuid4().hex, key, self._new_cancel_event())
+            call_kwargs = dict(kwargs, progress_callback=_ProgressForwarder(job.id, self._events),
+                               cancel_event=job.cancel_event)
+            # A replacement pool starts its worker processes here
+            with _without_main_script() if self.use_processes else nullcontext():
+                try:
+                    job.future = self._executor.submit(_run_job, job.id, self._events, fn, args, call_kwargs)
+                except BrokenProcessPool:
+                    # A worker died earlier; replace the pool and retry once
+                    self._executor.shutdown(wait=False, cancel_futures=True)
+                    self._executor = self._new_executor()
+                    job.future = self._executor.submit(_run_job, job.id, self._events, fn, args, call_kwargs)
+
+            self._jobs[job.id] = job
+            if key is not None:
+                self._inflight[key] = job
+            self._evict_finished()
+
+        job.future.add_done_callback(lambda future, job=job: self._finish(job, future))
+        return job
+
+    def get(self, job_id: str) -> Job:
+        """The job with this id, or None if it is unknown or was evicted."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def find(self, key) -> Job:
+        """The queued or running job with this key, or None."""
+        with self._lock:
+            return self._inflight.get(key)
+
+    def cancel(self, job_id: str) -> Job:
+        """Cancel a queued job, or ask a running one to stop at its next checkpoint."""
+        job = self.get(job_id)
+        if job is not None and not job.finished:
+            job.cancel_event.set()
+            job.future.cancel()
+        return job
+
+    def stats(self) -> dict:
+        with self._lock:
+            counts = {state: 0 for state in JOB_STATES}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+        return {"workers": self.max_workers, "max_queued": self.max_queued, "jobs": counts}
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Cancel queued jobs, stop the workers and the event thread."""
+        with self._lock:
+            self._closed = True
+            running = [job for job in self._jobs.values() if not job.finished]
+        for job in running:
+            job.cancel_event.set()
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+        self._events.put(None)
+        self._drain_thread.join(timeout=5)
+        if self._sync is not None:
+            self._sync.shutdown()
+
+    def _finish(self, job: Job, future) -> None:
+        from profiling import ProfilingCancelled
+
+        if future.cancelled():
+            status, error = "cancelled", None
+        elif future.exception() is None:
+            status, error = "done", None
+            job.result = future.result()
+        elif isinstance(future.exception(), ProfilingCancelled):
+            status, error = "cancelled", None
+        elif isinstance(future.exception(), BrokenProcessPool):
+            status, error = "failed", "worker process died"
+        else:
+            exc = future.exception()
+            status, error = "failed", str(exc) or type(exc).__name__
+
+        with self._lock:
+            job.status, job.error = status, error
+            job.finished_at = time.time()
+            if self._inflight.get(job.key) is job:
+                del self._inflight[job.key]
+            self._evict_finished()
+        job._done.set()
+
+    def _evict_finished(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in itertools.islice(finished, max(0, len(finished) - self.max_finished)):
+            del self._jobs[job_id]
+
+    def _drain_events(self) -> None:
+        while True:
+            try:
+                item = self._events.get()
+            except (EOFError, OSError):  # manager process gone during shutdown
+                return
+            if item is None:
+                return
+            job_id, event = item
+            job = self.get(job_id)
+            if job is None:
+                continue
+            with self._lock:
+                if event == _STARTED:
+                    if job.status == "queued":
+                        job.status = "running"
+                        job.started_at = time.time()
+                else:
+                    job.progress = event
+                    job.events.append(event)
@@ -0,0 +1,1057 @@
+"""
+Incremental profiling for append-only datasets.
+
+A profile state holds mergeable summaries of everything profile_dataframe
+reports: counts, moment sums, distinct-value and top-value sketches, a
+quantile reservoir, recorded evidence and row fingerprints for duplicate
+detection. Appending rows updates the state from the new rows alone, and
+profile_from_state renders a profile dict with the same shape as a full run.
+"""
+
+import json
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from profiling import (
+    COMMON_PLACEHOLDERS,
+    SPECIAL_CHAR_PATTERN,
+    _ProfileRun,
+    _coerce_numeric_strings,
+    _combine_hashes,
+    _detect_mixed_types,
+    _discover_candidate_keys,
+    _estimate_series_bytes,
+    _index_memory_bytes,
+    _is_datetime_column,
+    _parse_numeric_text,
+    _record_evidence,
+)
+
+
+STATE_VERSION = 1
+
+EXACT_DISTINCT_LIMIT = 100_000  # distinct hashes kept exactly before switching to HyperLogLog
+HLL_PRECISION = 14  # 16,384 registers, ~0.8% standard error
+TOP_VALUES_CAPACITY = 10_000  # value counters kept per column
+QUANTILE_SAMPLE_SIZE = 10_000  # reservoir size for percentiles
+CASING_TRACK_LIMIT = 50_000  # lowercased values tracked for casing variants
+MAX_EXAMPLES = 5
+MAX_DUPLICATE_SETS = 5
+MAX_INDICES_PER_SET = 3
+
+
+def build_profile_state(df: pd.DataFrame, max_key_width: int = 2, top_n: int = 5,
+                        progress_callback=None, cancel_event=None, timings: dict = None) -> dict:
+    """
+    Build a profile state from an initial DataFrame.
+
+    Args:
+        df: The initial data
+        max_key_width: Maximum number of columns in a discovered candidate key
+        top_n: Number of most frequent values reported per column
+        progress_callback: Progress event callback, as for profile_dataframe
+        cancel_event: Cancel token, as for profile_dataframe
+        timings: Running timings, as for update_profile_state
+
+    Returns:
+        Profile state dict (save with save_profile_state)
+    """
+    state = {
+        "version": STATE_VERSION,
+        "settings": {"max_key_width": max_key_width, "top_n": top_n},
+        "n_rows": 0,
+        "memory_usage_bytes": 0,
+        "column_names": [],
+        "columns": {},
+        "duplicates": None,
+        "candidate_keys": None,
+    }
+    return update_profile_state(state, df, progress_callback=progress_callback, cancel_event=cancel_event,
+                                timings=timings)
+
+
+def update_profile_state(state: dict, new_rows: pd.DataFrame, progress_callback=None,
+                         cancel_event=None, timings: dict = None) -> dict:
+    """
+    Update a profile state with appended rows.
+
+    Row numbers continue from the rows already profiled, whatever the index
+    of `new_rows`.
+
+    Args:
+        state: Profile state from build_profile_state or load_profile_state
+        new_rows: Rows appended since the state was last updated
+        progress_callback: Progress event callback, as for profile_dataframe
+        cancel_event: Cancel token, as for profile_dataframe
+        timings: Optional dict with "stages" and "columns" to which this update's
+            wall and CPU seconds are added (see merge_timings)
+
+    Returns:
+        The updated state (modified in place)
+
+    Raises:
+        ValueError: If the new rows do not have the profiled columns
+        ProfilingCancelled: If `cancel_event` is set; the state is then partly
+            updated and should be discarded
+    """
+    if len(new_rows) == 0:
+        return state
+
+    if not state["column_names"]:
+        state["column_names"] = list(new_rows.columns)
+        for col_name in new_rows.columns:
+            state["columns"][str(col_name)] = _new_column_state(new_rows[col_name])
+    elif list(new_rows.columns) != state["column_names"]:
+        raise ValueError("New rows must have the same columns as the profiled data")
+
+    row_offset = state["n_rows"]
+    chunk = new_rows.set_axis(pd.RangeIndex(row_offset, row_offset + len(new_rows)), axis=0)
+
+    for col_name in state["column_names"]:
+        _reconcile_mode(state["columns"][str(col_name)], chunk[col_name], row_offset)
+
+    # Canonical dtypes keep value hashes comparable between appends
+    canonical = {}
+    for col_name in state["column_names"]:
+        canonical[col_name] = _canonicalize(state["columns"][str(col_name)], chunk[col_name])
+    canonical_df = pd.DataFrame(canonical, index=chunk.index)
+
+    run = _ProfileRun(progress_callback=progress_callback, cancel_event=cancel_event,
+                      total_steps=len(state["column_names"]) + 2)
+
+    column_hashes = {}
+    for col_name in state["column_names"]:
+        run.begin("column", column=col_name)
+        col_state = state["columns"][str(col_name)]
+        column_hashes[col_name] = _update_column_state(col_state, chunk[col_name], canonical[col_name])
+        column_bytes = _estimate_series_bytes(chunk[col_name])
+        state["memory_usage_bytes"] += column_bytes
+        if "memory_bytes" in col_state:  # states saved before per-column memory lack it
+            col_state["memory_bytes"] += column_bytes
+        run.finish("column", column=col_name)
+
+    # Count the index once, as a single RangeIndex over all rows would be
+    if row_offset == 0:
+        state["memory_usage_bytes"] += _index_memory_bytes(chunk.index)
+    state["n_rows"] += len(chunk)
+
+    run.begin("duplicate_analysis")
+    _update_duplicates(state, chunk, canonical_df)
+    run.finish("duplicate_analysis")
+
+    run.begin("candidate_keys")
+    _update_candidate_keys(state, chunk, column_hashes)
+    run.finish("candidate_keys")
+
+    if timings is not None:
+        merge_timings(timings, run.timings(len(chunk)))
+    return state
+
+
+def merge_timings(total: dict, timings: dict) -> None:
+    """
+    Add the stage and column timings of one run to a running total.
+
+    Wall seconds, CPU seconds and kernel seconds are summed per stage and per
+    column; throughput is left for the caller to compute over all rows.
+    """
+    for section in ("stages", "columns"):
+        for name, timing in timings.get(section, {}).items():
+            if timing is None:
+                continue
+            entry = total.setdefault(section, {}).setdefault(name, {"wall_seconds": 0.0, "cpu_seconds": 0.0})
+            for key in ("wall_seconds", "cpu_seconds"):
+                entry[key] = round(entry[key] + timing[key], 6)
+            for kernel, seconds in (timing.get("kernels") or {}).items():
+                kernels = entry.setdefault("kernels", {})
+                kernels[kernel] = round(kernels.get(kernel, 0.0) + seconds, 6)
+
+
+def profile_from_state(state: dict) -> dict:
+    """
+    Render a profile dict with the same shape as profile_dataframe.
+
+    Unique counts above EXACT_DISTINCT_LIMIT are HyperLogLog estimates,
+    percentiles come from a reservoir sample once a column exceeds
+    QUANTILE_SAMPLE_SIZE values, and near-duplicate detection is not
+    maintained incrementally.
+    """
+    total_rows = state["n_rows"]
+    columns = {}
+    for col_name in state["column_names"]:
+        columns[col_name] = _column_profile_from_state(state["columns"][str(col_name)], total_rows,
+                                                       state["settings"]["top_n"])
+
+    return {
+        "dataset": {
+            "n_rows": total_rows,
+            "n_columns": len(state["column_names"]),
+            "memory_usage_bytes": state["memory_usage_bytes"],
+            "memory_usage_exact": False,
+            "duplicate_analysis": _duplicate_analysis_from_state(state),
+            "candidate_keys": _candidate_keys_from_state(state),
+            "incremental": True,
+        },
+        "columns": columns,
+    }
+
+
+def profile_incremental(new_rows: pd.DataFrame, state_path: str, max_key_width: int = 2, top_n: int = 5,
+                        progress_callback=None, cancel_event=None) -> dict:
+    """
+    Profile appended rows against a persisted state and save the updated state.
+
+    Builds a new state from `new_rows` if `state_path` does not exist yet. A
+    cancelled update leaves the saved state untouched.
+
+    Args:
+        new_rows: Rows appended since the last run (or the initial data)
+        state_path: File holding the persisted profile state
+        max_key_width: Maximum candidate key width, used when building a new state
+        top_n: Number of most frequent values, used when building a new state
+        progress_callback: Progress event callback, as for profile_dataframe
+        cancel_event: Cancel token, as for profile_dataframe
+
+    Returns:
+        Profile dict for all rows seen so far
+    """
+    if os.path.exists(state_path):
+        state = update_profile_state(load_profile_state(state_path), new_rows,
+                                     progress_callback=progress_callback, cancel_event=cancel_event)
+    else:
+        state = build_profile_state(new_rows, max_key_width=max_key_width, top_n=top_n,
+                                    progress_callback=progress_callback, cancel_event=cancel_event)
+
+    save_profile_state(state, state_path)
+    return profile_from_state(state)
+
+
+def save_profile_state(state: dict, path: str) -> None:
+    """
+    Save a profile state as a compressed .npz file (JSON metadata plus arrays).
+
+    The file is written atomically.
+    """
+    arrays = {}
+
+    def _extract(obj):
+        if isinstance(obj, np.ndarray):
+            name = f"array_{len(arrays)}"
+            arrays[name] = obj
+            return {"__array__": name}
+        if isinstance(obj, dict):
+            return {"__dict__": [[k, _extract(v)] for k, v in obj.items()]}
+        if isinstance(obj, list):
+            return [_extract(v) for v in obj]
+        return obj
+
+    meta = json.dumps(_extract(state)).encode("utf-8")
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez_compressed(f, __meta__=np.frombuffer(meta, dtype=np.uint8), **arrays)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def load_profile_state(path: str) -> dict:
+    """
+    Load a profile state saved with save_profile_state.
+
+    Raises:
+        ValueError: If the file is not a compatible profile state
+    """
+    with np.load(path, allow_pickle=False) as data:
+        arrays = {name: data[name] for name in data.files}
+
+    meta = json.loads(arrays.pop("__meta__").tobytes().decode("utf-8"))
+
+    def _restore(obj):
+        if isinstance(obj, dict):
+            if "__array__" in obj:
+                return arrays[obj["__array__"]]
+            return {k: _restore(v) for k, v in obj["__dict__"]}
+        if isinstance(obj, list):
+            return [_restore(v) for v in obj]
+        return obj
+
+    state = _restore(meta)
+    if state.get("version") != STATE_VERSION:
+        raise ValueError(f"Unsupported profile state version: {state.get('version')}")
+    return state
+
+
+# ---------------------------------------------------------------------------
+# Column state
+# ---------------------------------------------------------------------------
+
+def _infer_mode(series: pd.Series) -> str:
+    """How a column is profiled: numeric, numeric_strings, datetime, boolean, string or unknown."""
+    dtype = series.dtype
+
+    if pd.api.types.is_bool_dtype(dtype):
+        return "boolean"
+    if pd.api.types.is_numeric_dtype(dtype):
+        return "numeric"
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return "datetime"
+    if dtype == 'object':
+        if _coerce_numeric_strings(series)[1] is not None:
+            return "numeric_strings"
+        if _is_datetime_column(series):
+            return "datetime"
+        return "string"
+    return "unknown"
+
+
+def _new_column_state(series: pd.Series) -> dict:
+    """Empty column state, with the profiling mode inferred from the first rows."""
+    return {
+        "mode": _infer_mode(series),
+        "pandas_dtype": str(series.dtype),
+        "null_count": 0,
+        "distinct": {"hashes": np.empty(0, dtype=np.uint64), "registers": None},
+        "top_values": {},
+        "evidence": {},
+        "numeric": None,
+        "datetime": None,
+        "strings": None,
+        "mixed_types": None,
+        "coercion": None,
+        "memory_bytes": 0,
+        "mode_conflicts": {},
+    }
+
+
+def _reconcile_mode(col_state: dict, series: pd.Series, rows_seen: int) -> None:
+    """
+    Check a column's mode against appended rows before they are folded in.
+
+    A column with nothing but nulls so far has no typed state yet, so its mode
+    is re-inferred from the first rows with values. Otherwise the mode stays
+    (earlier rows are gone), and rows of a column profiled as numbers or dates
+    whose values look like another type are counted in `mode_conflicts`.
+    """
+    values = series.dropna()
+    if len(values) == 0:
+        return
+
+    if col_state["null_count"] == rows_seen:
+        if rows_seen > 0:
+            fresh = _new_column_state(series)
+            for key in ("null_count", "evidence", "memory_bytes"):
+                fresh[key] = col_state.get(key, fresh[key])
+            col_state.clear()
+            col_state.update(fresh)
+        return
+
+    mode = col_state["mode"]
+    if mode not in ("numeric", "numeric_strings", "datetime") or series.dtype != 'object':
+        return
+    # Infer from a probe of the new values, as the first rows' mode was
+    chunk_mode = _infer_mode(values.sample(n=min(len(values), 1000), random_state=0))
+    if {mode, chunk_mode} <= {"numeric", "numeric_strings"} or chunk_mode == mode:
+        return
+    conflicts = col_state.setdefault("mode_conflicts", {})
+    conflicts[chunk_mode] = conflicts.get(chunk_mode, 0) + len(values)
+
+
+def _parse_numbers(series: pd.Series) -> pd.Series:
+    """Parse a chunk as numbers the way the numeric-string probe does; booleans become 0/1."""
+    parsed = _parse_numeric_text(series)
+    return parsed if parsed is not None else pd.to_numeric(series, errors='coerce').astype('float64')
+
+
+def _canonicalize(col_state: dict, series: pd.Series) -> pd.Series:
+    """Cast a column of new rows to the dtype its mode was profiled with."""
+    mode = col_state["mode"]
+
+    if mode == "numeric":
+        if pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+            return series.astype('float64')
+        return _parse_numbers(series)
+
+    if mode == "datetime" and pd.api.types.is_datetime64_any_dtype(series.dtype):
+        return series
+
+    if series.dtype != 'object' and mode in ("numeric_strings", "datetime", "string"):
+        return series.astype(str).where(series.notna(), None).astype(object)
+
+    return series
+
+
+def _update_column_state(col_state: dict, series: pd.Series, canonical: pd.Series) -> np.ndarray:
+    """
+    Fold one column of appended rows into its state.
+
+    Returns:
+        Per-row value hashes of the canonical values (for candidate keys)
+    """
+    mode = col_state["mode"]
+    evidence = {}
+
+    # Widen the reported dtype if appends changed it
+    if str(series.dtype) != col_state["pandas_dtype"]:
+        both_numeric = mode == "numeric" and pd.api.types.is_numeric_dtype(series.dtype)
+        col_state["pandas_dtype"] = "float64" if both_numeric else "object"
+        if both_numeric:
+            # Integer-formatted top values now print as floats
+            col_state["top_values"] = {
+                str(float(value)): count for value, count in col_state["top_values"].items()
+            }
+
+    # Values that do not parse are not missing; they are counted as unparsed below
+    null_mask = series.isna()
+    col_state["null_count"] += int(null_mask.sum())
+    _record_evidence(evidence, "null", series, null_mask)
+
+    try:
+        row_hashes = pd.util.hash_pandas_object(canonical, index=False).to_numpy()
+    except TypeError:
+        # Handle unhashable types (lists, dicts in cells)
+        row_hashes = pd.util.hash_pandas_object(canonical.astype(str), index=False).to_numpy()
+    unparsed = (canonical.isna() & ~null_mask).to_numpy()
+    if unparsed.any():
+        # Unparsed values stay distinct from each other, as in the raw column
+        row_hashes[unparsed] = pd.util.hash_pandas_object(series[unparsed].astype(str), index=False).to_numpy()
+    _update_distinct(col_state["distinct"], row_hashes[~null_mask.to_numpy()])
+
+    value_counts = series.value_counts(dropna=True)
+    if mode == "numeric" and col_state["pandas_dtype"] != str(series.dtype):
+        value_counts = canonical.value_counts(dropna=True)
+    _update_top_values(col_state, value_counts)
+
+    if mode in ("numeric", "numeric_strings"):
+        values = canonical if mode == "numeric" else _parse_numbers(series)
+        unparsed_mask = series.notna() & values.isna()
+        if unparsed_mask.any() or mode == "numeric_strings":
+            _update_coercion(col_state, series, unparsed_mask, evidence)
+        # Examples show values as stored; numbers parsed from text show the parsed value
+        _update_numeric(col_state, values, series if mode == "numeric" else values, evidence)
+
+    elif mode == "datetime":
+        values = series if pd.api.types.is_datetime64_any_dtype(series.dtype) else pd.to_datetime(series, errors='coerce')
+        _update_datetime(col_state, values)
+
+    elif mode == "string" and series.dtype == 'object':
+        _update_strings(col_state, series.dropna(), evidence)
+
+    if series.dtype == 'object':
+        _update_mixed_types(col_state, series)
+
+    for key, chunk_evidence in evidence.items():
+        _merge_evidence(col_state["evidence"], key, chunk_evidence)
+
+    return row_hashes
+
+
+def _merge_evidence(evidence: dict, key: str, chunk_evidence: dict) -> None:
+    """Add a chunk's evidence: counts sum, examples keep the first MAX_EXAMPLES rows."""
+    existing = evidence.get(key)
+    if existing is None:
+        evidence[key] = chunk_evidence
+        return
+
+    existing["count"] += chunk_evidence["count"]
+    existing["examples"] = (existing["examples"] + chunk_evidence["examples"])[:MAX_EXAMPLES]
+
+
+# ---------------------------------------------------------------------------
+# Sketches
+# ---------------------------------------------------------------------------
+
+def _update_distinct(distinct: dict, hashes: np.ndarray) -> None:
+    """Exact set of value hashes, switching to HyperLogLog registers past EXACT_DISTINCT_LIMIT."""
+    if distinct["registers"] is None:
+        distinct["hashes"] = np.union1d(distinct["hashes"], hashes.astype(np.uint64))
+        if len(distinct["hashes"]) > EXACT_DISTINCT_LIMIT:
+            distinct["registers"] = np.zeros(1 << HLL_PRECISION, dtype=np.uint8)
+            _hll_add(distinct["registers"], distinct["hashes"])
+            distinct["hashes"] = np.empty(0, dtype=np.uint64)
+    else:
+        _hll_add(distinct["registers"], hashes.astype(np.uint64))
+
+
+def _distinct_count(distinct: dict, non_null_count: int) -> int:
+    if distinct["registers"] is None:
+        return int(len(distinct["hashes"]))
+    # The estimate can overshoot; a column never has more distinct values than non-null values
+    return min(int(round(_hll_estimate(distinct["registers"]))), non_null_count)
+
+
+def _hll_add(registers: np.ndarray, hashes: np.ndarray) -> None:
+    """Add 64-bit hashes to HyperLogLog registers."""
+    if len(hashes) == 0:
+        return
+
+    precision = np.uint64(HLL_PRECISION)
+    register_index = (hashes >> (np.uint64(64) - precision)).astype(np.int64)
+    # Remaining bits, with a sentinel bit so the rank is bounded
+    remaining = (hashes << precision) | np.uint64(1 << (HLL_PRECISION - 1))
+
+    # Exact bit length by binary search on shifts
+    bit_length = np.zeros(len(remaining), dtype=np.int64)
+    for shift in (32, 16, 8, 4, 2, 1):
+        wide = remaining >= (np.uint64(1) << np.uint64(shift))
+        bit_length[wide] += shift
+        remaining[wide] >>= np.uint64(shift)
+    bit_length += 1
+
+    rank = (65 - bit_length).astype(np.uint8)  # leading zeros + 1
+    np.maximum.at(registers, register_index, rank)
+
+
+def _hll_estimate(registers: np.ndarray) -> float:
+    m = float(len(registers))
+    alpha = 0.7213 / (1 + 1.079 / m)
+    estimate = alpha * m * m / np.sum(np.power(2.0, -registers.astype(np.float64)))
+
+    empty_registers = int(np.count_nonzero(registers == 0))
+    if estimate <= 2.5 * m and empty_registers > 0:
+        # Linear counting for small cardinalities
+        estimate = m * np.log(m / empty_registers)
+
+    return float(estimate)
+
+
+def _update_top_values(col_state: dict, value_counts: pd.Series) -> None:
+    """Exact value counters, pruned to the most frequent half when over capacity."""
+    chunk_counts = value_counts.set_axis(value_counts.index.astype(str))
+    chunk_counts = chunk_counts.groupby(level=0, sort=False).sum()
+    counters = pd.Series(col_state["top_values"], dtype="int64")
+    if len(counters):
+        # Keep first-seen order so ties rank the way value_counts ranks them
+        merged_index = counters.index.union(chunk_counts.index, sort=False)
+        chunk_counts = (counters.reindex(merged_index, fill_value=0)
+                        + chunk_counts.reindex(merged_index, fill_value=0)).astype("int64")
+
+    if len(chunk_counts) > TOP_VALUES_CAPACITY:
+        chunk_counts = chunk_counts.nlargest(TOP_VALUES_CAPACITY // 2, keep="first")
+    col_state["top_values"] = {str(k): int(v) for k, v in chunk_counts.items()}
+
+
+def _reservoir_merge(sample: np.ndarray, seen: int, new_values: np.ndarray, seed: int) -> np.ndarray:
+    """
+    Merge new values into a uniform reservoir sample of QUANTILE_SAMPLE_SIZE values.
+
+    The sample is exact (every value kept) until more than QUANTILE_SAMPLE_SIZE values are seen.
+    """
+    total = seen + len(new_values)
+    if total <= QUANTILE_SAMPLE_SIZE:
+        return np.concatenate([sample, new_values])
+
+    rng = np.random.default_rng(seed)
+    size = QUANTILE_SAMPLE_SIZE
+    from_existing = int(rng.binomial(size, seen / total)) if seen > 0 else 0
+    from_existing = min(max(from_existing, size - len(new_values)), len(sample))
+    from_new = size - from_existing
+
+    kept = rng.choice(sample, size=from_existing, replace=False) if from_existing < len(sample) else sample
+    added = rng.choice(new_values, size=from_new, replace=False) if from_new < len(new_values) else new_values
+    return np.concatenate([kept, added])
+
+
+def _update_numeric(col_state: dict, values: pd.Series, example_values: pd.Series, evidence: dict) -> None:
+    """Merge count, mean and central moment sums (Pebay's formulas), extremes and a quantile reservoir."""
+    numeric = col_state["numeric"]
+    if numeric is None:
+        numeric = col_state["numeric"] = {
+            "count": 0, "mean": 0.0, "m2": 0.0, "m3": 0.0,
+            "min": None, "max": None, "zero_count": 0, "negative_count": 0,
+            "sample": np.empty(0, dtype=np.float64),
+        }
+
+    _record_evidence(evidence, "zero", example_values, values == 0)
+    _record_evidence(evidence, "negative", example_values, values < 0)
+    numeric["zero_count"] += evidence["zero"]["count"]
+    numeric["negative_count"] += evidence["negative"]["count"]
+
+    x = values.dropna().to_numpy(dtype=np.float64)
+    n_b = len(x)
+    if n_b == 0:
+        return
+
+    mean_b = float(x.mean())
+    deviations = x - mean_b
+    m2_b = float(np.dot(deviations, deviations))
+    m3_b = float(np.sum(deviations ** 3))
+
+    n_a = numeric["count"]
+    n = n_a + n_b
+    delta = mean_b - numeric["mean"]
+    numeric["m3"] = (numeric["m3"] + m3_b
+                     + delta ** 3 * n_a * n_b * (n_a - n_b) / n ** 2
+                     + 3 * delta * (n_a * m2_b - n_b * numeric["m2"]) / n)
+    numeric["m2"] = numeric["m2"] + m2_b + delta ** 2 * n_a * n_b / n
+    numeric["mean"] = numeric["mean"] + delta * n_b / n
+    numeric["count"] = n
+
+    numeric["min"] = float(x.min()) if numeric["min"] is None else min(numeric["min"], float(x.min()))
+    numeric["max"] = float(x.max()) if numeric["max"] is None else max(numeric["max"], float(x.max()))
+    numeric["sample"] = _reservoir_merge(numeric["sample"], n_a, x, seed=n)
+
+
+def _update_coercion(col_state: dict, series: pd.Series, unparsed_mask: pd.Series, evidence: dict) -> None:
+    """Track values of a numeric column that do not parse as numbers."""
+    coercion = col_state["coercion"]
+    if coercion is None:
+        coercion = col_state["coercion"] = {"parsed_count": 0, "unparsed_count": 0, "unparsed_values": {}}
+
+    unparsed_count = int(unparsed_mask.sum())
+    coercion["unparsed_count"] += unparsed_count
+    coercion["parsed_count"] += int(series.notna().sum()) - unparsed_count
+    _record_evidence(evidence, "non_numeric", series, unparsed_mask)
+
+    for value, count in series[unparsed_mask].astype(str).value_counts().items():
+        if value in coercion["unparsed_values"] or len(coercion["unparsed_values"]) < TOP_VALUES_CAPACITY:
+            coercion["unparsed_values"][value] = coercion["unparsed_values"].get(value, 0) + int(count)
+
+
+def _update_datetime(col_state: dict, values: pd.Series) -> None:
+    """
+    Track datetime extremes, and every value that was in the future when it arrived.
+
+    Values only move from future to past, so future counts stay exact later.
+    """
+    datetimes = col_state["datetime"]
+    if datetimes is None:
+        datetimes = col_state["datetime"] = {
+            "min": None, "max": None, "tz": None,
+            "future_values": np.empty(0, dtype=np.int64),
+            "future_rows": np.empty(0, dtype=np.int64),
+        }
+
+    non_null = values.dropna()
+    if len(non_null) == 0:
+        return
+
+    if getattr(non_null.dt, "tz", None) is not None:
+        datetimes["tz"] = str(non_null.dt.tz)
+        non_null = non_null.dt.tz_convert(None)
+
+    as_ints = non_null.to_numpy(dtype="datetime64[ns]").astype(np.int64)
+    datetimes["min"] = int(as_ints.min()) if datetimes["min"] is None else min(datetimes["min"], int(as_ints.min()))
+    datetimes["max"] = int(as_ints.max()) if datetimes["max"] is None else max(datetimes["max"], int(as_ints.max()))
+
+    future = as_ints > pd.Timestamp.now().value
+    datetimes["future_values"] = np.concatenate([datetimes["future_values"], as_ints[future]])
+    datetimes["future_rows"] = np.concatenate([datetimes["future_rows"], non_null.index.to_numpy()[future]])
+
+
+def _update_strings(col_state: dict, non_null: pd.Series, evidence: dict) -> None:
+    """Exact whitespace, placeholder, casing and special character counters."""
+    strings = col_state["strings"]
+    if strings is None:
+        strings = col_state["strings"] = {
+            "whitespace_count": 0, "placeholder_count": 0, "placeholder_values": [],
+            "special_char_count": 0, "casing_first_variant": {}, "casing_groups": [],
+        }
+
+    # String checks run once per distinct value
+    codes, uniques = pd.factorize(non_null.astype(str))
+    unique_values = pd.Series(uniques)
+    stripped = unique_values.str.strip()
+    lower_stripped = stripped.str.lower()
+    whitespace_mask = pd.Series((unique_values.str.len() != stripped.str.len()).to_numpy()[codes], index=non_null.index)
+    placeholder_mask = pd.Series(lower_stripped.isin(COMMON_PLACEHOLDERS).to_numpy()[codes], index=non_null.index)
+
+    _record_evidence(evidence, "whitespace", non_null, whitespace_mask)
+    _record_evidence(evidence, "placeholder", non_null, placeholder_mask)
+    strings["whitespace_count"] += evidence["whitespace"]["count"]
+    strings["placeholder_count"] += evidence["placeholder"]["count"]
+    for value in lower_stripped[lower_stripped.isin(COMMON_PLACEHOLDERS)].unique().tolist():
+        if len(strings["placeholder_values"]) < 5 and value not in strings["placeholder_values"]:
+            strings["placeholder_values"].append(value)
+
+    special_mask = unique_values.str.contains(SPECIAL_CHAR_PATTERN, regex=True).to_numpy()
+    strings["special_char_count"] += int(special_mask[codes].sum())
+
+    # Casing: remember the first spelling of each lowercased value
+    first_variant = strings["casing_first_variant"]
+    groups = set(strings["casing_groups"])
+    pairs = pd.DataFrame({"lower": unique_values.str.lower(), "value": unique_values})
+    for lower, value in zip(pairs["lower"], pairs["value"]):
+        known = first_variant.get(lower)
+        if known is None:
+            if len(first_variant) < CASING_TRACK_LIMIT:
+                first_variant[lower] = value
+        elif known != value:
+            groups.add(lower)
+    strings["casing_groups"] = sorted(groups)
+
+
+def _update_mixed_types(col_state: dict, series: pd.Series) -> None:
+    """Merge the exact Python type histogram of an object column."""
+    chunk_types = _detect_mixed_types(series, max_examples=MAX_EXAMPLES)
+    mixed = col_state["mixed_types"]
+    if mixed is None:
+        mixed = col_state["mixed_types"] = {"type_counts": {}, "type_examples": {}}
+
+    for type_name, count in chunk_types["type_counts"].items():
+        mixed["type_counts"][type_name] = mixed["type_counts"].get(type_name, 0) + count
+        examples = mixed["type_examples"].get(type_name, []) + chunk_types["type_examples"][type_name]
+        mixed["type_examples"][type_name] = examples[:MAX_EXAMPLES]
+
+
+# ---------------------------------------------------------------------------
+# Dataset state
+# ---------------------------------------------------------------------------
+
+def _update_duplicates(state: dict, chunk: pd.DataFrame, canonical_df: pd.DataFrame) -> None:
+    """Merge row fingerprints: distinct row hashes with their counts and first row numbers."""
+    duplicates = state["duplicates"]
+    if duplicates is None:
+        duplicates = state["duplicates"] = {
+            "hashes": np.empty(0, dtype=np.uint64),
+            "counts": np.empty(0, dtype=np.int64),
+            "first_rows": np.empty(0, dtype=np.int64),
+            "sets": [],
+            "error": None,
+        }
+
+    if duplicates["error"]:
+        return
+
+    try:
+        chunk_hashes = pd.util.hash_pandas_object(canonical_df, index=False).to_numpy()
+    except TypeError:
+        duplicates["error"] = "Unable to detect duplicates (unhashable column types present)"
+        return
+
+    chunk_rows = chunk.index.to_numpy()
+    all_hashes = np.concatenate([duplicates["hashes"], chunk_hashes])
+    all_counts = np.concatenate([duplicates["counts"], np.ones(len(chunk_hashes), dtype=np.int64)])
+    all_first = np.concatenate([duplicates["first_rows"], chunk_rows])
+
+    hashes, inverse = np.unique(all_hashes, return_inverse=True)
+    counts = np.bincount(inverse, weights=all_counts, minlength=len(hashes)).astype(np.int64)
+    first_rows = np.full(len(hashes), np.iinfo(np.int64).max, dtype=np.int64)
+    np.minimum.at(first_rows, inverse, all_first)
+
+    duplicates["hashes"], duplicates["counts"], duplicates["first_rows"] = hashes, counts, first_rows
+
+    # Refresh tracked duplicate sets, then start tracking sets first repeated by this chunk
+    chunk_inverse = inverse[len(all_hashes) - len(chunk_hashes):]
+    tracked = {entry["hash"]: entry for entry in duplicates["sets"]}
+    for entry in duplicates["sets"]:
+        entry["count"] = int(counts[np.searchsorted(hashes, np.uint64(int(entry["hash"])))])
+
+    for position in np.flatnonzero(counts[chunk_inverse] > 1):
+        slot = chunk_inverse[position]
+        key = str(int(hashes[slot]))
+        entry = tracked.get(key)
+        if entry is None:
+            if len(duplicates["sets"]) >= MAX_DUPLICATE_SETS:
+                continue
+            entry = {
+                "hash": key,
+                "row_data": {
+                    str(k): str(v) if pd.notna(v) else "NULL"
+                    for k, v in chunk.iloc[position].to_dict().items()
+                },
+                "count": int(counts[slot]),
+                "example_indices": [int(first_rows[slot])],
+            }
+            tracked[key] = entry
+            duplicates["sets"].append(entry)
+
+        row_number = int(chunk_rows[position])
+        if len(entry["example_indices"]) < MAX_INDICES_PER_SET and row_number not in entry["example_indices"]:
+            entry["example_indices"].append(row_number)
+
+
+def _update_candidate_keys(state: dict, chunk: pd.DataFrame, column_hashes: dict) -> None:
+    """
+    Discover candidate keys on the first rows, then drop keys that appended rows break.
+
+    Keys that survive every append are still minimal. Supersets of a broken key,
+    and combinations only unique from a later chunk on, are never searched again
+    (the earlier rows are gone), so once a key is invalidated the list is
+    rendered as partial.
+    """
+    keys_state = state["candidate_keys"]
+
+    def _key_hashes(key):
+        return _combine_hashes([column_hashes[col_name] for col_name in key])
+
+    if keys_state is None:
+        column_profiles = {
+            str(col_name): {
+                "unique_count": int(chunk[col_name].nunique(dropna=True)),
+                "null_count": int(chunk[col_name].isna().sum()),
+            }
+            for col_name in state["column_names"]
+        }
+        duplicate_rows = int(len(chunk) - len(state["duplicates"]["hashes"])) if not state["duplicates"]["error"] else -1
+        named_chunk = chunk.set_axis([str(c) for c in chunk.columns], axis=1)
+        discovered = _discover_candidate_keys(
+            named_chunk, column_profiles, {"duplicate_rows": duplicate_rows, "error": state["duplicates"]["error"]},
+            max_width=state["settings"]["max_key_width"],
+            column_hashes={str(c): h for c, h in column_hashes.items()},
+        )
+        name_lookup = {str(c): c for c in state["column_names"]}
+        state["candidate_keys"] = {
+            "result": {**{k: v for k, v in discovered.items() if k != "keys"}, "discovered_rows": len(chunk)},
+            "keys": discovered["keys"],
+            "key_hashes": [np.sort(_key_hashes([name_lookup[c] for c in key])) for key in discovered["keys"]],
+            "invalidated_keys": [],
+        }
+        return
+
+    name_lookup = {str(c): c for c in state["column_names"]}
+    kept_keys, kept_hashes = [], []
+    for key, existing in zip(keys_state["keys"], keys_state["key_hashes"]):
+        new_hashes = np.sort(_key_hashes([name_lookup[c] for c in key]))
+        repeats_within = len(new_hashes) > 1 and bool(np.any(new_hashes[1:] == new_hashes[:-1]))
+        if repeats_within or np.isin(new_hashes, existing, assume_unique=True).any():
+            keys_state["invalidated_keys"].append(key)
+        else:
+            kept_keys.append(key)
+            kept_hashes.append(np.union1d(existing, new_hashes))
+
+    keys_state["keys"], keys_state["key_hashes"] = kept_keys, kept_hashes
+
+
+# ---------------------------------------------------------------------------
+# Rendering
+# ---------------------------------------------------------------------------
+
+def _column_profile_from_state(col_state: dict, total_rows: int, top_n: int) -> dict:
+    mode = col_state["mode"]
+    null_count = col_state["null_count"]
+    unique_count = _distinct_count(col_state["distinct"], total_rows - null_count)
+    evidence = {key: dict(value) for key, value in col_state["evidence"].items()}
+
+    if mode in ("numeric", "numeric_strings"):
+        inferred_type = "numeric"
+    elif mode == "datetime":
+        inferred_type = "datetime"
+    elif mode == "boolean":
+        inferred_type = "boolean"
+    elif mode == "string" and total_rows > 0:
+        inferred_type = "categorical" if unique_count / total_rows < 0.05 else "text"
+    else:
+        inferred_type = "unknown"
+
+    # Top values include NULL the way value_counts(dropna=False) does
+    counters = dict(col_state["top_values"])
+    if null_count > 0:
+        counters["NULL"] = null_count
+    top_items = sorted(counters.items(), key=lambda item: item[1], reverse=True)[:top_n]
+    top_values = [
+        {"value": value, "count": count, "pct": round(count / total_rows * 100, 2) if total_rows > 0 else 0.0}
+        for value, count in top_items
+    ]
+
+    numeric_stats = _numeric_stats_from_state(col_state["numeric"], total_rows) if inferred_type == "numeric" else None
+    datetime_stats = _datetime_stats_from_state(col_state["datetime"], total_rows, evidence) if mode == "datetime" else None
+
+    string_quality = None
+    if inferred_type in ("text", "categorical") and col_state["pandas_dtype"] == "object":
+        string_quality = _string_quality_from_state(col_state["strings"], total_rows - null_count)
+
+    mixed_types_info = None
+    if col_state["mixed_types"] is not None:
+        mixed_types_info = _mixed_types_from_state(col_state["mixed_types"], evidence)
+
+    numeric_coercion = None
+    if col_state["coercion"] is not None and inferred_type == "numeric":
+        coercion = col_state["coercion"]
+        non_null = coercion["parsed_count"] + coercion["unparsed_count"]
+        unparsed = sorted(coercion["unparsed_values"].items(), key=lambda item: item[1], reverse=True)
+        numeric_coercion = {
+            "parsed_count": coercion["parsed_count"],
+            "unparsed_count": coercion["unparsed_count"],
+            "unparsed_pct": round(coercion["unparsed_count"] / non_null * 100, 2) if non_null > 0 else 0.0,
+            "unparsed_values": [value for value, _ in unparsed[:5]],
+        }
+
+    col_profile = {
+        "pandas_dtype": col_state["pandas_dtype"],
+        "inferred_type": inferred_type,
+        "non_null_count": total_rows - null_count,
+        "null_count": null_count,
+        "missing_pct": round(null_count / total_rows * 100, 2) if total_rows > 0 else 0.0,
+        "unique_count": unique_count,
+        "top_values": top_values,
+        "numeric_stats": numeric_stats,
+        "datetime_stats": datetime_stats,
+        "string_quality": string_quality,
+        "mixed_types_info": mixed_types_info,
+        "numeric_coercion": numeric_coercion,
+        "evidence": evidence,
+        "quality_flags": [],
+        "memory_bytes": col_state.get("memory_bytes"),
+    }
+    if col_state.get("mode_conflicts"):
+        # Later rows looked like another type than the one the first rows fixed
+        col_profile["mode_conflicts"] = {"profiled_as": mode, "rows": dict(col_state["mode_conflicts"])}
+    return col_profile
+
+
+def _numeric_stats_from_state(numeric: dict, total_rows: int) -> dict:
+    if numeric is None or numeric["count"] == 0:
+        return None
+
+    n = numeric["count"]
+    p25, p50, p75 = (float(q) for q in np.quantile(numeric["sample"], [0.25, 0.5, 0.75]))
+    std = float(np.sqrt(numeric["m2"] / (n - 1))) if n > 1 else None
+
+    # Adjusted Fisher-Pearson skewness, as pandas Series.skew computes it
+    skewness = None
+    if n > 2:
+        skewness = 0.0 if numeric["m2"] == 0 else float(
+            n * (n - 1) ** 0.5 / (n - 2) * numeric["m3"] / numeric["m2"] ** 1.5
+        )
+
+    return {
+        "min": numeric["min"],
+        "max": numeric["max"],
+        "mean": numeric["mean"],
+        "median": p50,
+        "std": std,
+        "p25": p25,
+        "p50": p50,
+        "p75": p75,
+        "skewness": skewness,
+        "zero_count": numeric["zero_count"],
+        "zero_pct": round(numeric["zero_count"] / total_rows * 100, 2) if total_rows > 0 else 0.0,
+        "negative_count": numeric["negative_count"],
+        "negative_pct": round(numeric["negative_count"] / total_rows * 100, 2) if total_rows > 0 else 0.0,
+    }
+
+
+def _datetime_stats_from_state(datetimes: dict, total_rows: int, evidence: dict) -> dict:
+    if datetimes is None or datetimes["min"] is None:
+        return {"min": None, "max": None, "future_count": 0, "future_pct": 0.0, "max_future_date": None}
+
+    def _timestamp(value):
+        timestamp = pd.Timestamp(value)
+        if datetimes["tz"]:
+            timestamp = timestamp.tz_localize("UTC").tz_convert(datetimes["tz"])
+        return timestamp
+
+    # Future counts are relative to now, so recompute them from the stored values
+    future = datetimes["future_values"] > pd.Timestamp.now().value
+    future_count = int(future.sum())
+    future_rows = datetimes["future_rows"][future]
+    order = np.argsort(future_rows, kind="stable")[:MAX_EXAMPLES]
+    evidence["future_date"] = {
+        "count": future_count,
+        "examples": [
+            {"row_number": int(future_rows[i]), "value": str(_timestamp(datetimes["future_values"][future][i]))}
+            for i in order
+        ],
+    }
+
+    return {
+        "min": _timestamp(datetimes["min"]).isoformat(),
+        "max": _timestamp(datetimes["max"]).isoformat(),
+        "future_count": future_count,
+        "future_pct": round(future_count / total_rows * 100, 2) if total_rows > 0 else 0.0,
+        "max_future_date": _timestamp(datetimes["future_values"][future].max()).isoformat() if future_count > 0 else None,
+    }
+
+
+def _string_quality_from_state(strings: dict, non_null_count: int) -> dict:
+    strings = strings or {
+        "whitespace_count": 0, "placeholder_count": 0, "placeholder_values": [],
+        "special_char_count": 0, "casing_groups": [],
+    }
+
+    def _pct(count):
+        return round(count / non_null_count * 100, 2) if non_null_count > 0 else 0.0
+
+    return {
+        "whitespace_count": strings["whitespace_count"],
+        "whitespace_pct": _pct(strings["whitespace_count"]),
+        "placeholder_count": strings["placeholder_count"],
+        "placeholder_pct": _pct(strings["placeholder_count"]),
+        "placeholder_values": list(strings["placeholder_values"]),
+        "casing_issues": len(strings["casing_groups"]) > 0,
+        "casing_groups": len(strings["casing_groups"]),
+        "special_char_count": strings["special_char_count"],
+        "special_char_pct": _pct(strings["special_char_count"]),
+        "special_char_checked": non_null_count,
+    }
+
+
+def _mixed_types_from_state(mixed: dict, evidence: dict) -> dict:
+    type_counts = dict(mixed["type_counts"])
+    total_values = sum(type_counts.values())
+    if total_values == 0:
+        return {"has_mixed_types": False, "type_counts": {}, "mixed_type_pct": 0.0, "type_examples": {}}
+
+    majority_type = max(type_counts, key=type_counts.get)
+    minority_count = total_values - type_counts[majority_type]
+    minority_examples = sorted(
+        (example for type_name, examples in mixed["type_examples"].items() if type_name != majority_type
+         for example in examples),
+        key=lambda example: example["row_number"],
+    )
+    evidence["mixed_types"] = {"count": minority_count, "examples": minority_examples[:MAX_EXAMPLES]}
+
+    return {
+        "has_mixed_types": len(type_counts) > 1,
+        "type_counts": type_counts,
+        "mixed_type_pct": round(minority_count / total_values * 100, 2) if len(type_counts) > 1 else 0.0,
+        "type_examples": {type_name: list(examples) for type_name, examples in mixed["type_examples"].items()},
+    }
+
+
+def _duplicate_analysis_from_state(state: dict) -> dict:
+    total_rows = state["n_rows"]
+    duplicates = state["duplicates"]
+    near_duplicates = {
+        "cluster_count": 0,
+        "near_duplicate_rows": 0,
+        "clusters": [],
+        "skipped": "Near-duplicate detection is not maintained for incremental profiles",
+    }
+
+    if duplicates is None or duplicates["error"]:
+        return {
+            "total_rows": total_rows,
+            "unique_rows": -1,
+            "duplicate_rows": -1,
+            "duplicate_pct": 0.0,
+            "duplicate_sets": [],
+            "error": duplicates["error"] if duplicates else "No rows profiled",
+            "near_duplicates": near_duplicates,
+        }
+
+    unique_rows = int(len(duplicates["hashes"]))
+    duplicate_rows = total_rows - unique_rows
+    return {
+        "total_rows": total_rows,
+        "unique_rows": unique_rows,
+        "duplicate_rows": duplicate_rows,
+        "duplicate_pct": round(duplicate_rows / total_rows * 100, 2) if total_rows > 0 else 0.0,
+        "duplicate_sets": [
+            {"row_data": entry["row_data"], "count": entry["count"], "example_indices": list(entry["example_indices"])}
+            for entry in duplicates["sets"]
+        ],
+        "near_duplicates": near_duplicates,
+    }
+
+
+def _candidate_keys_from_state(state: dict) -> dict:
+    keys_state = state["candidate_keys"]
+    if keys_state is None:
+        return {"max_width": state["settings"]["max_key_width"], "keys": [], "candidates_checked": 0, "truncated": False}
+
+    result = dict(keys_state["result"])
+    result["keys"] = [list(key) for key in keys_state["keys"]]
+    if keys_state["invalidated_keys"]:
+        result["invalidated_keys"] = [list(key) for key in keys_state["invalidated_keys"]]
+        # Keys containing an invalidated one were never tested on all rows
+        result["partial"] = True
+    return result
@@ -1,7 +1,42 @@
 import pandas as pd
 import numpy as np
-import string
+import hashlib
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from itertools import combinations
 
+from quality import generate_quality_flags
+
+
+# Bump whenever profile output changes, so cached profiles are invalidated
+PROFILER_VERSION = "2.7"
+
+# Confidence level of the intervals reported in sampled mode (z = 1.96)
+SAMPLE_CONFIDENCE_LEVEL = 0.95
+
+# Dataset-level stages, in the order profile_dataframe runs them after the columns
+DATASET_STAGES = ("duplicate_analysis", "candidate_keys", "near_duplicates")
+
+# Time-budgeted profiling: share of the budget for per-column metrics, and cost model defaults
+COLUMN_BUDGET_SHARE = 0.6
+DEFAULT_THROUGHPUT_BYTES_PER_SEC = 50 * 1024 * 1024
+THROUGHPUT_WARMUP_BYTES = 1024 * 1024
+NEAR_DUPLICATE_COST_FACTOR = 2.0
+# Rows compared for near duplicates; larger frames are sampled (64 MinHash values, 512 bytes, per row)
+NEAR_DUPLICATE_MAX_ROWS = 100_000
+ROW_HASH_COST_FACTOR = 0.25
+MIN_DEGRADED_SAMPLE_ROWS = 10_000
+
+# Expensive per-column sections that a lazy profile can leave for compute_deferred_sections
+DEFERRABLE_SECTIONS = ("string_quality", "datetime_stats", "mixed_types_info")
+
+# Memory tracking: how often the resident set size is sampled while a step runs
+RSS_SAMPLE_SECONDS = 0.01
+# Rows sampled per object column when estimating memory usage
+MEMORY_SAMPLE_ROWS = 1000
 
 # Common placeholder values for string quality detection
 COMMON_PLACEHOLDERS = {
@@ -10,18 +45,67 @@ COMMON_PLACEHOLDERS = {
     '', ' ', '--', '?', 'missing', 'n.a.', 'n.a', 'n\\a'
 }
 
+# Special characters: anything outside string.printable, as a vectorised regex
+SPECIAL_CHAR_PATTERN = r'[^\t\n\r\x0b\x0c\x20-\x7e]'
+
+# Numbers formatted for people: a leading currency symbol and comma thousands separators
+CURRENCY_PREFIX_PATTERN = r'^([-+]?)\s*[$€£¥]\s*'
+THOUSANDS_GROUPED_PATTERN = r'[-+]?\d{1,3}(?:,\d{3})+(?:\.\d+)?'
+
 
-def profile_dataframe(df: pd.DataFrame) -> dict:
+def profile_dataframe(df: pd.DataFrame, max_key_width: int = 2, top_n: int = 5,
+                      column_cache=None, sample_size: int = None, stratify_by: str = None,
+                      population_rows: int = None, random_state: int = 42,
+                      time_budget: float = None, progress_callback=None, cancel_event=None,
+                      deferred_sections: tuple = (), track_memory: bool = False,
+                      exact_memory: bool = False) -> dict:
     """
     Returns a structured profile for the dataframe.
 
+    Args:
+        df: The DataFrame to profile
+        max_key_width: Maximum number of columns in a discovered candidate key
+        top_n: Number of most frequent values to keep per column
+        column_cache: Optional store with get(key)/put(key, value) (e.g. cache_utils.ProfileCache)
+            used to reuse column profiles whose values, dtype and index are unchanged
+        sample_size: Profile a random sample of this many rows when df is larger
+        stratify_by: Column to stratify the sample by (proportional allocation)
+        population_rows: Row count of the full data when df is already a sample
+            (e.g. from io_utils.load_sample)
+        random_state: Seed for reproducible sampling
+        time_budget: Seconds the profile may take. Cheap per-column metrics run
+            first; columns, duplicate analysis, candidate keys and near-duplicate
+            detection are sampled, downgraded or skipped when the budget runs short,
+            and dataset["degraded"] lists what was affected
+        progress_callback: Called with an event dict when each column or dataset stage
+            starts and finishes (see _ProfileRun.begin)
+        cancel_event: Cancel token (e.g. threading.Event) checked between columns and
+            stages; once set, profiling stops with ProfilingCancelled
+        deferred_sections: Expensive column sections (from DEFERRABLE_SECTIONS) to skip
+            for now; each column lists the ones it skipped in "deferred_sections",
+            and compute_deferred_sections fills them in on demand
+        track_memory: Record peak and net allocations (tracemalloc) and sampled
+            resident set size per stage and per column under "memory". Slows
+            profiling down noticeably, so it is off by default
+        exact_memory: Measure memory usage with a deep scan of every Python object.
+            By default object and string columns are extrapolated from
+            MEMORY_SAMPLE_ROWS evenly spaced rows (fixed-width dtypes are exact)
+
+    In sampled mode counts and percentages describe the sample, every percentage
+    gets a `<name>_ci` confidence interval, and dataset["sampling"] records the
+    sample and population sizes.
+
     Returns:
     {
       "dataset": {
         "n_rows": int,
         "n_columns": int,
         "memory_usage_bytes": int,
+        "memory_usage_exact": bool,
         "duplicate_analysis": {...},
+        "candidate_keys": {...},
+        "sampling": {...} (sampled mode only),
+        "time_budget": {...}, "degraded": [...] (time-budgeted runs only),
       },
       "columns": {
         column_name: {
@@ -35,69 +119,886 @@ def profile_dataframe(df: pd.DataFrame) -> dict:
           "numeric_stats": {...} or None,
           "datetime_stats": {...} or None,
           "string_quality": {...} or None,
+          "numeric_coercion": {...} or None,
+          "evidence": {check: {"count": int, "examples": [...]}},
           "quality_flags": [],
+          "memory_bytes": int,
         },
         ...
-      }
+      },
+      "timings": {"wall_seconds", "cpu_seconds", "rows_per_second", "stages": {...}, "columns": {...}},
+      "memory": {"peak_bytes", "net_bytes", "rss_peak_bytes", "stages": {...}, "columns": {...}}
+        (track_memory only)
     }
     """
-    total_rows = len(df)
+    profile = None
+    for _, profile in iter_profile_dataframe(
+        df, max_key_width=max_key_width, top_n=top_n, column_cache=column_cache, sample_size=sample_size,
+        stratify_by=stratify_by, population_rows=population_rows, random_state=random_state,
+        time_budget=time_budget, progress_callback=progress_callback, cancel_event=cancel_event,
+        deferred_sections=deferred_sections, track_memory=track_memory, exact_memory=exact_memory,
+    ):
+        pass
+    return profile
+
+
+def iter_profile_dataframe(df: pd.DataFrame, max_key_width: int = 2, top_n: int = 5,
+                           column_cache=None, sample_size: int = None, stratify_by: str = None,
+                           population_rows: int = None, random_state: int = 42,
+                           time_budget: float = None, progress_callback=None, cancel_event=None,
+                           deferred_sections: tuple = (), track_memory: bool = False,
+                           exact_memory: bool = False):
+    """
+    Profile a dataframe step by step, yielding the partial profile as it fills in.
+
+    Takes the same arguments as profile_dataframe. Yields `(event, profile)`
+    pairs: first with stage "dataset" once the dataset summary is known, then
+    after every column and dataset stage (event as for progress callbacks, with
+    status "finished"). `profile` is the same dict each time, growing until the
+    last pair holds the complete profile; consumers must not modify it.
+    """
+    memory = _MemoryTracker() if track_memory else None
+    try:
+        yield from _iter_profile(
+            df, max_key_width=max_key_width, top_n=top_n, column_cache=column_cache, sample_size=sample_size,
+            stratify_by=stratify_by, population_rows=population_rows, random_state=random_state,
+            time_budget=time_budget, progress_callback=progress_callback, cancel_event=cancel_event,
+            deferred_sections=deferred_sections, exact_memory=exact_memory, memory=memory,
+        )
+    finally:
+        # Also runs when the consumer stops early or profiling is cancelled
+        if memory is not None:
+            memory.close()
+
+
+def _iter_profile(df: pd.DataFrame, max_key_width: int, top_n: int, column_cache, sample_size: int,
+                  stratify_by: str, population_rows: int, random_state: int, time_budget: float,
+                  progress_callback, cancel_event, deferred_sections: tuple, exact_memory: bool, memory):
+    """Body of iter_profile_dataframe; `memory` is a _MemoryTracker or None."""
+    sampling = None
+    if sample_size is not None and len(df) > sample_size:
+        population_rows = len(df)
+        df = sample_dataframe(df, sample_size, stratify_by=stratify_by, random_state=random_state)
+    if population_rows is not None:
+        sampling = {
+            "method": "stratified" if stratify_by is not None else "uniform",
+            "stratify_by": stratify_by,
+            "sample_rows": len(df),
+            "population_rows": population_rows,
+            "confidence_level": SAMPLE_CONFIDENCE_LEVEL,
+            "random_state": random_state,
+        }
 
-    # Analyze duplicates at dataset level
-    duplicate_analysis = _analyze_duplicates(df)
+    run = _ProfileRun(time_budget, progress_callback=progress_callback, cancel_event=cancel_event,
+                      total_steps=len(df.columns) + len(DATASET_STAGES), memory=memory)
+    total_rows = len(df)
 
+    run.start_step()
+    column_bytes = _column_memory_bytes(df, exact=exact_memory)
     profile = {
         "dataset": {
             "n_rows": total_rows,
             "n_columns": len(df.columns),
-            "memory_usage_bytes": int(df.memory_usage(deep=True).sum()),
-            "duplicate_analysis": duplicate_analysis,
+            "memory_usage_bytes": _index_memory_bytes(df.index, exact=exact_memory) + sum(column_bytes.values()),
+            "memory_usage_exact": exact_memory,
         },
         "columns": {}
     }
-
-    for col_name in df.columns:
-        col_profile = _profile_column(df[col_name], col_name, total_rows)
+    run.end_step("memory_usage")
+    yield run.event("dataset", None, "finished"), profile
+
+    index_fingerprint = _index_fingerprint(df.index) if column_cache is not None else None
+    column_hashes = {}
+    # Columns profiled on a sample, whose unique counts are estimates
+    estimated_columns = set()
+
+    # Per-column metrics first, so a tight budget still yields every column
+    for position, col_name in enumerate(df.columns):
+        run.begin("column", column=col_name)
+        series = df[col_name]
+        sample_rows = run.column_sample_rows(column_bytes[col_name], total_rows, len(df.columns) - position)
+        column_start = time.perf_counter()
+
+        if sample_rows is not None:
+            col_profile = _profile_column_sampled(series, col_name, total_rows, top_n, sample_rows,
+                                                  kernel_timer=run.kernels)
+            run.degrade("column_profile", f"profiled on a sample of {sample_rows:,} of {total_rows:,} rows",
+                        column=col_name)
+            estimated_columns.add(col_name)
+            path = "sampled"
+        elif column_cache is None:
+            col_profile = _profile_column(series, col_name, total_rows, top_n=top_n, deferred=deferred_sections,
+                                          kernel_timer=run.kernels)
+            path = "full"
+        else:
+            col_profile, cached = _profile_column_memoized(
+                series, col_name, total_rows, top_n, column_cache, index_fingerprint, column_hashes,
+                deferred=deferred_sections, kernel_timer=run.kernels
+            )
+            path = "cached" if cached else "full"
+        col_profile["memory_bytes"] = column_bytes[col_name]
         profile["columns"][col_name] = col_profile
+        profiled_bytes = column_bytes[col_name]
+        if sample_rows is not None:
+            profiled_bytes = profiled_bytes * sample_rows // max(total_rows, 1)
+        run.record(profiled_bytes, time.perf_counter() - column_start)
+        yield run.finish("column", column=col_name, rows=total_rows, path=path), profile
+
+    # Dataset-level stages cost roughly one pass over every column
+    frame_bytes = sum(column_bytes.values())
+
+    run.begin("duplicate_analysis")
+    if run.can_afford(frame_bytes):
+        with run.kernels("_analyze_duplicates"):
+            duplicate_analysis = _analyze_duplicates(df)
+    elif run.can_afford(frame_bytes * ROW_HASH_COST_FACTOR):
+        with run.kernels("_count_duplicates"):
+            duplicate_analysis = _count_duplicates(df)
+        run.degrade("duplicate_analysis", "counted from row hashes; duplicate sets not collected")
+    else:
+        duplicate_analysis = {
+            "total_rows": total_rows,
+            "unique_rows": -1,
+            "duplicate_rows": -1,
+            "duplicate_pct": 0.0,
+            "duplicate_sets": [],
+            "error": "Duplicate analysis skipped to stay within the time budget",
+        }
+        run.degrade("duplicate_analysis", "skipped")
+    profile["dataset"]["duplicate_analysis"] = duplicate_analysis
+    yield run.finish("duplicate_analysis"), profile
+
+    # Candidate keys need per-column unique counts, so discover them after the columns
+    run.begin("candidate_keys")
+    with run.kernels("_discover_candidate_keys"):
+        candidate_keys = _discover_candidate_keys(
+            df, profile["columns"], duplicate_analysis, max_width=max_key_width, column_hashes=column_hashes,
+            deadline=run.deadline, estimated_columns=estimated_columns
+        )
+    if candidate_keys.pop("timed_out", False):
+        run.degrade("candidate_keys", f"search stopped at the deadline after {candidate_keys['candidates_checked']:,} candidates")
+    profile["dataset"]["candidate_keys"] = candidate_keys
+    yield run.finish("candidate_keys"), profile
+
+    # Near-duplicate detection ignores timestamp columns, so it needs inferred types
+    run.begin("near_duplicates")
+    if run.can_afford(frame_bytes * NEAR_DUPLICATE_COST_FACTOR):
+        datetime_columns = [
+            col_name for col_name, col_profile in profile["columns"].items()
+            if col_profile["inferred_type"] == "datetime"
+        ]
+        with run.kernels("_analyze_near_duplicates"):
+            duplicate_analysis["near_duplicates"] = _analyze_near_duplicates(df, exclude_columns=datetime_columns)
+    else:
+        duplicate_analysis["near_duplicates"] = {
+            "cluster_count": 0,
+            "near_duplicate_rows": 0,
+            "clusters": [],
+            "skipped": "Near-duplicate detection skipped to stay within the time budget",
+        }
+        run.degrade("near_duplicates", "skipped")
 
-    return profile
+    if sampling is not None:
+        profile["dataset"]["sampling"] = sampling
+        with run.kernels("_add_confidence_intervals"):
+            _add_confidence_intervals(profile)
 
+    if run.time_budget is not None:
+        profile["dataset"]["time_budget"] = {
+            "budget_seconds": run.time_budget,
+            "elapsed_seconds": round(run.elapsed(), 3),
+        }
+        profile["dataset"]["degraded"] = run.degraded
 
-def _profile_column(series: pd.Series, col_name: str, total_rows: int) -> dict:
-    """Profile a single column and return its metadata."""
+    event = run.finish("near_duplicates")
+    profile["timings"] = run.timings(total_rows)
+    if memory is not None:
+        profile["memory"] = run.memory_profile()
+    yield event, profile
 
-    pandas_dtype = str(series.dtype)
-    null_count = int(series.isna().sum())
-    non_null_count = int(series.notna().sum())
-    missing_pct = (null_count / total_rows * 100) if total_rows > 0 else 0.0
-    unique_count = int(series.nunique(dropna=True))
 
-    # Infer high-level type
-    inferred_type = _infer_type(series, unique_count, total_rows)
+class ProfilingCancelled(Exception):
+    """Raised when a profile's cancel token is set before it finishes."""
 
-    # Get top values
-    top_values = _get_top_values(series, n=5)
 
-    # Check for mixed types in object columns
-    mixed_types_info = None
-    if pandas_dtype == 'object':
-        mixed_types_info = _detect_mixed_types(series)
+def stage_clock() -> tuple:
+    """Start point for stage_timing: wall clock and CPU time of the calling thread."""
+    return time.perf_counter(), time.thread_time()
 
-    # Get type-specific statistics
-    numeric_stats = None
-    datetime_stats = None
-    string_quality = None
 
-    if inferred_type == "numeric":
-        numeric_stats = _compute_numeric_stats(series)
-    elif inferred_type == "datetime":
-        datetime_stats = _compute_datetime_stats(series)
+def stage_timing(start: tuple, rows: int = None) -> dict:
+    """Wall and CPU seconds since `start` (from stage_clock), with throughput when `rows` is given."""
+    wall = time.perf_counter() - start[0]
+    timing = {"wall_seconds": round(wall, 6), "cpu_seconds": round(time.thread_time() - start[1], 6)}
+    if rows is not None:
+        timing["rows_per_second"] = round(rows / wall, 1) if wall > 0 else None
+    return timing
 
-    # Analyze string quality for text/categorical columns
-    if inferred_type in ["text", "categorical"]:
-        string_quality = _analyze_string_quality(series)
 
+class _KernelTimer:
+    """Wall seconds spent in each profiling kernel (function) during one step."""
+
+    def __init__(self):
+        self.seconds = {}
+
+    @contextmanager
+    def __call__(self, kernel: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[kernel] = self.seconds.get(kernel, 0.0) + time.perf_counter() - start
+
+    def rounded(self) -> dict:
+        return {kernel: round(seconds, 6) for kernel, seconds in self.seconds.items()}
+
+
+def _untimed(kernel: str):
+    """Stand-in for a _KernelTimer when timings are not collected."""
+    return nullcontext()
+
+
+def add_stage_timing(profile: dict, stage: str, timing: dict) -> None:
+    """
+    Record a stage run outside profile_dataframe (e.g. "load") in the profile's timings.
+
+    Args:
+        profile: Profile with a "timings" section
+        stage: Stage name; it is listed before the profiling stages
+        timing: Result of stage_timing(start) with start = stage_clock() taken when the stage began
+    """
+    timings = profile.setdefault("timings", {})
+    timings["stages"] = {stage: timing, **timings.get("stages", {})}
+
+
+def _rss_bytes():
+    """Resident set size of this process in bytes, or None where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class _MemoryTracker:
+    """
+    Memory used by the steps of one profiling run.
+
+    Python and NumPy allocations are traced with tracemalloc (started here if
+    it is not already running); the resident set size is sampled by a
+    background thread every RSS_SAMPLE_SECONDS, so native memory outside
+    tracemalloc shows up too. For each step, peak_bytes is the highest traced
+    allocation above the step's starting point, net_bytes what the step left
+    allocated, and rss_peak_bytes / rss_delta_bytes the sampled RSS.
+    """
+
+    def __init__(self, sample_interval: float = RSS_SAMPLE_SECONDS):
+        self._owns_tracing = not tracemalloc.is_tracing()
+        if self._owns_tracing:
+            tracemalloc.start()
+        self._run_traced_start = tracemalloc.get_traced_memory()[0]
+        self._run_traced_peak = self._run_traced_start
+        self._run_rss_start = _rss_bytes()
+        self._run_rss_peak = self._run_rss_start
+        self._step_traced_start = self._run_traced_start
+        self._step_rss_start = self._step_rss_peak = self._run_rss_start
+
+        self._stop = threading.Event()
+        self._sampler = None
+        if self._run_rss_start is not None:
+            self._sampler = threading.Thread(target=self._sample_rss, args=(sample_interval,),
+                                             name="profile-rss-sampler", daemon=True)
+            self._sampler.start()
+
+    def _sample_rss(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            rss = _rss_bytes()
+            if rss is not None and rss > self._step_rss_peak:
+                self._step_rss_peak = rss
+
+    def start_step(self) -> None:
+        tracemalloc.reset_peak()
+        self._step_traced_start = tracemalloc.get_traced_memory()[0]
+        self._step_rss_start = self._step_rss_peak = _rss_bytes()
+
+    def end_step(self) -> dict:
+        current, peak = tracemalloc.get_traced_memory()
+        self._run_traced_peak = max(self._run_traced_peak, peak)
+        step = {
+            "peak_bytes": peak - self._step_traced_start,
+            "net_bytes": current - self._step_traced_start,
+        }
+
+        rss = _rss_bytes()
+        if rss is not None:
+            rss_peak = max(self._step_rss_peak or rss, rss)
+            self._run_rss_peak = max(self._run_rss_peak or rss_peak, rss_peak)
+            step["rss_peak_bytes"] = rss_peak
+            step["rss_delta_bytes"] = rss - self._step_rss_start
+        return step
+
+    def totals(self) -> dict:
+        totals = {
+            "peak_bytes": self._run_traced_peak - self._run_traced_start,
+            "net_bytes": tracemalloc.get_traced_memory()[0] - self._run_traced_start,
+        }
+        if self._run_rss_start is not None:
+            totals["rss_peak_bytes"] = self._run_rss_peak
+            totals["rss_delta_bytes"] = _rss_bytes() - self._run_rss_start
+        return totals
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+        if self._owns_tracing:
+            tracemalloc.stop()
+
+
+class _ProfileRun:
+    """
+    Bookkeeping for one profiling call: deadline, progress events, cancellation and timings.
+
+    Stage costs are estimated from the throughput (bytes of column data per
+    second) measured on the columns profiled so far. Without a time budget
+    nothing is ever degraded. Every step records its wall and CPU time and the
+    kernels it ran, for the profile's "timings" section.
+    """
+
+    def __init__(self, time_budget: float = None, progress_callback=None, cancel_event=None,
+                 total_steps: int = 0, memory=None):
+        self.time_budget = time_budget
+        self.start = time.perf_counter()
+        self.deadline = None if time_budget is None else self.start + time_budget
+        self.degraded = []
+        self.progress_callback = progress_callback
+        self.cancel_event = cancel_event
+        self.total_steps = total_steps
+        self.completed_steps = 0
+        self._bytes_done = 0
+        self._seconds_done = 0.0
+        self._start_clock = stage_clock()
+        self._step_clock = None
+        self.kernels = _KernelTimer()
+        self.stage_timings = {}
+        self.column_timings = {}
+        self.memory = memory
+        self.stage_memory = {}
+        self.column_memory = {}
+
+    def check_cancelled(self) -> None:
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise ProfilingCancelled("Profiling was cancelled")
+
+    def begin(self, stage: str, column=None) -> None:
+        """
+        Start a step: check the cancel token, then report a "started" event.
+
+        Events are dicts with stage ("column" or one of DATASET_STAGES), column
+        (str or None), status ("started" or "finished"), completed and total
+        step counts, fraction done and elapsed seconds.
+        """
+        self.check_cancelled()
+        self._emit(stage, column, "started")
+        self.start_step()
+
+    def finish(self, stage: str, column=None, rows: int = None, **details) -> dict:
+        """
+        Finish a step: record its timing (with throughput over `rows` and any
+        `details`), report a "finished" event and return it.
+        """
+        self.end_step(stage, column, rows, **details)
+        self.completed_steps += 1
+        return self._emit(stage, column, "finished")
+
+    def start_step(self) -> None:
+        """Start measuring a step (begin does this for steps that report progress)."""
+        self._step_clock = stage_clock()
+        self.kernels = _KernelTimer()
+        if self.memory is not None:
+            self.memory.start_step()
+
+    def end_step(self, stage: str, column=None, rows: int = None, **details) -> None:
+        """Record the timing and memory of the step started by start_step."""
+        timing = stage_timing(self._step_clock, rows)
+        timing.update(details, kernels=self.kernels.rounded())
+        step_memory = self.memory.end_step() if self.memory is not None else None
+        if stage == "column":
+            self.column_timings[str(column)] = timing
+            self.column_memory[str(column)] = step_memory
+        else:
+            self.stage_timings[stage] = timing
+            self.stage_memory[stage] = step_memory
+
+    def timings(self, total_rows: int) -> dict:
+        """The "timings" section: totals, dataset stages (columns summed into one) and per-column timings."""
+        total = stage_timing(self._start_clock, total_rows)
+        columns = {
+            "wall_seconds": round(sum(t["wall_seconds"] for t in self.column_timings.values()), 6),
+            "cpu_seconds": round(sum(t["cpu_seconds"] for t in self.column_timings.values()), 6),
+        }
+        stages = {"memory_usage": self.stage_timings.get("memory_usage"), "columns": columns}
+        stages.update((stage, timing) for stage, timing in self.stage_timings.items() if stage != "memory_usage")
+        return {**total, "stages": stages, "columns": self.column_timings}
+
+    def memory_profile(self) -> dict:
+        """The "memory" section: run totals, dataset stages and per-column allocations."""
+        return {**self.memory.totals(), "stages": self.stage_memory, "columns": self.column_memory}
+
+    def event(self, stage: str, column, status: str) -> dict:
+        return {
+            "stage": stage,
+            "column": str(column) if column is not None else None,
+            "status": status,
+            "completed": self.completed_steps,
+            "total": self.total_steps,
+            "fraction": self.completed_steps / self.total_steps if self.total_steps else 1.0,
+            "elapsed_seconds": round(self.elapsed(), 3),
+        }
+
+    def _emit(self, stage: str, column, status: str) -> dict:
+        event = self.event(stage, column, status)
+        if self.progress_callback is not None:
+            self.progress_callback(event)
+        return event
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
+
+    def remaining(self) -> float:
+        if self.deadline is None:
+            return float("inf")
+        return self.deadline - time.perf_counter()
+
+    def record(self, n_bytes: int, seconds: float) -> None:
+        """Record the cost of a finished column."""
+        self._bytes_done += n_bytes
+        self._seconds_done += seconds
+
+    def estimate(self, n_bytes: int) -> float:
+        """Estimated seconds to process `n_bytes` of column data."""
+        if self._bytes_done < THROUGHPUT_WARMUP_BYTES or self._seconds_done <= 0:
+            throughput = DEFAULT_THROUGHPUT_BYTES_PER_SEC
+        else:
+            throughput = self._bytes_done / self._seconds_done
+        return n_bytes / throughput
+
+    def can_afford(self, n_bytes: int) -> bool:
+        return self.deadline is None or self.estimate(n_bytes) <= self.remaining()
+
+    def column_sample_rows(self, n_bytes: int, total_rows: int, columns_left: int):
+        """
+        Rows to sample for the next column, or None to profile it in full.
+
+        Columns share COLUMN_BUDGET_SHARE of the budget evenly; a column whose
+        estimated cost exceeds its share is sampled down to fit.
+        """
+        if self.deadline is None or total_rows <= MIN_DEGRADED_SAMPLE_ROWS:
+            return None
+
+        column_time_left = self.time_budget * COLUMN_BUDGET_SHARE - self.elapsed()
+        fair_share = max(column_time_left, 0.0) / columns_left
+        estimate = self.estimate(n_bytes)
+        if estimate <= fair_share:
+            return None
+
+        return max(MIN_DEGRADED_SAMPLE_ROWS, int(total_rows * fair_share / estimate))
+
+    def degrade(self, metric: str, detail: str, column=None) -> None:
+        """Record a metric that was sampled, downgraded or skipped."""
+        self.degraded.append({
+            "metric": metric,
+            "column": str(column) if column is not None else None,
+            "detail": detail,
+        })
+
+
+def _column_memory_bytes(df: pd.DataFrame, exact: bool = False) -> dict:
+    """Memory used by each column: a deep scan when `exact`, else _estimate_series_bytes."""
+    if exact:
+        return {col_name: int(nbytes) for col_name, nbytes in df.memory_usage(deep=True, index=False).items()}
+    return {col_name: _estimate_series_bytes(df[col_name]) for col_name in df.columns}
+
+
+def _index_memory_bytes(index: pd.Index, exact: bool = False) -> int:
+    if exact or not _holds_python_objects(index.dtype):
+        return int(index.memory_usage(deep=True))
+    return _estimate_series_bytes(pd.Series(index, copy=False))
+
+
+def _holds_python_objects(dtype) -> bool:
+    """Whether values are Python objects that only a deep scan can size (object, python-backed strings)."""
+    return dtype == object or getattr(dtype, "storage", None) == "python"
+
+
+def _estimate_series_bytes(series: pd.Series, sample_size: int = MEMORY_SAMPLE_ROWS) -> int:
+    """
+    Memory used by a column: exact for fixed-width dtypes, extrapolated from
+    evenly spaced rows for columns of Python objects.
+    """
+    if not _holds_python_objects(series.dtype) or len(series) <= sample_size:
+        return int(series.memory_usage(deep=True, index=False))
+
+    sample = series.iloc[::len(series) // sample_size]
+    return int(sample.memory_usage(deep=True, index=False) * len(series) / len(sample))
+
+
+def _profile_column_sampled(series: pd.Series, col_name: str, total_rows: int, top_n: int,
+                            sample_rows: int, random_state: int = 42, kernel_timer=None) -> dict:
+    """
+    Profile a column on a random sample of its rows, for time-budgeted runs.
+
+    Null counts stay exact. Other counts are scaled up from the sample, and the
+    unique count is estimated from the sample's value frequencies.
+    """
+    timer = kernel_timer or _untimed
+    sample = series.sample(n=sample_rows, random_state=random_state).sort_index()
+    col_profile = _profile_column(sample, col_name, sample_rows, top_n=top_n, kernel_timer=kernel_timer)
+    _scale_column_counts(col_profile, total_rows / sample_rows)
+
+    null_mask = series.isna()
+    null_count = int(null_mask.sum())
+    _record_evidence(col_profile["evidence"], "null", series, null_mask)
+    col_profile["null_count"] = null_count
+    col_profile["non_null_count"] = total_rows - null_count
+    col_profile["missing_pct"] = round(null_count / total_rows * 100, 2) if total_rows > 0 else 0.0
+    with timer("_estimate_distinct"):
+        col_profile["unique_count"] = _estimate_distinct(sample.dropna(), total_rows - null_count)
+
+    # Re-apply the cardinality heuristic with the estimated unique count
+    if col_profile["inferred_type"] in ("text", "categorical") and total_rows > 0:
+        col_profile["inferred_type"] = "categorical" if col_profile["unique_count"] / total_rows < 0.05 else "text"
+
+    return col_profile
+
+
+def _scale_column_counts(col_profile: dict, scale: float) -> None:
+    """Scale the counts of a column profiled on a sample up to the full column."""
+    def _scaled(count):
+        return int(round(count * scale))
+
+    for item in col_profile["top_values"]:
+        item["count"] = _scaled(item["count"])
+
+    for stats_key, count_keys in (
+        ("numeric_stats", ("zero_count", "negative_count")),
+        ("datetime_stats", ("future_count",)),
+        ("string_quality", ("whitespace_count", "placeholder_count", "special_char_count")),
+        ("numeric_coercion", ("parsed_count", "unparsed_count")),
+    ):
+        section = col_profile.get(stats_key)
+        if section:
+            for count_key in count_keys:
+                section[count_key] = _scaled(section[count_key])
+
+    mixed = col_profile.get("mixed_types_info")
+    if mixed:
+        mixed["type_counts"] = {type_name: _scaled(count) for type_name, count in mixed["type_counts"].items()}
+
+    for check in col_profile["evidence"].values():
+        check["count"] = _scaled(check["count"])
+
+
+def _estimate_distinct(sample: pd.Series, population_size: int) -> int:
+    """
+    Estimate a column's distinct count from a uniform sample (Haas-Stokes Duj1 estimator).
+
+    Scales the sample's distinct count up by how many values were seen only
+    once: near-unique samples extrapolate to the population size, while
+    low-cardinality samples stay close to their own distinct count.
+    """
+    if len(sample) == 0:
+        return 0
+
+    frequencies = sample.value_counts().to_numpy()
+    sample_distinct = len(frequencies)
+    seen_once = int(np.count_nonzero(frequencies == 1))
+    sampling_fraction = min(len(sample) / population_size, 1.0) if population_size > 0 else 1.0
+
+    denominator = 1 - (1 - sampling_fraction) * seen_once / len(sample)
+    estimate = sample_distinct / denominator if denominator > 0 else population_size
+    return int(min(round(estimate), population_size))
+
+
+def _count_duplicates(df: pd.DataFrame) -> dict:
+    """
+    Count exact duplicate rows from row hashes, without collecting duplicate sets.
+
+    A cheaper fallback for _analyze_duplicates when time is short.
+    """
+    total_rows = len(df)
+
+    try:
+        unique_rows = int(len(pd.unique(pd.util.hash_pandas_object(df, index=False).to_numpy())))
+    except TypeError:
+        return {
+            "total_rows": total_rows,
+            "unique_rows": -1,
+            "duplicate_rows": -1,
+            "duplicate_pct": 0.0,
+            "duplicate_sets": [],
+            "error": "Unable to detect duplicates (unhashable column types present)"
+        }
+
+    duplicate_rows = total_rows - unique_rows
     return {
+        "total_rows": total_rows,
+        "unique_rows": unique_rows,
+        "duplicate_rows": duplicate_rows,
+        "duplicate_pct": round(duplicate_rows / total_rows * 100, 2) if total_rows > 0 else 0.0,
+        "duplicate_sets": [],
+    }
+
+
+def sample_dataframe(df: pd.DataFrame, sample_size: int, stratify_by: str = None,
+                     random_state: int = 42) -> pd.DataFrame:
+    """
+    Draw a reproducible uniform (or stratified) row sample, keeping original row labels and order.
+
+    Stratified samples allocate rows to each value of `stratify_by` in proportion
+    to its frequency (nulls form their own stratum) by largest remainder, so the
+    sample has exactly `sample_size` rows. Every non-empty stratum gets at least
+    one row while `sample_size` allows it, so rare groups are never dropped.
+
+    Args:
+        df: The DataFrame to sample
+        sample_size: Number of rows to draw
+        stratify_by: Optional column to stratify by
+        random_state: Seed for reproducible sampling
+
+    Returns:
+        pd.DataFrame: The sampled rows
+    """
+    if len(df) <= sample_size:
+        return df
+
+    if stratify_by is None:
+        sampled = df.sample(n=sample_size, random_state=random_state)
+    else:
+        codes, _ = pd.factorize(df[stratify_by], use_na_sentinel=False)
+        allocation = _allocate_strata(np.bincount(codes), sample_size)
+        rng = np.random.default_rng(random_state)
+        positions = np.concatenate([
+            rng.choice(np.flatnonzero(codes == stratum), size=count, replace=False)
+            for stratum, count in enumerate(allocation) if count > 0
+        ])
+        sampled = df.iloc[np.sort(positions)]
+
+    return sampled.sort_index()
+
+
+def _allocate_strata(sizes: np.ndarray, sample_size: int) -> np.ndarray:
+    """
+    Split `sample_size` rows across strata of the given sizes by largest remainder.
+
+    Every stratum gets at least one row; with more strata than rows, the largest
+    strata get one row each.
+    """
+    allocation = np.zeros(len(sizes), dtype=np.int64)
+    if sample_size < len(sizes):
+        allocation[np.argsort(-sizes, kind="stable")[:sample_size]] = 1
+        return allocation
+
+    quotas = sample_size * sizes / sizes.sum()
+    allocation = np.maximum(np.floor(quotas).astype(np.int64), 1)
+    # Rounding down leaves rows over, the one-row floor can take too many
+    surplus = sample_size - int(allocation.sum())
+    while surplus != 0:
+        shortfall = quotas - allocation
+        if surplus > 0:
+            order = np.argsort(-shortfall, kind="stable")[:surplus]
+            allocation[order] += 1
+            surplus -= len(order)
+        else:
+            shortfall[allocation <= 1] = np.inf
+            order = np.argsort(shortfall, kind="stable")[:min(-surplus, int(np.isfinite(shortfall).sum()))]
+            allocation[order] -= 1
+            surplus += len(order)
+
+    return allocation
+
+
+def _wilson_interval(count: int, n: int, z: float = 1.96) -> list:
+    """
+    Wilson score interval for a proportion, as [low, high] percentages.
+
+    Stays inside [0, 100] and is well behaved for counts of 0 or n, unlike the
+    normal approximation.
+    """
+    if n <= 0:
+        return [0.0, 100.0]
+
+    p = count / n
+    denominator = 1 + z ** 2 / n
+    center = (p + z ** 2 / (2 * n)) / denominator
+    margin = z * np.sqrt(p * (1 - p) / n + z ** 2 / (4 * n ** 2)) / denominator
+    return [round(float(max(0.0, center - margin)) * 100, 2), round(float(min(1.0, center + margin)) * 100, 2)]
+
+
+def _add_confidence_intervals(profile: dict) -> None:
+    """
+    Annotate every per-value percentage in a sampled profile with a `<name>_ci` Wilson interval.
+
+    Each interval uses the number of sampled values the percentage was computed over.
+    The duplicate percentage gets no interval: a duplicate pair is only seen when
+    both rows are sampled, so it is not a binomial proportion of the population.
+    It is marked with scope "sample" instead, as are the candidate keys: a
+    combination unique in the sample may repeat in the population.
+    """
+    dataset = profile["dataset"]
+    total_rows = dataset["n_rows"]
+
+    dataset["duplicate_analysis"]["scope"] = "sample"
+    dataset["candidate_keys"]["scope"] = "sample"
+
+    for col_profile in profile["columns"].values():
+        col_profile["missing_pct_ci"] = _wilson_interval(col_profile["null_count"], total_rows)
+
+        for item in col_profile["top_values"]:
+            item["pct_ci"] = _wilson_interval(item["count"], total_rows)
+
+        stats = col_profile["numeric_stats"]
+        if stats:
+            stats["zero_pct_ci"] = _wilson_interval(stats["zero_count"], total_rows)
+            stats["negative_pct_ci"] = _wilson_interval(stats["negative_count"], total_rows)
+
+        coercion = col_profile.get("numeric_coercion")
+        if coercion:
+            coercion["unparsed_pct_ci"] = _wilson_interval(
+                coercion["unparsed_count"], coercion["parsed_count"] + coercion["unparsed_count"]
+            )
+
+        for section in DEFERRABLE_SECTIONS:
+            _add_section_intervals(col_profile, section, total_rows)
+
+
+def _add_section_intervals(col_profile: dict, section: str, total_rows: int) -> None:
+    """
+    Wilson intervals for one deferrable section of a sampled column, as _add_confidence_intervals adds them.
+
+    Sections computed later by compute_deferred_sections get theirs from here too.
+    """
+    values = col_profile.get(section)
+    if not values:
+        return
+
+    if section == "datetime_stats":
+        values["future_pct_ci"] = _wilson_interval(values["future_count"], total_rows)
+    elif section == "string_quality":
+        # Every string check runs on all special_char_checked non-null values
+        checked = values["special_char_checked"]
+        values["whitespace_pct_ci"] = _wilson_interval(values["whitespace_count"], checked)
+        values["placeholder_pct_ci"] = _wilson_interval(values["placeholder_count"], checked)
+        values["special_char_pct_ci"] = _wilson_interval(values["special_char_count"], checked)
+    elif section == "mixed_types_info" and values["type_counts"]:
+        typed_values = sum(values["type_counts"].values())
+        minority = typed_values - max(values["type_counts"].values())
+        values["mixed_type_pct_ci"] = _wilson_interval(minority, typed_values)
+
+
+def _index_fingerprint(index: pd.Index) -> str:
+    """Cheap fingerprint of a row index; evidence row numbers depend on it."""
+    if isinstance(index, pd.RangeIndex):
+        return f"range:{index.start}:{index.stop}:{index.step}"
+
+    index_hashes = pd.util.hash_pandas_object(index, index=False).to_numpy()
+    return "hash:" + hashlib.blake2b(index_hashes.tobytes(), digest_size=16).hexdigest()
+
+
+def _profile_column_memoized(series: pd.Series, col_name: str, total_rows: int, top_n: int,
+                             column_cache, index_fingerprint: str, column_hashes: dict,
+                             deferred: tuple = (), kernel_timer=None) -> dict:
+    """
+    Profile a column, reusing a cached profile when its values are unchanged.
+
+    The cache key is a hash of the column's values, dtype and index plus the
+    profiling settings. The per-row value hashes are kept in `column_hashes`
+    for candidate key discovery.
+
+    Args:
+        series: The column data
+        col_name: Name of the column
+        total_rows: Total number of rows in the dataset
+        top_n: Number of most frequent values to keep
+        column_cache: Store with get(key)/put(key, value)
+        index_fingerprint: Result of _index_fingerprint for the DataFrame's index
+        column_hashes: Dict collecting per-row value hashes by column name
+        deferred: Sections to leave for compute_deferred_sections
+        kernel_timer: _KernelTimer recording the kernels that ran
+
+    Returns:
+        Tuple of (column profile, whether it came from the cache)
+    """
+    timer = kernel_timer or _untimed
+    try:
+        with timer("hash_pandas_object"):
+            value_hashes = pd.util.hash_pandas_object(series, index=False).to_numpy()
+    except TypeError:
+        # Unhashable values (lists, dicts in cells) can't be fingerprinted
+        return _profile_column(series, col_name, total_rows, top_n=top_n, deferred=deferred,
+                               kernel_timer=kernel_timer), False
+
+    column_hashes[col_name] = value_hashes
+    digest = hashlib.blake2b(value_hashes.tobytes(), digest_size=32)
+    digest.update(f"{PROFILER_VERSION}|{series.dtype}|{index_fingerprint}|{total_rows}|{top_n}|"
+                  f"{','.join(sorted(deferred))}".encode("utf-8"))
+    cache_key = "column-" + digest.hexdigest()
+
+    with timer("column_cache.get"):
+        col_profile = column_cache.get(cache_key)
+    if col_profile is None:
+        col_profile = _profile_column(series, col_name, total_rows, top_n=top_n, deferred=deferred,
+                                      kernel_timer=kernel_timer)
+        with timer("column_cache.put"):
+            column_cache.put(cache_key, col_profile)
+        return col_profile, False
+
+    if col_profile["datetime_stats"] is not None:
+        # Future dates are relative to now, so refresh them on reuse
+        with timer("_compute_datetime_stats"):
+            col_profile["datetime_stats"] = _compute_datetime_stats(series, col_profile["evidence"])
+    return col_profile, True
+
+
+def _profile_column(series: pd.Series, col_name: str, total_rows: int, top_n: int = 5,
+                    deferred: tuple = (), kernel_timer=None) -> dict:
+    """
+    Profile a single column and return its metadata, skipping any `deferred` sections.
+
+    A `kernel_timer` (_KernelTimer) records the time spent in each kernel that ran.
+    """
+    timer = kernel_timer or _untimed
+
+    pandas_dtype = str(series.dtype)
+    evidence = {}
+    with timer("null_count"):
+        null_mask = series.isna()
+        null_count = int(null_mask.sum())
+        non_null_count = len(series) - null_count
+        _record_evidence(evidence, "null", series, null_mask)
+    missing_pct = (null_count / total_rows * 100) if total_rows > 0 else 0.0
+    with timer("nunique"):
+        unique_count = int(series.nunique(dropna=True))
+
+    # Object columns holding numbers stored as text are profiled on their coerced values
+    numeric_values = series
+    numeric_coercion = None
+    if pandas_dtype == 'object':
+        with timer("_coerce_numeric_strings"):
+            numeric_coercion, coerced = _coerce_numeric_strings(series, evidence=evidence)
+        if coerced is not None:
+            numeric_values = coerced
+
+    # Infer high-level type
+    with timer("_infer_type"):
+        inferred_type = _infer_type(numeric_values, unique_count, total_rows)
+
+    # Get top values
+    with timer("_get_top_values"):
+        top_values = _get_top_values(series, n=top_n)
+
+    # Type-specific sections; expensive ones may be deferred
+    col_profile = {
         "pandas_dtype": pandas_dtype,
         "inferred_type": inferred_type,
         "non_null_count": non_null_count,
@@ -105,13 +1006,102 @@ def _profile_column(series: pd.Series, col_name: str, total_rows: int) -> dict:
         "missing_pct": round(missing_pct, 2),
         "unique_count": unique_count,
         "top_values": top_values,
-        "numeric_stats": numeric_stats,
-        "datetime_stats": datetime_stats,
-        "string_quality": string_quality,
-        "mixed_types_info": mixed_types_info,
+        "numeric_stats": None,
+        "datetime_stats": None,
+        "string_quality": None,
+        "mixed_types_info": None,
+        "numeric_coercion": numeric_coercion,
+        "evidence": evidence,
         "quality_flags": []
     }
 
+    if inferred_type == "numeric":
+        with timer("_compute_numeric_stats"):
+            numeric_stats = _compute_numeric_stats(numeric_values, evidence)
+        col_profile["numeric_stats"] = numeric_stats
+
+    pending = _applicable_sections(col_profile)
+    compute_deferred_sections(col_profile, series, sections=[section for section in pending if section not in deferred],
+                              kernel_timer=kernel_timer)
+    skipped = [section for section in pending if section in deferred]
+    if skipped:
+        col_profile["deferred_sections"] = skipped
+
+    return col_profile
+
+
+def _applicable_sections(col_profile: dict) -> list:
+    """Expensive sections (DEFERRABLE_SECTIONS) that apply to a column, in computation order."""
+    sections = []
+    is_object = col_profile["pandas_dtype"] == 'object'
+
+    # Check for mixed types in object columns
+    if is_object:
+        sections.append("mixed_types_info")
+    if col_profile["inferred_type"] == "datetime":
+        sections.append("datetime_stats")
+    # Analyze string quality for text/categorical columns
+    if col_profile["inferred_type"] in ["text", "categorical"] and is_object:
+        sections.append("string_quality")
+    return sections
+
+
+def compute_deferred_sections(col_profile: dict, series: pd.Series, sections: list = None,
+                              kernel_timer=None, confidence_intervals: bool = False) -> dict:
+    """
+    Compute expensive column sections, recording their evidence, in place.
+
+    Args:
+        col_profile: Column profile from profile_dataframe
+        series: The column data it was profiled from
+        sections: Sections to compute (defaults to the column's "deferred_sections")
+        kernel_timer: _KernelTimer recording the kernels that ran
+        confidence_intervals: Add the `<name>_ci` intervals of a sampled profile,
+            with `series` being the sampled rows
+
+    Returns:
+        The updated column profile
+    """
+    timer = kernel_timer or _untimed
+    if sections is None:
+        sections = col_profile.get("deferred_sections", [])
+
+    evidence = col_profile["evidence"]
+    for section in sections:
+        if section == "mixed_types_info":
+            with timer("_detect_mixed_types"):
+                col_profile["mixed_types_info"] = _detect_mixed_types(series, evidence=evidence)
+        elif section == "datetime_stats":
+            with timer("_compute_datetime_stats"):
+                col_profile["datetime_stats"] = _compute_datetime_stats(series, evidence)
+        elif section == "string_quality":
+            with timer("_analyze_string_quality"):
+                col_profile["string_quality"] = _analyze_string_quality(series, evidence=evidence)
+        if confidence_intervals:
+            _add_section_intervals(col_profile, section, len(series))
+
+    if "deferred_sections" in col_profile:
+        remaining = [section for section in col_profile["deferred_sections"] if section not in sections]
+        if remaining:
+            col_profile["deferred_sections"] = remaining
+        else:
+            del col_profile["deferred_sections"]
+
+    return col_profile
+
+
+def complete_deferred_sections(profile: dict, df: pd.DataFrame) -> dict:
+    """
+    Compute every deferred column section of a lazy profile in place (e.g. before export).
+
+    `df` holds the rows that were profiled: the sample, for a sampled profile.
+    """
+    sampled = "sampling" in profile["dataset"]
+    for col_name, col_profile in profile["columns"].items():
+        if col_profile.get("deferred_sections"):
+            compute_deferred_sections(col_profile, df[col_name], confidence_intervals=sampled)
+    return profile
+
 
 def _infer_type(series: pd.Series, unique_count: int, total_rows: int) -> str:
     """
@@ -152,6 +1142,83 @@ def _infer_type(series: pd.Series, unique_count: int, total_rows: int) -> str:
     return "unknown"
 
 
+def _parse_numeric_text(values: pd.Series):
+    """
+    `pd.to_numeric(errors='coerce')` that also reads numbers formatted for people.
+
+    Values that do not parse as they are get a second, vectorised attempt after
+    stripping whitespace and a leading currency symbol, and removing comma
+    thousands separators when the digits are grouped correctly ("$1,234.50").
+    Anything else ("12abc", "1,2,3", "1.234,5") still fails to parse.
+
+    Returns:
+        Float Series with NaN where values are missing or do not parse, or None
+        if the values are booleans or not numeric at all
+    """
+    parsed = pd.to_numeric(values, errors='coerce')
+    if not pd.api.types.is_numeric_dtype(parsed) or pd.api.types.is_bool_dtype(parsed):
+        return None
+    parsed = parsed.astype('float64')
+
+    retry = values.notna() & parsed.isna()
+    if retry.any():
+        text = values[retry].astype(str).str.strip().str.replace(CURRENCY_PREFIX_PATTERN, r'\1', regex=True)
+        grouped = text.str.fullmatch(THOUSANDS_GROUPED_PATTERN)
+        text = text.mask(grouped, text.str.replace(',', '', regex=False))
+        parsed[retry] = pd.to_numeric(text, errors='coerce').astype('float64')
+    return parsed
+
+
+def _coerce_numeric_strings(series: pd.Series, min_success_rate: float = 0.9, max_sample: int = 1000,
+                            evidence: dict = None) -> tuple:
+    """
+    Check if an object column holds numbers stored as text and coerce it.
+
+    A sample of up to `max_sample` non-null values is probed first; if enough of
+    them parse (see _parse_numeric_text for the formats read), the whole column
+    is coerced and the success rate confirmed on every non-null value. Values
+    that do not parse are recorded into `evidence`.
+
+    Args:
+        series: Pandas Series to analyze
+        min_success_rate: Minimum fraction of non-null values that must parse
+        max_sample: Maximum values probed before coercing the full column
+        evidence: Evidence dict to record non-parsing values into
+
+    Returns:
+        (coercion info dict, coerced float Series), or (None, None) if the column is not numeric
+    """
+    non_null = series.dropna()
+    if len(non_null) == 0:
+        return None, None
+
+    # Cheap probe on a sample before touching the full column
+    sample = non_null if len(non_null) <= max_sample else non_null.sample(n=max_sample, random_state=42)
+    probe = _parse_numeric_text(sample)
+    if probe is None or probe.notna().mean() < min_success_rate:
+        return None, None
+
+    # Confirm on the full column
+    coerced = _parse_numeric_text(series)
+    if coerced is None:
+        return None, None
+
+    unparsed_mask = series.notna() & coerced.isna()
+    unparsed_count = int(unparsed_mask.sum())
+    if (len(non_null) - unparsed_count) / len(non_null) < min_success_rate:
+        return None, None
+
+    _record_evidence(evidence, "non_numeric", series, unparsed_mask)
+    unparsed_values = series[unparsed_mask].astype(str).value_counts().index[:5].tolist()
+
+    return {
+        "parsed_count": len(non_null) - unparsed_count,
+        "unparsed_count": unparsed_count,
+        "unparsed_pct": round(unparsed_count / len(non_null) * 100, 2),
+        "unparsed_values": unparsed_values,
+    }, coerced
+
+
 def _is_datetime_column(series: pd.Series) -> bool:
     """
     Check if an object column contains datetime strings.
@@ -195,9 +1262,11 @@ def _get_top_values(series: pd.Series, n: int = 5) -> list:
     return top_values
 
 
-def _compute_numeric_stats(series: pd.Series) -> dict:
+def _compute_numeric_stats(series: pd.Series, evidence: dict = None) -> dict:
     """
     Compute statistics for numeric columns.
+
+    Zero and negative value evidence is recorded into `evidence` if provided.
     """
     try:
         stats = series.describe()
@@ -205,10 +1274,14 @@ def _compute_numeric_stats(series: pd.Series) -> dict:
 
         # Distribution pattern metrics
         skewness = series.skew()
-        zero_count = int((series == 0).sum())
+        zero_mask = series == 0
+        zero_count = int(zero_mask.sum())
         zero_pct = (zero_count / len(series)) * 100 if len(series) > 0 else 0.0
-        negative_count = int((series < 0).sum())
+        negative_mask = series < 0
+        negative_count = int(negative_mask.sum())
         negative_pct = (negative_count / len(series)) * 100 if len(series) > 0 else 0.0
+        _record_evidence(evidence, "zero", series, zero_mask)
+        _record_evidence(evidence, "negative", series, negative_mask)
 
         return {
             "min": float(series.min()) if pd.notna(series.min()) else None,
@@ -229,9 +1302,11 @@ def _compute_numeric_stats(series: pd.Series) -> dict:
         return None
 
 
-def _compute_datetime_stats(series: pd.Series) -> dict:
+def _compute_datetime_stats(series: pd.Series, evidence: dict = None) -> dict:
     """
     Compute statistics for datetime columns.
+
+    Future date evidence is recorded into `evidence` if provided.
     """
     try:
         # For object columns detected as datetime, convert first
@@ -247,6 +1322,7 @@ def _compute_datetime_stats(series: pd.Series) -> dict:
         future_count = int(future_mask.sum())
         future_pct = (future_count / len(series)) * 100 if len(series) > 0 else 0.0
         max_future_date = series[future_mask].max() if future_count > 0 else None
+        _record_evidence(evidence, "future_date", series, future_mask)
 
         return {
             "min": min_date.isoformat() if pd.notna(min_date) else None,
@@ -259,53 +1335,127 @@ def _compute_datetime_stats(series: pd.Series) -> dict:
         return None
 
 
-def _detect_mixed_types(series: pd.Series) -> dict:
+# pd.api.types.infer_dtype results that mean every value has the same kind of Python type
+HOMOGENEOUS_INFERRED_TYPES = {
+    'string', 'bytes', 'integer', 'floating', 'decimal', 'complex', 'boolean',
+    'datetime64', 'datetime', 'date', 'timedelta64', 'timedelta', 'time', 'period', 'interval',
+}
+
+
+def _detect_mixed_types(series: pd.Series, block_size: int = 65536, max_examples: int = 5,
+                        evidence: dict = None) -> dict:
     """
     Detect if an object column contains mixed Python types.
-    Sample up to 100 non-null values for performance.
+
+    Builds an exact type histogram over every non-null value. Blocks that
+    pd.api.types.infer_dtype reports as homogeneous are counted in bulk; only
+    mixed blocks are mapped value by value to their type.
+
+    Args:
+        series: Pandas Series to analyze
+        block_size: Number of values inspected per infer_dtype call
+        max_examples: Maximum example rows to keep per type
+        evidence: Evidence dict to record minority-type rows into
 
     Returns dict with:
     - has_mixed_types: bool
     - type_counts: dict of type_name -> count
     - mixed_type_pct: percentage of minority types
+    - type_examples: dict of type_name -> example rows
     """
     non_null_values = series.dropna()
-    if len(non_null_values) == 0:
-        return {"has_mixed_types": False, "type_counts": {}, "mixed_type_pct": 0.0}
+    total_values = len(non_null_values)
+    if total_values == 0:
+        return {"has_mixed_types": False, "type_counts": {}, "mixed_type_pct": 0.0, "type_examples": {}}
 
-    # Sample up to 100 values
-    sample = non_null_values.head(100)
-
-    # Count types
     type_counts = {}
-    for val in sample:
-        type_name = type(val).__name__
-        type_counts[type_name] = type_counts.get(type_name, 0) + 1
+    type_positions = {}
+
+    def _add_type(type_name, count, positions):
+        type_counts[type_name] = type_counts.get(type_name, 0) + int(count)
+        kept = type_positions.setdefault(type_name, [])
+        if len(kept) < max_examples:
+            kept.extend(int(p) for p in positions[:max_examples - len(kept)])
+
+    # A homogeneous column needs a single pass, otherwise histogram block by block
+    whole_column_type = pd.api.types.infer_dtype(non_null_values, skipna=True)
+    step = total_values if whole_column_type in HOMOGENEOUS_INFERRED_TYPES else block_size
+
+    for start in range(0, total_values, step):
+        block = non_null_values.iloc[start:start + step]
+        if start == 0 and step == total_values:
+            block_type = whole_column_type
+        else:
+            block_type = pd.api.types.infer_dtype(block, skipna=True)
+
+        if block_type in HOMOGENEOUS_INFERRED_TYPES:
+            _add_type(type(block.iat[0]).__name__, len(block), np.arange(start, start + min(max_examples, len(block))))
+            continue
+
+        # Mixed block: map each value to its type code and histogram the codes
+        type_codes = block.map(type).to_numpy()
+        codes, uniques = pd.factorize(type_codes)
+        for code, value_type in enumerate(uniques):
+            positions = np.flatnonzero(codes == code)
+            _add_type(value_type.__name__, len(positions), start + positions)
 
     # Check if mixed
     has_mixed_types = len(type_counts) > 1
 
     # Calculate percentage of minority types
     mixed_type_pct = 0.0
-    if has_mixed_types and len(sample) > 0:
-        majority_count = max(type_counts.values())
-        minority_count = len(sample) - majority_count
-        mixed_type_pct = (minority_count / len(sample)) * 100
+    majority_type = max(type_counts, key=type_counts.get)
+    minority_count = total_values - type_counts[majority_type]
+    if has_mixed_types:
+        mixed_type_pct = (minority_count / total_values) * 100
+
+    if pd.api.types.is_integer_dtype(non_null_values.index.dtype):
+        row_numbers = non_null_values.index
+    else:
+        # Labels that are not row numbers (strings, dates): number rows by position instead
+        row_numbers = np.flatnonzero(series.notna().to_numpy())
+
+    def _examples(positions):
+        return [
+            {
+                "row_number": int(row_numbers[p]),
+                "value": str(non_null_values.iat[p]),
+            }
+            for p in positions
+        ]
+
+    if evidence is not None:
+        minority_positions = sorted(
+            p for type_name, positions in type_positions.items() if type_name != majority_type
+            for p in positions
+        )
+        evidence["mixed_types"] = {
+            "count": minority_count,
+            "examples": _examples(minority_positions[:max_examples]),
+        }
 
     return {
         "has_mixed_types": has_mixed_types,
         "type_counts": type_counts,
-        "mixed_type_pct": round(mixed_type_pct, 2)
+        "mixed_type_pct": round(mixed_type_pct, 2),
+        "type_examples": {
+            type_name: _examples(positions) for type_name, positions in type_positions.items()
+        },
     }
 
 
-def _analyze_string_quality(series: pd.Series, max_sample: int = 1000) -> dict:
+def _analyze_string_quality(series: pd.Series, evidence: dict = None) -> dict:
     """
     Analyze string quality issues for text/categorical columns.
 
+    Every check runs on every non-null value, the same as the incremental
+    profile state, so full and chunked profiles agree. Whitespace and placeholder
+    matches are recorded into `evidence` if provided. Casing and special
+    character checks run once per distinct value.
+
     Args:
         series: Pandas Series to analyze
-        max_sample: Maximum rows to sample (for performance on large datasets)
+        evidence: Evidence dict to record whitespace/placeholder matches into
 
     Returns:
         dict with string quality metrics, or None if not object dtype
@@ -327,42 +1477,37 @@ def _analyze_string_quality(series: pd.Series, max_sample: int = 1000) -> dict:
             "casing_groups": 0,
             "special_char_count": 0,
             "special_char_pct": 0.0,
+            "special_char_checked": 0,
         }
 
-    # Sample for performance
-    sample = non_null if len(non_null) <= max_sample else non_null.sample(n=max_sample, random_state=42)
-    total_analyzed = len(sample)
-    str_series = sample.astype(str)
+    total_non_null = len(non_null)
+    full_str_series = non_null.astype(str)
 
     # 1. WHITESPACE: Leading/trailing spaces
-    whitespace_mask = str_series.str.len() != str_series.str.strip().str.len()
+    stripped = full_str_series.str.strip()
+    whitespace_mask = full_str_series.str.len() != stripped.str.len()
     whitespace_count = int(whitespace_mask.sum())
-    whitespace_pct = (whitespace_count / total_analyzed * 100) if total_analyzed > 0 else 0.0
+    whitespace_pct = (whitespace_count / total_non_null * 100) if total_non_null > 0 else 0.0
+    _record_evidence(evidence, "whitespace", non_null, whitespace_mask)
 
     # 2. PLACEHOLDERS: Common placeholder values
-    lower_stripped = str_series.str.lower().str.strip()
+    lower_stripped = stripped.str.lower()
     placeholder_mask = lower_stripped.isin(COMMON_PLACEHOLDERS)
     placeholder_count = int(placeholder_mask.sum())
-    placeholder_pct = (placeholder_count / total_analyzed * 100) if total_analyzed > 0 else 0.0
+    placeholder_pct = (placeholder_count / total_non_null * 100) if total_non_null > 0 else 0.0
     placeholder_values = lower_stripped[placeholder_mask].unique().tolist()[:5]
+    _record_evidence(evidence, "placeholder", non_null, placeholder_mask)
 
-    # 3. CASING ISSUES: Same value with different cases
-    lowercased = str_series.str.lower()
-    value_counts = lowercased.value_counts()
-    casing_issues = False
-    casing_groups = 0
+    codes, uniques = pd.factorize(full_str_series)
+    unique_values = pd.Series(uniques)
 
-    for lower_val in value_counts.index:
-        matches = str_series[lowercased == lower_val].unique()
-        if len(matches) > 1:
-            casing_issues = True
-            casing_groups += 1
+    # 3. CASING ISSUES: Same value with different cases
+    casing_groups = int((unique_values.groupby(unique_values.str.lower()).size() > 1).sum())
+    casing_issues = casing_groups > 0
 
     # 4. SPECIAL CHARACTERS: Non-printable characters
-    printable = set(string.printable)
-    special_char_mask = str_series.apply(lambda s: any(c not in printable for c in str(s)))
-    special_char_count = int(special_char_mask.sum())
-    special_char_pct = (special_char_count / total_analyzed * 100) if total_analyzed > 0 else 0.0
+    special_char_count = int(unique_values.str.contains(SPECIAL_CHAR_PATTERN, regex=True).to_numpy()[codes].sum())
+    special_char_pct = (special_char_count / total_non_null * 100) if total_non_null > 0 else 0.0
 
     return {
         "whitespace_count": whitespace_count,
@@ -374,6 +1519,7 @@ def _analyze_string_quality(series: pd.Series, max_sample: int = 1000) -> dict:
         "casing_groups": casing_groups,
         "special_char_count": special_char_count,
         "special_char_pct": round(special_char_pct, 2),
+        "special_char_checked": total_non_null,
     }
 
 
@@ -407,82 +1553,87 @@ def _collect_examples(series: pd.Series, condition_mask: pd.Series, max_examples
     return examples
 
 
-def _add_examples_to_flags(flags: list, series: pd.Series, col_profile: dict) -> list:
+# Evidence recorded during profiling that backs each row-level quality flag
+FLAG_EVIDENCE_KEYS = {
+    "HIGH_MISSING": "null",
+    "WHITESPACE_ISSUES": "whitespace",
+    "PLACEHOLDER_VALUES": "placeholder",
+    "CONTAINS_NEGATIVES": "negative",
+    "CONTAINS_ZEROS": "zero",
+    "FUTURE_DATES": "future_date",
+    "MIXED_TYPES": "mixed_types",
+    "NON_NUMERIC_VALUES": "non_numeric",
+}
+
+
+def _record_evidence(evidence: dict, key: str, series: pd.Series, condition_mask: pd.Series,
+                     max_examples: int = 5) -> None:
+    """
+    Record the exact match count and the first matching examples for a check.
+
+    Args:
+        evidence: Evidence dict to update (no-op if None)
+        key: Name of the check (e.g. "whitespace")
+        series: The data the mask was computed on
+        condition_mask: Boolean mask indicating which values match the check
+        max_examples: Maximum number of examples to keep
+    """
+    if evidence is None:
+        return
+
+    count = int(condition_mask.sum())
+    evidence[key] = {
+        "count": count,
+        "examples": _collect_examples(series, condition_mask, max_examples=max_examples) if count > 0 else [],
+    }
+
+
+def _flag_count(flag_code: str, col_profile: dict):
+    """
+    Count for flags that are not backed by row-level evidence, or None if not applicable.
+    """
+    string_quality = col_profile.get("string_quality") or {}
+
+    if flag_code == "CONSTANT_COLUMN":
+        return col_profile["non_null_count"]
+    if flag_code == "DOMINANT_VALUE" and col_profile["top_values"]:
+        return col_profile["top_values"][0]["count"]
+    if flag_code in ("HIGH_CARDINALITY_CATEGORICAL", "POTENTIAL_ID_COLUMN"):
+        return col_profile["unique_count"]
+    if flag_code == "INCONSISTENT_CASING":
+        return string_quality.get("casing_groups")
+    if flag_code == "SPECIAL_CHARACTERS":
+        return string_quality.get("special_char_count")
+
+    return None
+
+
+def _add_examples_to_flags(flags: list, col_profile: dict) -> list:
     """
     Add example data to quality flags.
 
+    Counts and examples are looked up from the evidence recorded while the
+    column was profiled, so the column data is not scanned again.
+
     Args:
         flags: List of flag dicts (without examples)
-        series: The actual column data
         col_profile: The column profile dict
 
     Returns:
         Enhanced flags with examples and count added
     """
+    evidence = col_profile.get("evidence") or {}
     enhanced_flags = []
 
     for flag in flags:
-        flag_code = flag["code"]
         enhanced_flag = flag.copy()
+        flag_evidence = evidence.get(FLAG_EVIDENCE_KEYS.get(flag["code"]))
 
-        # Always add count from existing flag data or calculate
-        if flag_code == "HIGH_MISSING":
-            null_mask = series.isna()
-            enhanced_flag["count"] = int(null_mask.sum())
-            enhanced_flag["examples"] = _collect_examples(series, null_mask, max_examples=5)
-
-        elif flag_code == "WHITESPACE_ISSUES":
-            if series.dtype == 'object':
-                str_series = series.astype(str)
-                ws_mask = str_series.str.len() != str_series.str.strip().str.len()
-                enhanced_flag["count"] = int(ws_mask.sum())
-                enhanced_flag["examples"] = _collect_examples(series, ws_mask, max_examples=5)
-
-        elif flag_code == "PLACEHOLDER_VALUES":
-            if series.dtype == 'object':
-                str_series = series.astype(str)
-                lower_stripped = str_series.str.lower().str.strip()
-                ph_mask = lower_stripped.isin(COMMON_PLACEHOLDERS)
-                enhanced_flag["count"] = int(ph_mask.sum())
-                enhanced_flag["examples"] = _collect_examples(series, ph_mask, max_examples=5)
-
-        elif flag_code == "CONTAINS_NEGATIVES":
-            try:
-                neg_mask = series < 0
-                enhanced_flag["count"] = int(neg_mask.sum())
-                enhanced_flag["examples"] = _collect_examples(series, neg_mask, max_examples=5)
-            except TypeError:
-                pass
-
-        elif flag_code == "CONTAINS_ZEROS":
-            try:
-                zero_mask = series == 0
-                enhanced_flag["count"] = int(zero_mask.sum())
-                enhanced_flag["examples"] = _collect_examples(series, zero_mask, max_examples=5)
-            except TypeError:
-                pass
-
-        elif flag_code == "FUTURE_DATES":
-            try:
-                if pd.api.types.is_datetime64_any_dtype(series):
-                    test_series = series
-                elif series.dtype == 'object':
-                    test_series = pd.to_datetime(series, errors='coerce')
-                else:
-                    test_series = series
-
-                current_date = pd.Timestamp.now()
-                future_mask = test_series > current_date
-                enhanced_flag["count"] = int(future_mask.sum())
-                enhanced_flag["examples"] = _collect_examples(test_series, future_mask, max_examples=5)
-            except Exception:
-                pass
-
-        # Other flags: keep as-is (with count from col_profile if available)
-        if "count" not in enhanced_flag:
-            enhanced_flag["count"] = col_profile.get("null_count", 0)  # Default fallback
-
-        if "examples" not in enhanced_flag:
+        if flag_evidence is not None:
+            enhanced_flag["count"] = flag_evidence["count"]
+            enhanced_flag["examples"] = flag_evidence["examples"]
+        else:
+            enhanced_flag["count"] = _flag_count(flag["code"], col_profile)
             enhanced_flag["examples"] = []
 
         enhanced_flags.append(enhanced_flag)
@@ -490,6 +1641,25 @@ def _add_examples_to_flags(flags: list, series: pd.Series, col_profile: dict) ->
     return enhanced_flags
 
 
+def apply_quality_flags(profile: dict, null_threshold: float, top_n: int) -> dict:
+    """
+    Trim top values and attach quality flags to a cached profile.
+
+    Only reads the profile, so it is cheap to rerun whenever a setting changes.
+    Modifies the profile in place and returns it.
+    """
+    for col_name, col_profile in profile["columns"].items():
+        col_profile["top_values"] = col_profile["top_values"][:top_n]
+
+        # Generate base flags (without examples)
+        flags = generate_quality_flags(col_name, col_profile, profile["dataset"]["n_rows"], null_threshold)
+
+        # Add examples to flags from the evidence recorded during profiling
+        col_profile["quality_flags"] = _add_examples_to_flags(flags, col_profile)
+
+    return profile
+
+
 def _analyze_duplicates(df: pd.DataFrame, max_duplicate_sets: int = 5, max_indices_per_set: int = 3) -> dict:
     """
     Analyze exact duplicate rows in the dataset.
@@ -569,3 +1739,292 @@ def _analyze_duplicates(df: pd.DataFrame, max_duplicate_sets: int = 5, max_indic
             "duplicate_sets": [],
             "error": "Unable to detect duplicates (unhashable column types present)"
         }
+
+
+
+def _discover_candidate_keys(df: pd.DataFrame, column_profiles: dict, duplicate_analysis: dict,
+                             max_width: int = 2, max_candidates: int = 1000,
+                             column_hashes: dict = None, deadline: float = None,
+                             estimated_columns: set = None) -> dict:
+    """
+    Discover minimal unique column combinations (candidate keys).
+
+    Single-column keys come straight from the profiled unique counts (counted
+    exactly from row hashes where the profile only has an estimate). Wider
+    combinations are pruned when a subset is already a key or when the product
+    of the columns' distinct counts cannot reach the row count, and the remaining
+    candidates are tested on combined per-column row hashes.
+
+    Args:
+        df: The DataFrame to analyze
+        column_profiles: The 'columns' section of the profile dict
+        duplicate_analysis: Result of _analyze_duplicates for the same DataFrame
+        max_width: Maximum number of columns in a key
+        max_candidates: Maximum number of multi-column candidates to test
+        column_hashes: Per-row value hashes already computed, by column name
+        deadline: time.perf_counter() value after which the search stops (sets "timed_out")
+        estimated_columns: Columns whose unique counts are estimated from a sample
+            (time-budgeted runs); a column not counted before the deadline is left out
+
+    Returns:
+        dict with discovered keys and search statistics
+    """
+    total_rows = len(df)
+    result = {
+        "max_width": max_width,
+        "keys": [],
+        "candidates_checked": 0,
+        "truncated": False,
+    }
+
+    if total_rows == 0 or max_width < 1:
+        return result
+
+    # No column combination can be unique if whole rows repeat
+    if duplicate_analysis.get("duplicate_rows", 0) != 0:
+        if duplicate_analysis.get("duplicate_rows") == -1:
+            result["error"] = duplicate_analysis.get("error", "Unable to detect candidate keys")
+        return result
+
+    # Distinct counts including null, which drop_duplicates treats as a value
+    distinct_counts = {}
+    for col_name, col_profile in column_profiles.items():
+        distinct = col_profile["unique_count"] + (1 if col_profile["null_count"] > 0 else 0)
+        # Constant columns never belong to a minimal key
+        if distinct > 1:
+            distinct_counts[col_name] = distinct
+
+    column_hashes = column_hashes if column_hashes is not None else {}
+    estimated_columns = estimated_columns or set()
+
+    def _hash_column(col_name):
+        if col_name not in column_hashes:
+            column_hashes[col_name] = pd.util.hash_pandas_object(df[col_name], index=False).to_numpy()
+        return column_hashes[col_name]
+
+    try:
+        # Estimated counts can neither prove a key nor prune one; count those columns exactly
+        for col_name in [c for c in distinct_counts if c in estimated_columns]:
+            if deadline is not None and time.perf_counter() > deadline:
+                del distinct_counts[col_name]
+                result["truncated"] = True
+                result["timed_out"] = True
+                continue
+            distinct_counts[col_name] = len(pd.unique(_hash_column(col_name)))
+
+        keys = [(col_name,) for col_name, distinct in distinct_counts.items() if distinct == total_rows]
+        remaining = [col_name for col_name in distinct_counts if distinct_counts[col_name] < total_rows]
+
+        for width in range(2, max_width + 1):
+            for combo in combinations(remaining, width):
+                # Supersets of a key are not minimal
+                if any(set(key).issubset(combo) for key in keys):
+                    continue
+
+                # Too few distinct value combinations to cover every row
+                if np.prod([float(distinct_counts[c]) for c in combo]) < total_rows:
+                    continue
+
+                if result["candidates_checked"] >= max_candidates:
+                    result["truncated"] = True
+                    break
+
+                if deadline is not None and time.perf_counter() > deadline:
+                    result["truncated"] = True
+                    result["timed_out"] = True
+                    break
+
+                result["candidates_checked"] += 1
+                combined = _combine_hashes([_hash_column(col_name) for col_name in combo])
+
+                if len(pd.unique(combined)) == total_rows:
+                    keys.append(combo)
+
+            if result["truncated"]:
+                break
+
+    except TypeError:
+        # Handle unhashable types (lists, dicts in cells)
+        result["error"] = "Unable to detect candidate keys (unhashable column types present)"
+
+    result["keys"] = [list(key) for key in keys]
+    return result
+
+
+def _combine_hashes(hash_arrays: list) -> np.ndarray:
+    """Combine per-column uint64 row hashes into one hash per row (FNV-style)."""
+    combined = hash_arrays[0].copy()
+    for hashes in hash_arrays[1:]:
+        combined = combined * np.uint64(0x100000001B3) ^ hashes
+    return combined
+
+
+def _near_duplicate_tokens(rows: pd.DataFrame, columns: list) -> np.ndarray:
+    """
+    One 64-bit hash per (column, normalised value) of each row, for _analyze_near_duplicates.
+
+    A value hashes the same in every block of rows, so blocks can be tokenised separately.
+    """
+    token_hashes = np.empty((len(rows), len(columns)), dtype=np.uint64)
+    for position, col_name in enumerate(columns):
+        # Normalise and hash each distinct value once, then broadcast to rows
+        codes, uniques = pd.factorize(rows[col_name], use_na_sentinel=False)
+        uniques = pd.Series(uniques)
+        if uniques.dtype == 'object':
+            uniques = uniques.astype(str).str.strip().str.lower().where(uniques.notna(), None)
+        unique_hashes = pd.util.hash_pandas_object(uniques, index=False, hash_key=f"{position:016d}").to_numpy()
+        token_hashes[:, position] = unique_hashes[codes]
+    return token_hashes
+
+
+def _analyze_near_duplicates(df: pd.DataFrame, exclude_columns: list = None, num_perm: int = 64,
+                             bands: int = 16, similarity_threshold: float = 0.8,
+                             max_clusters: int = 5, max_indices_per_cluster: int = 5,
+                             random_state: int = 42, max_rows: int = NEAR_DUPLICATE_MAX_ROWS) -> dict:
+    """
+    Find clusters of near-duplicate rows with MinHash and locality-sensitive hashing.
+
+    Each row is treated as the set of its (column, normalised value) tokens, with
+    text stripped and lowercased. MinHash signatures estimate the Jaccard similarity
+    between rows, and rows sharing an LSH band bucket are compared only with that
+    bucket's first row, so no pairwise comparison over the whole dataset is needed.
+    Clusters made only of exact duplicates are left to _analyze_duplicates.
+
+    Tokens and signatures are computed in row blocks, and frames longer than
+    `max_rows` are analysed on a reproducible uniform sample of that many rows,
+    so memory stays bounded. A sampled result has scope "sample": its counts
+    describe the sample and miss pairs that were not both drawn.
+
+    Args:
+        df: The DataFrame to analyze
+        exclude_columns: Columns ignored when comparing rows (e.g. timestamps)
+        num_perm: Number of MinHash permutations per signature
+        bands: Number of LSH bands (num_perm must be divisible by bands)
+        similarity_threshold: Minimum estimated Jaccard similarity to link two rows
+        max_clusters: Maximum number of clusters to return
+        max_indices_per_cluster: Maximum example row indices to store per cluster
+        random_state: Seed for the MinHash permutations and the row sample
+        max_rows: Maximum number of rows compared
+
+    Returns:
+        dict with near-duplicate cluster results
+    """
+    exclude_columns = set(exclude_columns or [])
+    columns = [col_name for col_name in df.columns if col_name not in exclude_columns]
+    total_rows = len(df)
+
+    result = {
+        "similarity_threshold": similarity_threshold,
+        "num_perm": num_perm,
+        "bands": bands,
+        "excluded_columns": [str(col_name) for col_name in df.columns if col_name in exclude_columns],
+        "cluster_count": 0,
+        "near_duplicate_rows": 0,
+        "clusters": [],
+    }
+
+    if total_rows < 2 or not columns:
+        return result
+
+    rng = np.random.default_rng(random_state)
+    if total_rows > max_rows:
+        positions = np.sort(rng.choice(total_rows, size=max_rows, replace=False))
+        df = df.iloc[positions]
+        total_rows = max_rows
+        result["sampled_rows"] = max_rows
+        result["scope"] = "sample"
+
+    # 1-2. TOKENS and SIGNATURES, one row block at a time: min over tokens of random affine maps
+    multipliers = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+    offsets = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+    signatures = np.empty((total_rows, num_perm), dtype=np.uint64)
+    block_size = 50_000
+    for start in range(0, total_rows, block_size):
+        block = _near_duplicate_tokens(df.iloc[start:start + block_size], columns)
+        permuted = np.empty_like(block)
+        for perm in range(num_perm):
+            np.multiply(block, multipliers[perm], out=permuted)
+            permuted += offsets[perm]
+            signatures[start:start + block_size, perm] = permuted.min(axis=1)
+
+    # 3. LSH: rows sharing a band bucket are linked to the bucket's first row
+    rows_per_band = num_perm // bands
+    row_ids = np.arange(total_rows)
+    edge_sources = []
+    edge_targets = []
+    for band in range(bands):
+        band_slice = signatures[:, band * rows_per_band:(band + 1) * rows_per_band]
+        bucket_keys = band_slice[:, 0].copy()
+        for column in range(1, rows_per_band):
+            bucket_keys = bucket_keys * np.uint64(0x100000001B3) ^ band_slice[:, column]
+
+        codes, uniques = pd.factorize(bucket_keys)
+        _, first_rows = np.unique(codes, return_index=True)
+        representatives = first_rows[codes]
+        candidates = row_ids != representatives
+        if not candidates.any():
+            continue
+
+        sources = row_ids[candidates]
+        targets = representatives[candidates]
+        estimated = (signatures[sources] == signatures[targets]).mean(axis=1)
+        keep = estimated >= similarity_threshold
+        edge_sources.append(sources[keep])
+        edge_targets.append(targets[keep])
+
+    if not edge_sources or sum(len(edges) for edges in edge_sources) == 0:
+        return result
+
+    # 4. CLUSTERS: connected components by min-label propagation over the edges
+    edge_sources = np.concatenate(edge_sources)
+    edge_targets = np.concatenate(edge_targets)
+    labels = row_ids.copy()
+    while True:
+        edge_labels = np.minimum(labels[edge_sources], labels[edge_targets])
+        updated = labels.copy()
+        np.minimum.at(updated, edge_sources, edge_labels)
+        np.minimum.at(updated, edge_targets, edge_labels)
+        updated = updated[updated]
+        if np.array_equal(updated, labels):
+            break
+        labels = updated
+
+    # Keep clusters that contain at least two distinct raw rows
+    try:
+        raw_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    except TypeError:
+        # Handle unhashable types (lists, dicts in cells)
+        raw_hashes = pd.util.hash_pandas_object(df.astype(str), index=False).to_numpy()
+    cluster_frame = pd.DataFrame({"label": labels, "raw": raw_hashes})
+    cluster_stats = cluster_frame.groupby("label").agg(size=("raw", "size"), distinct=("raw", "nunique"))
+    near_clusters = cluster_stats[cluster_stats["distinct"] > 1].sort_values("size", ascending=False, kind="stable")
+
+    result["cluster_count"] = int(len(near_clusters))
+    result["near_duplicate_rows"] = int((near_clusters["size"] - 1).sum())
+
+    for label in near_clusters.index[:max_clusters]:
+        members = np.flatnonzero(labels == label)
+
+        # Exact token Jaccard of each member against the representative
+        member_tokens = _near_duplicate_tokens(df.iloc[members], columns)
+        matches = (member_tokens == member_tokens[0]).sum(axis=1)
+        jaccard = matches / (2 * len(columns) - matches)
+
+        member_rows = df.iloc[members]
+        differing_columns = [
+            str(col_name) for col_name in df.columns
+            if member_rows[col_name].astype(str).nunique(dropna=False) > 1
+        ]
+
+        result["clusters"].append({
+            "row_data": {
+                k: str(v) if pd.notna(v) else "NULL"
+                for k, v in member_rows.iloc[0].to_dict().items()
+            },
+            "count": int(len(members)),
+            "similarity": round(float(jaccard[1:].min()), 3),
+            "differing_columns": differing_columns,
+            "example_indices": [int(idx) for idx in df.index[members[:max_indices_per_cluster]]],
+        })
+
+    return result
@@ -24,6 +24,7 @@ SPECIAL_CHAR_THRESHOLD = 0.5  # percentage
 # Duplicate detection thresholds
 DUPLICATE_INFO_THRESHOLD = 1.0  # percentage
 DUPLICATE_WARNING_THRESHOLD = 5.0  # percentage
+NEAR_DUPLICATE_THRESHOLD = 0  # rows in near-duplicate clusters
 
 
 def generate_quality_flags(col_name: str, col_profile: dict, total_rows: int, high_missing_threshold: float = None) -> list:
@@ -134,6 +135,16 @@ def generate_quality_flags(col_name: str, col_profile: dict, total_rows: int, hi
                 "message": f"Contains {numeric_stats['negative_count']:,} negative values ({numeric_stats['negative_pct']:.1f}%)"
             })
 
+    # NON_NUMERIC_VALUES: Numbers stored as text with values that do not parse
+    numeric_coercion = col_profile.get("numeric_coercion")
+    if numeric_coercion and numeric_coercion.get("unparsed_count", 0) > 0:
+        unparsed_list = ", ".join(numeric_coercion.get("unparsed_values", [])[:3])
+        flags.append({
+            "code": "NON_NUMERIC_VALUES",
+            "severity": "warning",
+            "message": f"Numeric column stored as text; {numeric_coercion['unparsed_count']:,} values do not parse as numbers ({numeric_coercion['unparsed_pct']:.1f}%): {unparsed_list}"
+        })
+
     # FUTURE_DATES: Any future dates
     datetime_stats = col_profile.get("datetime_stats")
     if datetime_stats and datetime_stats.get("future_count", 0) > 0:
@@ -235,4 +246,16 @@ def generate_dataset_quality_flags(dataset_profile: dict) -> list:
             "count": dup_count,
         })
 
+    # NEAR_DUPLICATE_ROWS: Flag if rows differ only slightly (whitespace, casing, timestamps)
+    near_dups = dup_analysis.get("near_duplicates") or {}
+    near_dup_rows = near_dups.get("near_duplicate_rows", 0)
+
+    if near_dup_rows > NEAR_DUPLICATE_THRESHOLD:
+        flags.append({
+            "code": "NEAR_DUPLICATE_ROWS",
+            "severity": "info",
+            "message": f"Dataset contains {near_dup_rows:,} near-duplicate rows in {near_dups['cluster_count']:,} clusters",
+            "count": near_dup_rows,
+        })
+
     return flags
@@ -0,0 +1,271 @@
+"""
+Local HTTP/JSON profiling service.
+
+An asyncio front end over a JobManager of warm worker processes:
+
+    python -m service --port 8765 --workers 4
+
+Endpoints (JSON bodies and responses):
+
+    GET    /health                 service and queue status
+    POST   /jobs                   {"path": "...", "sample_size": ..., ...} -> 202 {"job_id": ...}
+    GET    /jobs/<id>              job status with the latest progress event
+    GET    /jobs/<id>/events       progress events streamed as NDJSON until the job finishes
+    GET    /jobs/<id>/profile      the finished profile (409 while the job is still running)
+    DELETE /jobs/<id>              cancel the job
+
+The service reads files from the local disk, so it binds to 127.0.0.1 by
+default; `--root` restricts submitted paths to one directory tree.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import sys
+from urllib.parse import urlsplit
+
+from jobs import JobManager, JobQueueFull, profile_path_job
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 64 * 1024
+EVENT_POLL_SECONDS = 0.2
+
+SUPPORTED_EXTENSIONS = (".csv", ".xlsx", ".xls")
+
+
+def _boolean(value) -> bool:
+    """Strict JSON boolean (bool() would accept "false" as true)."""
+    if not isinstance(value, bool):
+        raise TypeError("expected true or false")
+    return value
+
+
+# Request fields passed through to profile_path_job, with their types
+JOB_OPTIONS = {"max_key_width": int, "sample_size": int, "time_budget": float, "null_threshold": float, "top_n": int,
+               "track_memory": _boolean, "memory_budget_mb": int, "exact_memory": _boolean}
+
+STATUS_TEXT = {200: "OK", 202: "Accepted", 400: "Bad Request", 403: "Forbidden", 404: "Not Found",
+               405: "Method Not Allowed", 409: "Conflict", 413: "Payload Too Large", 500: "Internal Server Error",
+               503: "Service Unavailable"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class ProfilingService:
+    """
+    HTTP front end for a JobManager.
+
+    Args:
+        manager: Job manager that runs profile_path_job
+        host, port: Address to listen on (port 0 picks a free port)
+        root: If set, only files inside this directory may be profiled
+        cache_dir, no_cache: Profile cache settings applied to every job
+        memory_budget_mb: Default RAM budget for jobs that do not set memory_budget_mb
+    """
+
+    def __init__(self, manager: JobManager, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, root: str = None,
+                 cache_dir: str = None, no_cache: bool = False, memory_budget_mb: int = None):
+        self.manager = manager
+        self.host = host
+        self.port = port
+        self.root = os.path.realpath(root) if root else None
+        self.default_options = {"cache_dir": cache_dir, "no_cache": no_cache, "memory_budget_mb": memory_budget_mb}
+        self._server = None
+
+    async def start(self) -> tuple:
+        """Start listening; returns the bound (host, port)."""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.host, self.port = self._server.sockets[0].getsockname()[:2]
+        return self.host, self.port
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            method, path, body = await self._read_request(reader)
+            await self._route(method, path, body, writer)
+        except HTTPError as e:
+            await self._send_json(writer, e.status, {"error": e.message})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            await self._send_json(writer, 500, {"error": str(e) or type(e).__name__})
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> tuple:
+        try:
+            method, target, _ = (await reader.readline()).decode("latin-1").split(" ", 2)
+        except ValueError:
+            raise HTTPError(400, "malformed request line")
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            raise HTTPError(400, "invalid Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(413, f"request body over {MAX_BODY_BYTES} bytes")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), urlsplit(target).path.rstrip("/") or "/", body
+
+    async def _route(self, method: str, path: str, body: bytes, writer: asyncio.StreamWriter) -> None:
+        parts = path.strip("/").split("/")
+
+        if parts == ["health"] and method == "GET":
+            return await self._send_json(writer, 200, {"status": "ok", **self.manager.stats()})
+        if parts == ["jobs"] and method == "POST":
+            return await self._submit(body, writer)
+        if len(parts) in (2, 3) and parts[0] == "jobs":
+            job = self.manager.get(parts[1])
+            if job is None:
+                raise HTTPError(404, f"unknown job {parts[1]}")
+            action = parts[2] if len(parts) == 3 else None
+            if action is None and method == "GET":
+                return await self._send_json(writer, 200, job.to_dict())
+            if action is None and method == "DELETE":
+                return await self._send_json(writer, 200, self.manager.cancel(job.id).to_dict())
+            if action == "events" and method == "GET":
+                return await self._stream_events(job, writer)
+            if action == "profile" and method == "GET":
+                return await self._send_profile(job, writer)
+            raise HTTPError(405, f"{method} not allowed on {path}")
+
+        raise HTTPError(404, f"no route for {method} {path}")
+
+    async def _submit(self, body: bytes, writer: asyncio.StreamWriter) -> None:
+        try:
+            request = json.loads(body or b"{}")
+        except ValueError:
+            raise HTTPError(400, "body must be JSON")
+        if not isinstance(request, dict) or not isinstance(request.get("path"), str):
+            raise HTTPError(400, "body must be an object with a \"path\"")
+
+        path = os.path.realpath(request["path"])
+        if self.root is not None and os.path.commonpath([self.root, path]) != self.root:
+            raise HTTPError(403, f"{request['path']} is outside the service root")
+        if not os.path.isfile(path):
+            raise HTTPError(404, f"no such file: {request['path']}")
+        if not path.lower().endswith(SUPPORTED_EXTENSIONS):
+            raise HTTPError(400, "only CSV and Excel files can be profiled")
+
+        options = dict(self.default_options)
+        for name, cast in JOB_OPTIONS.items():
+            if request.get(name) is not None:
+                try:
+                    options[name] = cast(request[name])
+                except (TypeError, ValueError):
+                    kind = "true or false" if cast is _boolean else "a number"
+                    raise HTTPError(400, f"{name} must be {kind}")
+
+        try:
+            job = self.manager.submit(profile_path_job, path, options)
+        except JobQueueFull as e:
+            raise HTTPError(503, str(e))
+        await self._send_json(writer, 202, job.to_dict())
+
+    async def _stream_events(self, job, writer: asyncio.StreamWriter) -> None:
+        writer.write(self._head(200, "application/x-ndjson"))
+        sent = 0
+        while True:
+            finished = job.finished
+            events = job.events[sent:]
+            for event in events:
+                writer.write(json.dumps(event).encode("utf-8") + b"\n")
+            sent += len(events)
+            if finished:
+                writer.write(json.dumps(job.to_dict()).encode("utf-8") + b"\n")
+                await writer.drain()
+                return
+            await writer.drain()
+            await asyncio.sleep(EVENT_POLL_SECONDS)
+
+    async def _send_profile(self, job, writer: asyncio.StreamWriter) -> None:
+        if job.status == "failed":
+            raise HTTPError(500, job.error)
+        if job.status != "done":
+            raise HTTPError(409, f"job is {job.status}")
+        # Large profiles are serialised off the event loop
+        payload = await asyncio.get_running_loop().run_in_executor(None, json.dumps, job.result)
+        await self._send(writer, 200, payload.encode("utf-8"))
+
+    def _head(self, status: int, content_type: str, length: int = None) -> bytes:
+        lines = [f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}", f"Content-Type: {content_type}",
+                 "Connection: close"]
+        if length is not None:
+            lines.append(f"Content-Length: {length}")
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+    async def _send(self, writer: asyncio.StreamWriter, status: int, payload: bytes) -> None:
+        writer.write(self._head(status, "application/json", len(payload)) + payload)
+        await writer.drain()
+
+    async def _send_json(self, writer: asyncio.StreamWriter, status: int, data: dict) -> None:
+        await self._send(writer, status, json.dumps(data).encode("utf-8"))
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m service", description="Local HTTP/JSON profiling service.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"Address to bind (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port to listen on (default: {DEFAULT_PORT})")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--max-queued", type=int, default=32, help="Jobs allowed to wait for a worker (default: 32)")
+    parser.add_argument("--root", default=None, help="Only profile files inside this directory")
+    parser.add_argument("--cache-dir", default=None, help="Profile cache directory")
+    parser.add_argument("--no-cache", action="store_true", help="Neither read nor write the profile cache")
+    parser.add_argument("--memory-budget-mb", type=int, default=None,
+                        help="Default RAM budget per job; larger files are streamed in chunks or sampled")
+    args = parser.parse_args(argv)
+
+    manager = JobManager(max_workers=args.workers, max_queued=args.max_queued)
+    service = ProfilingService(manager, args.host, args.port, root=args.root, cache_dir=args.cache_dir,
+                               no_cache=args.no_cache, memory_budget_mb=args.memory_budget_mb)
+
+    async def _serve():
+        host, port = await service.start()
+        print(f"Profiling service listening on http://{host}:{port} with {manager.max_workers} workers",
+              file=sys.stderr)
+        stop = asyncio.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                asyncio.get_running_loop().add_signal_handler(sig, stop.set)
+            except (NotImplementedError, RuntimeError):  # Windows: Ctrl+C raises KeyboardInterrupt instead
+                pass
+        await stop.wait()
+        service.close()
+
+    try:
+        asyncio.run(_serve())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        manager.shutdown(wait=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""
+Headless tests for the Streamlit app.
+
+Runs app.py under streamlit.testing's AppTest with the file uploader
+replaced by a file from test_data/, waits for the background profiling job
+and exercises reruns, the column detail view, exports and sampled mode.
+
+Run with: python -m pytest tests/test_app.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+AppTest = pytest.importorskip("streamlit.testing.v1").AppTest
+
+
+def _app_with_upload():
+    # Runs as its own script: everything it needs comes from the environment
+    import io
+    import os
+    import runpy
+    import sys
+
+    import streamlit as st
+
+    repo, path = os.environ["DATA_PROFILER_TEST_REPO"], os.environ["DATA_PROFILER_TEST_FILE"]
+    sys.path.insert(0, repo)
+
+    class Upload(io.BytesIO):
+        def __init__(self):
+            with open(path, "rb") as f:
+                super().__init__(f.read())
+            self.name = os.path.basename(path)
+            self.size = len(self.getvalue())
+            self.file_id = path
+
+    st.file_uploader = lambda *args, **kwargs: Upload()
+    runpy.run_path(os.path.join(repo, "app.py"), run_name="__main__")
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATA_PROFILER_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("DATA_PROFILER_TEST_REPO", str(REPO_ROOT))
+    monkeypatch.setenv("DATA_PROFILER_TEST_FILE", str(REPO_ROOT / "test_data" / "test_all_features.csv"))
+    monkeypatch.chdir(REPO_ROOT)
+    # AppTest leaves its temporary script as __main__; put the real one back afterwards
+    monkeypatch.setitem(sys.modules, "__main__", sys.modules["__main__"])
+
+    import streamlit as st
+    st.cache_data.clear()
+    st.cache_resource.clear()
+
+    at = AppTest.from_function(_app_with_upload, default_timeout=120)
+    at.run()
+    _wait_for_profile(at)
+    return at
+
+
+def _wait_for_profile(at) -> None:
+    deadline = time.monotonic() + 120
+    while not any("Successfully profiled" in message.value for message in at.success):
+        assert not at.exception and not at.error, [e.value for e in list(at.exception) + list(at.error)]
+        assert time.monotonic() < deadline, "profiling did not finish"
+        time.sleep(0.2)
+        at.run()
+
+
+def _problems(at) -> list:
+    return [element.value for element in list(at.exception) + list(at.error)]
+
+
+def test_rerun_after_profile(app):
+    app.sidebar.slider[0].set_value(app.sidebar.slider[0].value + 5).run()
+    assert _problems(app) == []
+    assert any("Successfully profiled" in message.value for message in app.success)
+
+
+def test_column_details(app):
+    [details] = [box for box in app.sidebar.checkbox if box.label == "Show detailed column stats"]
+    details.check().run()
+    assert _problems(app) == []
+    assert len(app.expander) > 0
+
+
+def test_exports_run_deferred_checks(app):
+    assert app.get("download_button") == []
+    assert any("Incomplete flags" in warning.value for warning in app.warning)
+
+    [prepare] = [button for button in app.button if button.label == "Prepare exports"]
+    prepare.click().run()
+    assert _problems(app) == []
+    assert len(app.get("download_button")) == 3
+    assert not any("Incomplete flags" in warning.value for warning in app.warning)
+    summary = next(frame.value for frame in app.dataframe if "Quality Flags" in frame.value.columns)
+    assert summary["Quality Flags"].str.contains("Whitespace Issues").any()
+
+
+def test_sampled_details_have_intervals(app):
+    [sampled] = [box for box in app.sidebar.checkbox if box.label.startswith("Sampled mode")]
+    sampled.check().run()
+    _wait_for_profile(app)
+    [details] = [box for box in app.sidebar.checkbox if box.label == "Show detailed column stats"]
+    details.check().run()
+    assert _problems(app) == []
+
+    # Missing % has an interval in every expander; string quality, computed on demand, adds more
+    intervals = [caption.value for caption in app.caption if caption.value.startswith("95% CI")]
+    assert len(intervals) > len([e for e in app.expander if e.label.startswith("📌")])
@@ -0,0 +1,42 @@
+"""
+Tests for batch profiling with a worker pool.
+
+Run with: python -m pytest tests/test_batch.py
+"""
+
+import json
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from batch import discover_files, run_batch, INDEX_JSON  # noqa: E402
+
+OPTIONS = {
+    "max_key_width": 2, "sample_size": None, "time_budget": None, "null_threshold": 10.0, "top_n": 5,
+    "formats": {"json"}, "cache_dir": None, "no_cache": True,
+}
+
+
+def test_failing_file_is_reported_individually(tmp_path):
+    inputs = tmp_path / "in"
+    inputs.mkdir()
+    shutil.copy(REPO_ROOT / "test_data" / "sample_data.csv", inputs / "good.csv")
+    (inputs / "bad.xlsx").write_bytes(b"not a workbook")
+
+    index = run_batch(discover_files(str(inputs)), str(tmp_path / "out"), OPTIONS, workers=1)
+
+    assert index["summary"]["succeeded"] == 1 and index["summary"]["failed"] == 1
+    failed = [result for result in index["files"] if result["status"] == "error"]
+    assert failed[0]["path"].endswith("bad.xlsx") and failed[0]["error"]
+    assert json.loads((tmp_path / "out" / INDEX_JSON).read_text())["summary"]["files"] == 2
+
+
+def test_memory_cap_too_small_to_import(tmp_path):
+    with pytest.raises(ValueError):
+        run_batch([str(REPO_ROOT / "test_data" / "sample_data.csv")], str(tmp_path), OPTIONS,
+                  memory_limit_bytes=200 * 1024 * 1024)
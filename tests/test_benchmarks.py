@@ -0,0 +1,122 @@
+"""
+Tests for the benchmark suite's data generator, baseline comparison (and
+the --check gate for a missing baseline) and accuracy metrics.
+
+The benchmarks themselves are not run here; see benchmarks/run_benchmarks.py
+and benchmarks/accuracy.py.
+
+Run with: python -m pytest tests/test_benchmarks.py
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from benchmarks.generate import generate_dataset  # noqa: E402
+from benchmarks import run_benchmarks  # noqa: E402
+from benchmarks.run_benchmarks import compare_to_baseline, missing_from_baseline, STAGES  # noqa: E402
+from benchmarks import accuracy  # noqa: E402
+from profiling import profile_dataframe  # noqa: E402
+
+
+def test_generator_knobs():
+    df = generate_dataset(10_000, 12, dtype_mix="mixed", cardinality=0.01, null_rate=0.2, duplicate_rate=0.1)
+    assert df.shape == (10_000, 12)
+    assert df.isna().mean().mean() == pytest.approx(0.2, abs=0.03)
+    assert df["int_0"].nunique() <= 100
+    # Copied rows plus the few accidental repeats of a 1% cardinality table
+    assert df.duplicated().mean() == pytest.approx(0.1, abs=0.03)
+
+    same = generate_dataset(10_000, 12, dtype_mix="mixed", cardinality=0.01, null_rate=0.2, duplicate_rate=0.1)
+    assert df.equals(same)
+
+    with pytest.raises(ValueError):
+        generate_dataset(10, 2, dtype_mix="binary")
+
+
+def _results(profile_seconds, peak_delta):
+    stages = {stage: {"seconds": 0.5} for stage in STAGES}
+    stages["profile"] = {"seconds": profile_seconds}
+    return {"cases": {"case": {"stages": stages, "peak_rss_delta_bytes": peak_delta}}}
+
+
+def test_compare_to_baseline():
+    baseline = _results(2.0, 200 * 1024 ** 2)
+
+    assert compare_to_baseline(_results(2.2, 210 * 1024 ** 2), baseline, threshold=0.25) == []
+
+    regressions = compare_to_baseline(_results(3.0, 400 * 1024 ** 2), baseline, threshold=0.25)
+    assert {r["metric"] for r in regressions} == {"profile_seconds", "peak_rss_delta_bytes"}
+    assert regressions[0]["ratio"] == 1.5
+
+    # Large ratios on tiny numbers are noise
+    assert compare_to_baseline(_results(0.02, 0), _results(0.01, 0), threshold=0.25) == []
+    # New cases have nothing to compare against
+    assert compare_to_baseline(_results(9.0, 0), {"cases": {}}) == []
+    assert missing_from_baseline(_results(9.0, 0), {"cases": {}}) == ["case"]
+    assert missing_from_baseline(_results(9.0, 0), baseline) == []
+
+
+def test_check_fails_without_baseline(tmp_path, monkeypatch):
+    def run_suite(*args, **kwargs):
+        raise AssertionError("the suite should not run without a baseline")
+
+    monkeypatch.setattr(run_benchmarks, "run_suite", run_suite)
+    assert run_benchmarks.main(["--check", "--baseline", str(tmp_path / "missing.json")]) == 1
+
+
+def test_check_fails_for_cases_missing_from_baseline(tmp_path, monkeypatch):
+    monkeypatch.setattr(run_benchmarks, "run_suite", lambda *args, **kwargs: _results(2.0, 0))
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps({"cases": {"other": {}}}))
+    args = ["--baseline", str(baseline), "--output", str(tmp_path / "results.json")]
+
+    assert run_benchmarks.main(args) == 0
+    assert run_benchmarks.main(args + ["--check"]) == 1
+
+
+def test_dirty_strings():
+    clean = generate_dataset(5_000, 4, dtype_mix="text")
+    dirty = generate_dataset(5_000, 4, dtype_mix="text", dirty_rate=0.3)
+    # Later columns draw from a generator the dirty values advanced; the first does not
+    assert (clean["category_0"] != dirty["category_0"]).mean() == pytest.approx(0.3, abs=0.05)
+    assert dirty["text_1"].str.startswith(" ").any()
+    assert dirty["category_0"].isin(["N/A", "unknown", "TBD", "null"]).any()
+
+
+def test_compare_profiles():
+    df = pd.DataFrame({
+        "amount": [float(i % 50) for i in range(2_000)],
+        "label": [" padded " if i % 10 == 0 else f"label_{i % 5}" for i in range(2_000)],
+    })
+    exact = profile_dataframe(df)
+
+    same = accuracy.compare_profiles(exact, profile_dataframe(df))
+    assert all(error["max"] in (0, None) for error in same["errors"].values())
+    assert same["flags"] == {"missing": [], "extra": [], "agreement": 1.0}
+
+    sampled = accuracy.compare_profiles(exact, profile_dataframe(df, sample_size=500))
+    # Top-value counts of a sample are scaled to the population
+    assert sampled["errors"]["top_value_counts"]["max"] < 0.5
+    assert sampled["errors"]["string_quality.whitespace_pct"]["column"] == "label"
+
+
+def test_compare_accuracy_to_baseline():
+    def results(unique_error, extra_flags):
+        errors = {"unique_count": {"max": unique_error, "column": "a"}, "duplicate_pct": {"max": None, "column": None}}
+        flags = {"missing": [], "extra": extra_flags, "agreement": 1.0}
+        return {"cases": {"case": {"modes": {"sampled": {"errors": errors, "flags": flags},
+                                             "time_budget": {"errors": errors, "flags": flags}}}}}
+
+    baseline = results(0.1, ["a:HIGH_MISSING"])
+    assert accuracy.compare_to_baseline(results(0.11, ["a:HIGH_MISSING"]), baseline) == []
+
+    regressions = accuracy.compare_to_baseline(results(0.5, ["a:HIGH_MISSING", "b:CONSTANT"]), baseline)
+    assert [(r["mode"], r["metric"]) for r in regressions] == [("sampled", "unique_count"), ("sampled", "flags_extra")]
+    assert regressions[1]["current"] == ["b:CONSTANT"]
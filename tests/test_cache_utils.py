@@ -0,0 +1,138 @@
+"""
+Tests for the on-disk profile cache: value round trips, rejected entries,
+atomic writes, least-recently-used eviction under the size cap and the
+eviction lock shared between processes.
+
+Run with: python -m pytest tests/test_cache_utils.py
+"""
+
+import math
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+import cache_utils  # noqa: E402
+from cache_utils import ENTRY_MAGIC, ProfileCache, profile_cache_key  # noqa: E402
+
+
+def _entries(cache_dir):
+    return sorted(path.name for path in Path(cache_dir).iterdir() if not path.name.startswith("."))
+
+
+def _payload(seed, length=4_000):
+    # Random text, so every entry compresses to roughly the same size
+    return {"values": np.random.default_rng(seed).integers(0, 16, length).astype(str).tolist()}
+
+
+def test_values_round_trip_with_numpy_types(tmp_path):
+    cache = ProfileCache(str(tmp_path))
+    cache.put("key", {
+        "count": np.int64(7), "pct": np.float32(12.5), "flag": np.bool_(True), "array": np.arange(3),
+        "missing": float("nan"), "name": "café", "nested": [{"a": None}, (1, 2)],
+    })
+
+    value = cache.get("key")
+    assert value["count"] == 7 and type(value["count"]) is int
+    assert value["pct"] == 12.5 and type(value["pct"]) is float
+    assert value["flag"] is True
+    assert value["array"] == [0, 1, 2]
+    assert math.isnan(value["missing"])
+    assert value["name"] == "café"
+    assert value["nested"] == [{"a": None}, [1, 2]]
+
+
+def test_unserialisable_values_are_rejected(tmp_path):
+    cache = ProfileCache(str(tmp_path))
+    with pytest.raises(TypeError):
+        cache.put("key", {"when": object()})
+    with pytest.raises(TypeError):
+        profile_cache_key("hash", "1.0", {"path": Path("data.csv")})
+    assert _entries(tmp_path) == []
+
+
+@pytest.mark.parametrize("data", [b"XXXX" + b"payload", ENTRY_MAGIC + b"not zlib", b""])
+def test_corrupt_entries_are_misses_and_removed(tmp_path, data):
+    cache = ProfileCache(str(tmp_path))
+    path = Path(cache._entry_path("key"))
+    path.write_bytes(data)
+
+    assert cache.get("key") is None
+    assert not path.exists()
+
+
+def test_writes_go_through_a_renamed_temp_file(tmp_path, monkeypatch):
+    cache = ProfileCache(str(tmp_path))
+    cache.put("key", {"version": 1})
+    replaced = []
+
+    def failing_replace(src, dst):
+        replaced.append((src, dst))
+        raise OSError("disk full")
+
+    monkeypatch.setattr(cache_utils.os, "replace", failing_replace)
+    cache.put("key", {"version": 2})
+
+    (src, dst), = replaced
+    assert Path(src).parent == tmp_path and src.endswith(".tmp")
+    assert dst == cache._entry_path("key")
+    # The failed write leaves the old entry and no temp file behind
+    assert cache.get("key") == {"version": 1}
+    assert _entries(tmp_path) == ["key.bin"]
+
+
+def test_eviction_drops_least_recently_used_first(tmp_path):
+    cache = ProfileCache(str(tmp_path))
+    for seed, key in enumerate("abc"):
+        cache.put(key, _payload(seed))
+    entry_bytes = max(os.path.getsize(cache._entry_path(key)) for key in "abc")
+    for age, key in enumerate("abc"):
+        os.utime(cache._entry_path(key), (1_000 + age, 1_000 + age))
+
+    # Reading "a" makes "b" the least recently used
+    assert cache.get("a") is not None
+    cache.max_bytes = int(entry_bytes * 3.5)
+    cache.put("d", _payload(3))
+
+    assert _entries(tmp_path) == ["a.bin", "c.bin", "d.bin"]
+    assert sum(os.path.getsize(path) for path in tmp_path.glob("*.bin")) <= cache.max_bytes
+
+
+def test_stale_temp_files_are_removed(tmp_path):
+    cache = ProfileCache(str(tmp_path))
+    stale, fresh = tmp_path / "stale.tmp", tmp_path / "fresh.tmp"
+    stale.write_bytes(b"")
+    fresh.write_bytes(b"")
+    old = time.time() - cache_utils.STALE_TEMP_SECONDS - 60
+    os.utime(stale, (old, old))
+
+    cache.put("key", {})
+    assert not stale.exists() and fresh.exists()
+
+
+@pytest.mark.skipif(cache_utils.fcntl is None, reason="eviction is only locked where fcntl is available")
+def test_eviction_waits_for_the_lock(tmp_path):
+    cache = ProfileCache(str(tmp_path))
+    cache.put("a", _payload(0))
+    cache.put("b", _payload(1))
+    cache.max_bytes = 0
+
+    # Another process evicting holds the lock (flock conflicts between open files in one process too)
+    with open(tmp_path / ".evict.lock", "a") as lock_file:
+        cache_utils.fcntl.flock(lock_file, cache_utils.fcntl.LOCK_EX)
+        evictor = threading.Thread(target=cache._evict)
+        evictor.start()
+        evictor.join(timeout=0.3)
+        assert evictor.is_alive()
+        assert _entries(tmp_path) == ["a.bin", "b.bin"]
+
+    evictor.join(timeout=5)
+    assert not evictor.is_alive()
+    assert _entries(tmp_path) == []
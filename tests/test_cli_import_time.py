@@ -0,0 +1,57 @@
+"""
+Import-time budget for the headless CLI.
+
+`import cli` and `python -m cli --help` must not pull in pandas, numpy or
+Streamlit, so cron jobs and containers start quickly.
+
+Run with: python -m pytest tests/test_cli_import_time.py
+"""
+
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Cumulative import time of the cli module itself, in microseconds
+CLI_IMPORT_BUDGET_US = 150_000
+HEAVY_MODULES = ("pandas", "numpy", "streamlit")
+
+
+def _run_python(*args):
+    return subprocess.run([sys.executable, *args], cwd=REPO_ROOT, capture_output=True, text=True, timeout=60)
+
+
+def test_cli_import_skips_heavy_modules():
+    code = f"import sys, cli; print(sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    result = _run_python("-c", code)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "[]", f"cli imported heavy modules: {result.stdout.strip()}"
+
+
+def test_cli_import_time_within_budget():
+    result = _run_python("-X", "importtime", "-c", "import cli")
+    assert result.returncode == 0, result.stderr
+
+    # Lines look like "import time:  self [us] | cumulative | imported package"
+    match = re.search(r"^import time:\s+\d+\s+\|\s+(\d+)\s+\|\s*cli$", result.stderr, re.MULTILINE)
+    assert match, "cli missing from -X importtime output"
+    cumulative_us = int(match.group(1))
+    assert cumulative_us <= CLI_IMPORT_BUDGET_US, \
+        f"import cli took {cumulative_us / 1000:.0f} ms (budget {CLI_IMPORT_BUDGET_US / 1000:.0f} ms)"
+
+
+def test_cli_help_does_not_import_profiling():
+    result = _run_python("-X", "importtime", "-m", "cli", "--help")
+    assert result.returncode == 0, result.stderr
+    assert "usage: python -m cli" in result.stdout
+    imported = {line.rsplit("|", 1)[-1].strip() for line in result.stderr.splitlines() if line.startswith("import time:")}
+    assert not imported & {"pandas", "profiling", "io_utils", "streamlit"}
+
+
+if __name__ == "__main__":
+    for test in (test_cli_import_skips_heavy_modules, test_cli_import_time_within_budget,
+                 test_cli_help_does_not_import_profiling):
+        test()
+        print(f"✓ PASS: {test.__name__}")
@@ -0,0 +1,110 @@
+"""
+Tests for the memory budget governor.
+
+Checks the size estimate against a generated CSV, the mode chosen for
+generous, tight and tiny budgets, that the chunked and sampled paths
+produce profiles consistent with an in-memory run, that the chunk size
+is part of the cache key, and that the CLI reports the options a chunked
+run does not apply.
+
+Run with: python -m pytest tests/test_memory_budget.py
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from cache_utils import ProfileCache  # noqa: E402
+from cli import main, profile_file  # noqa: E402
+from memory_budget import estimate_memory, plan_execution  # noqa: E402
+
+N_ROWS = 30_000
+
+
+@pytest.fixture(scope="module")
+def csv_path(tmp_path_factory):
+    rng = np.random.default_rng(7)
+    df = pd.DataFrame({
+        "id": np.arange(N_ROWS),
+        "amount": rng.normal(100, 15, N_ROWS).round(2),
+        "region": rng.choice(["north", "south", "east", "west"], N_ROWS),
+    })
+    path = tmp_path_factory.mktemp("budget") / "orders.csv"
+    df.to_csv(path, index=False)
+    return path
+
+
+def test_estimate_close_to_actual(csv_path):
+    estimate = estimate_memory(str(csv_path))
+    actual = pd.read_csv(csv_path).memory_usage(deep=True, index=False).sum()
+    assert estimate["estimated_rows"] == pytest.approx(N_ROWS, rel=0.1)
+    assert estimate["estimated_frame_bytes"] == pytest.approx(actual, rel=0.15)
+
+
+def test_plan_modes(csv_path):
+    estimate = estimate_memory(str(csv_path))
+    assert plan_execution(str(csv_path), 1024 ** 3, estimate)["mode"] == "in_memory"
+
+    chunked = plan_execution(str(csv_path), 3 * estimate["estimated_frame_bytes"], estimate)
+    assert chunked["mode"] == "chunked"
+    assert 0 < chunked["chunk_rows"] < N_ROWS
+
+    sampled = plan_execution(str(csv_path), 64 * 1024, estimate)
+    assert sampled["mode"] == "sampled"
+    assert sampled["sample_size"] < N_ROWS
+
+
+def test_chunked_and_sampled_profiles(csv_path):
+    full = profile_file(str(csv_path))
+    estimate = estimate_memory(str(csv_path))
+
+    chunked = profile_file(str(csv_path), memory_budget=3 * estimate["estimated_frame_bytes"])
+    assert chunked["dataset"]["execution"]["mode"] == "chunked"
+    assert chunked["dataset"]["n_rows"] == N_ROWS
+    assert chunked["columns"]["region"]["unique_count"] == full["columns"]["region"]["unique_count"]
+    assert chunked["columns"]["amount"]["numeric_stats"]["mean"] == \
+        pytest.approx(full["columns"]["amount"]["numeric_stats"]["mean"])
+    assert chunked["dataset"]["candidate_keys"]["keys"] == full["dataset"]["candidate_keys"]["keys"]
+    timings = chunked["timings"]
+    assert {"load", "columns", "candidate_keys", "render"} <= set(timings["stages"])
+    assert {timing["path"] for timing in timings["columns"].values()} == {"chunked"}
+    assert timings["rows_per_second"] > 0
+
+    sampled = profile_file(str(csv_path), memory_budget=64 * 1024)
+    assert sampled["dataset"]["execution"]["mode"] == "sampled"
+    assert sampled["dataset"]["sampling"]["population_rows"] == N_ROWS
+
+
+def test_chunk_size_is_part_of_cache_key(csv_path, tmp_path):
+    cache = ProfileCache(str(tmp_path / "cache"))
+    estimate = estimate_memory(str(csv_path))
+    budgets = [3 * estimate["estimated_frame_bytes"], 2 * estimate["estimated_frame_bytes"]]
+    chunk_rows = [plan_execution(str(csv_path), budget, estimate)["chunk_rows"] for budget in budgets]
+    assert chunk_rows[0] != chunk_rows[1]
+
+    discovered = [profile_file(str(csv_path), memory_budget=budget, cache=cache)
+                  ["dataset"]["candidate_keys"]["discovered_rows"] for budget in budgets]
+    assert discovered == chunk_rows
+
+
+def test_cli_reports_options_a_chunked_plan_cannot_apply(csv_path, tmp_path, capsys):
+    budget_mb = -(-3 * estimate_memory(str(csv_path))["estimated_frame_bytes"] // 1024 ** 2)
+    code = main([str(csv_path), "-o", str(tmp_path), "--formats", "json", "--no-cache",
+                 "--memory-budget-mb", str(budget_mb), "--time-budget", "5", "--track-memory"])
+    assert code == 0
+    assert "Warning: --time-budget, --track-memory not applied" in capsys.readouterr().err
+
+    with open(tmp_path / "orders.csv_full_profile.json", encoding="utf-8") as f:
+        profile = json.load(f)
+    execution = profile["dataset"]["execution"]
+    assert execution["mode"] == "chunked"
+    assert execution["options_not_applied"] == ["time_budget", "track_memory"]
+    assert "memory" not in profile
+
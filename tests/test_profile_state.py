@@ -0,0 +1,119 @@
+"""
+Tests for incremental profiling: a profile state built chunk by chunk must
+report what a single in-memory run reports, or say where it cannot.
+
+Run with: python -m pytest tests/test_profile_state.py
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+import profile_state  # noqa: E402
+from profile_state import build_profile_state, profile_from_state, update_profile_state  # noqa: E402
+from profiling import profile_dataframe  # noqa: E402
+
+N_ROWS = 6_000
+
+
+@pytest.fixture(scope="module")
+def df():
+    rng = np.random.default_rng(11)
+    names = rng.choice(["Alice", "alice", "Bob", " Carol", "n/a", "Dana\x07", "BOB"], N_ROWS).astype(object)
+    names[rng.random(N_ROWS) < 0.05] = None
+    frame = pd.DataFrame({
+        "id": np.arange(N_ROWS),
+        "amount": rng.normal(50, 10, N_ROWS).round(1),
+        "name": names,
+        "code": [f"c{i % 2_500}" for i in range(N_ROWS)],
+    })
+    # The only spelling variant appears after the first 1,000 rows
+    frame.loc[4_500, "code"] = "C7"
+    return pd.concat([frame, frame.iloc[:20]], ignore_index=True)
+
+
+def test_merged_chunks_match_full_profile(df):
+    full = profile_dataframe(df)
+    state = build_profile_state(df.iloc[:1_000])
+    for start in range(1_000, len(df), 1_700):
+        update_profile_state(state, df.iloc[start:start + 1_700])
+    merged = profile_from_state(state)
+
+    for col_name in df.columns:
+        expected, actual = full["columns"][col_name], merged["columns"][col_name]
+        for key in ("inferred_type", "null_count", "unique_count"):
+            assert actual[key] == expected[key], (col_name, key)
+        # Values tied on count may be listed in either order
+        assert [top["count"] for top in actual["top_values"]] == [top["count"] for top in expected["top_values"]]
+        if expected.get("string_quality"):
+            assert actual["string_quality"] == expected["string_quality"], col_name
+        if expected.get("numeric_stats"):
+            for key in ("min", "max", "mean", "std"):
+                assert actual["numeric_stats"][key] == pytest.approx(expected["numeric_stats"][key]), (col_name, key)
+
+    assert merged["columns"]["code"]["string_quality"]["casing_groups"] == 1
+    assert merged["dataset"]["duplicate_analysis"]["duplicate_rows"] == \
+        full["dataset"]["duplicate_analysis"]["duplicate_rows"] == 20
+    assert merged["dataset"]["candidate_keys"]["keys"] == full["dataset"]["candidate_keys"]["keys"]
+
+
+def test_estimated_unique_count_never_exceeds_values(monkeypatch):
+    monkeypatch.setattr(profile_state, "EXACT_DISTINCT_LIMIT", 50)
+    values = pd.DataFrame({"value": [f"v{i}" for i in range(400)] + [None] * 100})
+    profile = profile_from_state(build_profile_state(values))
+    assert profile["columns"]["value"]["unique_count"] <= profile["columns"]["value"]["non_null_count"] == 400
+
+
+def test_invalidated_keys_mark_the_result_partial():
+    first = pd.DataFrame({"order": [1, 2, 3, 4], "line": [1, 1, 1, 1], "note": list("abcd")})
+    later = pd.DataFrame({"order": [1, 2], "line": [2, 2], "note": list("ab")})
+    both = pd.concat([first, later], ignore_index=True)
+
+    state = build_profile_state(first)
+    assert profile_from_state(state)["dataset"]["candidate_keys"].get("partial") is None
+    update_profile_state(state, later)
+    keys = profile_from_state(state)["dataset"]["candidate_keys"]
+
+    # order + line is a key of all rows, but it was never tested once order alone broke
+    assert ["order", "line"] in profile_dataframe(both)["dataset"]["candidate_keys"]["keys"]
+    assert ["order"] in keys["invalidated_keys"] and ["order", "line"] not in keys["keys"]
+    assert keys["partial"] is True
+
+
+def test_unparsed_numbers_are_not_missing():
+    # A numeric first chunk, then text that only partly parses
+    first = pd.DataFrame({"amount": [1.0, 2.0, 3.0, np.nan]})
+    later = pd.DataFrame({"amount": ["4", "oops", "n/a", None]})
+    both = pd.concat([first, later], ignore_index=True)
+
+    state = build_profile_state(first)
+    update_profile_state(state, later)
+    merged = profile_from_state(state)["columns"]["amount"]
+    full = profile_dataframe(both)["columns"]["amount"]
+
+    assert merged["null_count"] == full["null_count"] == 2
+    assert merged["missing_pct"] == full["missing_pct"]
+    assert merged["unique_count"] == full["unique_count"] == 6
+    assert merged["numeric_coercion"]["unparsed_count"] == 2
+
+
+def test_mode_follows_first_values_and_records_conflicts():
+    empty = pd.DataFrame({"label": [np.nan] * 3, "code": ["1", "2", "3"]})
+    later = pd.DataFrame({"label": ["red", "blue", "red"], "code": ["x1", "y2", "z3"]})
+
+    state = build_profile_state(empty)
+    update_profile_state(state, later)
+    profile = profile_from_state(state)["columns"]
+
+    # All-null so far: re-typed from the first values seen
+    assert profile["label"]["inferred_type"] in ("categorical", "text")
+    assert profile["label"]["top_values"][1] == {"value": "red", "count": 2, "pct": 33.33}
+    assert "mode_conflicts" not in profile["label"]
+    # Typed already: the mode stays, and the disagreeing rows are recorded
+    assert profile["code"]["mode_conflicts"] == {"profiled_as": "numeric_strings", "rows": {"string": 3}}
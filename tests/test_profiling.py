@@ -0,0 +1,218 @@
+"""
+Tests for profiling.py: candidate keys on columns profiled from a sample
+and on sampled profiles, stratified sampling, mixed-type examples on frames
+without a row-number index, confidence intervals on deferred sections of
+sampled profiles, MinHash/LSH near-duplicate clusters, the column cache,
+coercion of formatted numeric strings and the evidence behind quality flags.
+
+Run with: python -m pytest tests/test_profiling.py
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from profiling import (  # noqa: E402
+    DEFERRABLE_SECTIONS, FLAG_EVIDENCE_KEYS, _analyze_near_duplicates, _discover_candidate_keys,
+    apply_quality_flags, complete_deferred_sections, profile_dataframe, sample_dataframe,
+)
+from cache_utils import ProfileCache  # noqa: E402
+from export_utils import dataset_summary_to_dict  # noqa: E402
+
+
+def test_estimated_unique_counts_are_confirmed():
+    n_rows = 5_000
+    ids = np.arange(n_rows)
+    ids[:10] = ids[10:20]
+    df = pd.DataFrame({"id": ids, "batch": np.arange(n_rows) % 2, "code": np.arange(n_rows)})
+    no_duplicates = {"duplicate_rows": 0}
+    # A sampled profile's estimate can claim every value is distinct, or fall short of it
+    columns = {
+        "id": {"unique_count": n_rows, "null_count": 0},
+        "batch": {"unique_count": 2, "null_count": 0},
+        "code": {"unique_count": n_rows - 40, "null_count": 0},
+    }
+
+    trusted = _discover_candidate_keys(df, columns, no_duplicates)
+    assert ["id"] in trusted["keys"] and ["code"] not in trusted["keys"]
+
+    confirmed = _discover_candidate_keys(df, columns, no_duplicates, estimated_columns={"id", "code"})
+    assert confirmed["keys"] == [["code"]]
+
+
+def test_keys_of_sampled_profile_are_marked_as_sample_only():
+    df = pd.DataFrame({"id": np.arange(500), "region": np.tile(["north", "south"], 250)})
+    exact = profile_dataframe(df)
+    sampled = profile_dataframe(df, population_rows=10_000)
+
+    assert "scope" not in exact["dataset"]["candidate_keys"]
+    assert sampled["dataset"]["candidate_keys"]["keys"] == [["id"]]
+    assert sampled["dataset"]["candidate_keys"]["scope"] == "sample"
+    assert dataset_summary_to_dict(sampled)["Candidate Keys Scope"] == "sample"
+
+
+def test_stratified_sample_keeps_size_and_rare_strata():
+    region = ["north"] * 9_000 + ["south"] * 990 + ["east"] * 7 + ["west"] * 3 + [None] * 1
+    df = pd.DataFrame({"region": region, "value": np.arange(len(region))})
+
+    sample = sample_dataframe(df, sample_size=100, stratify_by="region")
+    counts = sample["region"].value_counts(dropna=False)
+    assert len(sample) == 100
+    assert sample.index.is_monotonic_increasing
+    assert counts["north"] == 89 and counts["south"] == 8
+    assert counts["east"] == counts["west"] == 1 and sample["region"].isna().sum() == 1
+    assert sample_dataframe(df, sample_size=100, stratify_by="region").equals(sample)
+
+    # Fewer rows than strata: the largest strata get one row each
+    assert sorted(sample_dataframe(df, sample_size=3, stratify_by="region")["region"]) == ["east", "north", "south"]
+
+
+def test_mixed_type_examples_with_non_integer_index():
+    values = [1, 2, "three", None, 5.5, 6]
+    for index in (list("abcdef"), pd.date_range("2024-01-01", periods=6)):
+        df = pd.DataFrame({"value": values}, index=index)
+        profile = profile_dataframe(df)
+        mixed = profile["columns"]["value"]["mixed_types_info"]
+        assert mixed["has_mixed_types"]
+        assert [example["row_number"] for example in mixed["type_examples"]["str"]] == [2]
+
+
+def test_deferred_sections_of_sampled_profile_get_intervals():
+    rng = np.random.default_rng(3)
+    sample = pd.DataFrame({
+        "name": rng.choice([" padded", "Alice", "alice", "n/a"], 2_000).astype(object),
+        "when": pd.Series(pd.date_range("2020-01-01", periods=2_000, freq="D")).astype(str),
+        "mixed": pd.Series(rng.choice([1, "two", 3.0], 2_000), dtype=object),
+    })
+    options = {"population_rows": 50_000}
+
+    eager = profile_dataframe(sample, **options)
+    lazy = profile_dataframe(sample, deferred_sections=DEFERRABLE_SECTIONS, **options)
+    assert lazy["columns"]["name"]["string_quality"] is None
+    complete_deferred_sections(lazy, sample)
+
+    for col_name, section, interval in [("name", "string_quality", "whitespace_pct_ci"),
+                                        ("when", "datetime_stats", "future_pct_ci"),
+                                        ("mixed", "mixed_types_info", "mixed_type_pct_ci")]:
+        assert interval in lazy["columns"][col_name][section], (col_name, section)
+        assert lazy["columns"][col_name][section] == eager["columns"][col_name][section], (col_name, section)
+
+
+def _near_duplicate_frame(n_rows=400, n_columns=20):
+    rng = np.random.default_rng(5)
+    df = pd.DataFrame({f"c{i}": rng.integers(0, 10 ** 9, n_rows).astype(str) for i in range(n_columns)})
+    # Row 10 again with different casing and padding (same after normalisation)
+    df.loc[n_rows] = [f" {value.upper()} " for value in df.loc[10]]
+    # Row 20 again with one of its 20 columns changed (token Jaccard 19/21)
+    df.loc[n_rows + 1] = df.loc[20]
+    df.loc[n_rows + 1, "c0"] = "changed"
+    return df
+
+
+def test_near_duplicates_found_and_unrelated_rows_left_alone():
+    df = _near_duplicate_frame()
+    result = _analyze_near_duplicates(df)
+
+    clusters = sorted(sorted(cluster["example_indices"]) for cluster in result["clusters"])
+    assert clusters == [[10, 400], [20, 401]]
+    assert result["cluster_count"] == 2 and result["near_duplicate_rows"] == 2
+    changed = next(cluster for cluster in result["clusters"] if 20 in cluster["example_indices"])
+    assert changed["differing_columns"] == ["c0"]
+    assert changed["similarity"] == round(19 / 21, 3)
+    assert "scope" not in result
+
+
+def test_near_duplicates_sample_long_frames():
+    df = _near_duplicate_frame()
+    result = _analyze_near_duplicates(df, max_rows=100)
+    assert result["scope"] == "sample" and result["sampled_rows"] == 100
+    assert all(len(cluster["example_indices"]) >= 2 for cluster in result["clusters"])
+
+
+class _RecordingCache(ProfileCache):
+    """ProfileCache that remembers the keys it was asked for."""
+
+    def __init__(self, cache_dir):
+        super().__init__(cache_dir)
+        self.keys = []
+
+    def get(self, key):
+        self.keys.append(key)
+        return super().get(key)
+
+
+def test_cached_columns_match_fresh_profiles(tmp_path):
+    df = pd.DataFrame({
+        "amount": [1.5, 2.0, None, 2.0, -3.0] * 40,
+        "name": [" Alice", "bob", "n/a", "bob", "Eve!"] * 40,
+        "when": pd.date_range("2020-01-01", periods=200, freq="D"),
+    })
+    cache = _RecordingCache(str(tmp_path))
+    fresh = profile_dataframe(df)
+    first = profile_dataframe(df, column_cache=cache)
+    second = profile_dataframe(df, column_cache=cache)
+
+    assert {t["path"] for t in first["timings"]["columns"].values()} == {"full"}
+    assert {t["path"] for t in second["timings"]["columns"].values()} == {"cached"}
+    assert second["columns"] == first["columns"] == fresh["columns"]
+
+    # Other settings look up other entries
+    seen = set(cache.keys)
+    assert len(seen) == 3
+    profile_dataframe(df, column_cache=cache, top_n=3)
+    profile_dataframe(df, column_cache=cache, deferred_sections=DEFERRABLE_SECTIONS)
+    profile_dataframe(df.iloc[::-1], column_cache=cache)
+    assert len(set(cache.keys) - seen) == 9
+
+
+def test_formatted_numeric_strings_are_coerced():
+    df = pd.DataFrame({
+        "amount": ["$1,234.50", " 12 ", "1,000", "€3", "-$2,000"] * 8 + ["n/a"],
+        # Mostly junk that only looks numeric in places
+        "code": ["12abc", "1,2,3", "1.234,5", "5", "$"] * 8 + ["7"],
+    })
+    profile = profile_dataframe(df)
+
+    amount = profile["columns"]["amount"]
+    assert amount["inferred_type"] == "numeric"
+    assert amount["numeric_coercion"]["unparsed_values"] == ["n/a"]
+    assert amount["numeric_stats"]["mean"] == pytest.approx((1234.5 + 12 + 1000 + 3 - 2000) / 5)
+    assert amount["numeric_stats"]["negative_count"] == 8
+
+    code = profile["columns"]["code"]
+    assert code["numeric_coercion"] is None
+    assert code["numeric_stats"] is None
+
+
+def test_flags_carry_their_evidence_up_to_the_cap():
+    df = pd.DataFrame({
+        "label": [" pad " if i % 3 == 0 else f"v{i % 4}" for i in range(40)],
+        "sparse": [None if i % 3 == 0 else 1.0 for i in range(40)],
+        "amount": [str(i) for i in range(38)] + ["n/a", "unknown"],
+    })
+    profile = apply_quality_flags(profile_dataframe(df), null_threshold=10, top_n=5)
+
+    def flag(col_name, code):
+        return next(f for f in profile["columns"][col_name]["quality_flags"] if f["code"] == code)
+
+    for col_name, code, count, rows in [("label", "WHITESPACE_ISSUES", 14, [0, 3, 6, 9, 12]),
+                                        ("sparse", "HIGH_MISSING", 14, [0, 3, 6, 9, 12]),
+                                        ("amount", "NON_NUMERIC_VALUES", 2, [38, 39])]:
+        evidence = profile["columns"][col_name]["evidence"][FLAG_EVIDENCE_KEYS[code]]
+        raised = flag(col_name, code)
+        # Exact counts, but at most five example rows, in row order
+        assert raised["count"] == evidence["count"] == count, code
+        assert [example["row_number"] for example in raised["examples"]] == rows, code
+        for example in raised["examples"]:
+            value = df.loc[example["row_number"], col_name]
+            assert example["value"] == ("NULL" if pd.isna(value) else str(value)), code
+
+    # Flags without row-level evidence get their own count, not the null count
+    constant = flag("sparse", "CONSTANT_COLUMN")
+    assert constant["count"] == 26 and constant["examples"] == []
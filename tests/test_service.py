@@ -0,0 +1,157 @@
+"""
+Localhost tests for the profiling service.
+
+Starts the service on a free port with one warm worker process, submits
+files from test_data/ over HTTP and checks status, progress streaming,
+profile retrieval and error responses, and that worker processes start
+with the manager and without re-running the caller's __main__ script.
+
+Run with: python -m pytest tests/test_service.py
+"""
+
+import asyncio
+import json
+import shutil
+import sys
+import threading
+import time
+import types
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from jobs import JobManager, profile_path_job  # noqa: E402
+from service import ProfilingService  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def data_dir(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("service_data")
+    shutil.copy(REPO_ROOT / "test_data" / "test_numeric.csv", directory / "numeric.csv")
+    (directory / "broken.xlsx").write_bytes(b"not a spreadsheet")
+    return directory
+
+
+@pytest.fixture(scope="module")
+def base_url(data_dir):
+    manager = JobManager(max_workers=2, max_queued=4)
+    service = ProfilingService(manager, port=0, root=str(data_dir), no_cache=True)
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(service.start())
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    yield f"http://{service.host}:{service.port}"
+
+    loop.call_soon_threadsafe(service.close)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=5)
+    manager.shutdown()
+
+
+def _request(url, method="GET", body=None):
+    data = json.dumps(body).encode("utf-8") if body is not None else None
+    request = urllib.request.Request(url, data=data, method=method, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request, timeout=60) as response:
+            return response.status, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read()
+
+
+def _submit(base_url, path, **options):
+    status, body = _request(f"{base_url}/jobs", "POST", {"path": str(path), **options})
+    assert status == 202, body
+    return json.loads(body)["job_id"]
+
+
+def _wait(base_url, job_id, timeout=120):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = json.loads(_request(f"{base_url}/jobs/{job_id}")[1])
+        if job["status"] in ("done", "failed", "cancelled"):
+            return job
+        time.sleep(0.1)
+    raise AssertionError(f"job {job_id} did not finish in {timeout}s")
+
+
+def test_health(base_url):
+    status, body = _request(f"{base_url}/health")
+    assert status == 200
+    assert json.loads(body)["status"] == "ok"
+
+
+def test_submit_poll_and_fetch_profile(base_url, data_dir):
+    job_id = _submit(base_url, data_dir / "numeric.csv", top_n=3)
+    job = _wait(base_url, job_id)
+    assert job["status"] == "done", job
+    assert job["progress"]["fraction"] == 1.0
+
+    status, body = _request(f"{base_url}/jobs/{job_id}/profile")
+    assert status == 200
+    profile = json.loads(body)
+    assert profile["dataset"]["n_rows"] == 100
+    assert all(len(col["top_values"]) <= 3 for col in profile["columns"].values())
+    assert all("quality_flags" in col for col in profile["columns"].values())
+
+
+def test_track_memory(base_url, data_dir):
+    job_id = _submit(base_url, data_dir / "numeric.csv", track_memory=True)
+    assert _wait(base_url, job_id)["status"] == "done"
+    memory = json.loads(_request(f"{base_url}/jobs/{job_id}/profile")[1])["memory"]
+    assert memory["peak_bytes"] > 0
+    assert set(memory["columns"]) and all(step["peak_bytes"] >= 0 for step in memory["columns"].values())
+
+
+def test_stream_events(base_url, data_dir):
+    job_id = _submit(base_url, data_dir / "numeric.csv")
+    status, body = _request(f"{base_url}/jobs/{job_id}/events")
+    assert status == 200
+    lines = [json.loads(line) for line in body.decode("utf-8").splitlines()]
+    assert lines[-1]["status"] == "done"
+    assert any(event.get("stage") == "column" for event in lines[:-1])
+
+
+def test_concurrent_jobs_are_isolated(base_url, data_dir):
+    broken = _submit(base_url, data_dir / "broken.xlsx")
+    good = _submit(base_url, data_dir / "numeric.csv")
+
+    failed = _wait(base_url, broken)
+    assert failed["status"] == "failed" and failed["error"]
+    assert _request(f"{base_url}/jobs/{broken}/profile")[0] == 500
+    assert _wait(base_url, good)["status"] == "done"
+
+
+def test_errors(base_url, data_dir):
+    assert _request(f"{base_url}/jobs", "POST", {"path": str(data_dir / "missing.csv")})[0] == 404
+    assert _request(f"{base_url}/jobs", "POST", {"path": str(REPO_ROOT / "README.md")})[0] == 403
+    assert _request(f"{base_url}/jobs", "POST", {"nope": 1})[0] == 400
+    assert _request(f"{base_url}/jobs", "POST", {"path": str(data_dir / "numeric.csv"), "top_n": "x"})[0] == 400
+    assert _request(f"{base_url}/jobs", "POST", {"path": str(data_dir / "numeric.csv"), "track_memory": "no"})[0] == 400
+    assert _request(f"{base_url}/jobs/unknown")[0] == 404
+    assert _request(f"{base_url}/jobs/unknown/nothing")[0] == 404
+    assert _request(f"{base_url}/health", "POST", {})[0] == 404
+
+
+def test_workers_start_with_manager_without_rerunning_main_script(tmp_path, monkeypatch, data_dir):
+    # Spawned workers would re-run this script if they imported the caller's __main__
+    script = tmp_path / "script.py"
+    script.write_text("raise SystemExit('__main__ was re-run in a worker')\n")
+    main = types.ModuleType("__main__")
+    main.__file__ = str(script)
+    monkeypatch.setitem(sys.modules, "__main__", main)
+
+    manager = JobManager(max_workers=2, max_queued=2)
+    try:
+        # Workers are started with the manager, before any job is submitted
+        assert len(manager._executor._processes) == 2
+        job = manager.submit(profile_path_job, str(data_dir / "numeric.csv"), {"no_cache": True})
+        assert job.wait(timeout=120)
+        assert job.status == "done", job.error
+    finally:
+        manager.shutdown()